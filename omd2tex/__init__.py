@@ -1,4 +1,12 @@
-from . import tools, objects
+import importlib
+from typing import Any
 
 __version__ = "0.1.0"
 __all__ = ["objects", "tools"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the ``objects`` and ``tools`` subpackages on first access."""
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,89 @@
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments of ``python -m omd2tex``."""
+    parser = argparse.ArgumentParser(
+        prog="python -m omd2tex",
+        description="Convert Obsidian markdown notes to LaTeX projects in one process.",
+    )
+    parser.add_argument(
+        "notes", nargs="+", help="Note filenames, looked up in the search directory."
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes; defaults to Settings.Export.workers.",
+    )
+    parser.add_argument("--settings", help="JSON or YAML file with settings overrides.")
+    parser.add_argument(
+        "--preamble", help="JSON or YAML file with preamble settings overrides."
+    )
+    parser.add_argument("--search-dir", help="Directory of the vault with the notes.")
+    parser.add_argument("--export-dir", help="Directory receiving the exported projects.")
+    parser.add_argument(
+        "--tex",
+        action="store_true",
+        help="Write a single .tex file per note instead of a LaTeX project.",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Only report failed notes."
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Convert the notes given on the command line and report per-note timing and failures.
+
+    Args:
+        argv: Command line arguments without the program name; defaults to ``sys.argv[1:]``.
+
+    Returns:
+        Exit status: 0 when every note was converted, 1 otherwise.
+
+    Side Effects:
+        Writes the exported notes and prints a report to stdout, failures with tracebacks to stderr.
+    """
+    from .tools import Settings, SettingsPreamble, convert_many
+
+    args = parse_args(argv)
+
+    if args.settings:
+        Settings.update(args.settings)
+    if args.preamble:
+        SettingsPreamble.update(args.preamble)
+    if args.search_dir:
+        Settings.Export.search_dir = args.search_dir
+    if args.export_dir:
+        Settings.Export.export_dir = args.export_dir
+
+    start = time.perf_counter()
+    results = convert_many(args.notes, workers=args.workers, project=not args.tex)
+    elapsed = time.perf_counter() - start
+
+    failed = [result for result in results if not result.ok]
+
+    for result in results:
+        if result.ok:
+            if not args.quiet:
+                print(f"ok     {result.seconds:8.2f}s  {result.path} -> {result.output}")
+        else:
+            print(f"FAILED {result.seconds:8.2f}s  {result.path}: {result.error}")
+            print(result.traceback, file=sys.stderr)
+
+    print(
+        f"{len(results) - len(failed)} converted, {len(failed)} failed "
+        f"in {elapsed:.2f}s"
+    )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,39 +1,49 @@
-from omd2tex.objects.fragment import Caption, SplitLine, Frame
-from omd2tex.objects.equation import Equation
-from omd2tex.objects.paragraph import Paragraph
-from omd2tex.objects.codeblock import CodeBlock
-from omd2tex.objects.reference import Reference
-from omd2tex.objects.headline import Headline
-from omd2tex.objects.table import Table
-from omd2tex.objects.image import Image
-from omd2tex.objects.quote import Quote
-from omd2tex.objects.footnote import Footnote
-from omd2tex.objects.list import Enumerate, Bullet, Check, List
-from omd2tex.objects.preamble import Preamble
-from omd2tex.objects.citation import Citation
-from omd2tex.objects.file import File
-from omd2tex.objects.document import Document
-from omd2tex.objects.makefile import Makefile
+import importlib
+import sys
+from typing import Any
 
-__all__ = [
-    "Caption",
-    "SplitLine",
-    "Equation",
-    "Paragraph",
-    "CodeBlock",
-    "Reference",
-    "Headline",
-    "Table",
-    "Image",
-    "Quote",
-    "Footnote",
-    "Enumerate",
-    "Bullet",
-    "Check",
-    "List",
-    "Preamble",
-    "Citation",
-    "File",
-    "Document",
-    "Makefile",
-]
+# Public names and the modules defining them; modules are imported on first
+# access, so numpy and Pillow load only when a table or image is used
+_lazy = {
+    "Caption": "omd2tex.objects.fragment",
+    "SplitLine": "omd2tex.objects.fragment",
+    "Frame": "omd2tex.objects.fragment",
+    "Equation": "omd2tex.objects.equation",
+    "Paragraph": "omd2tex.objects.paragraph",
+    "CodeBlock": "omd2tex.objects.codeblock",
+    "Reference": "omd2tex.objects.reference",
+    "Headline": "omd2tex.objects.headline",
+    "Table": "omd2tex.objects.table",
+    "Image": "omd2tex.objects.image",
+    "Quote": "omd2tex.objects.quote",
+    "Footnote": "omd2tex.objects.footnote",
+    "Enumerate": "omd2tex.objects.list",
+    "Bullet": "omd2tex.objects.list",
+    "Check": "omd2tex.objects.list",
+    "List": "omd2tex.objects.list",
+    "Preamble": "omd2tex.objects.preamble",
+    "Citation": "omd2tex.objects.citation",
+    "File": "omd2tex.objects.file",
+    "Document": "omd2tex.objects.document",
+    "Makefile": "omd2tex.objects.makefile",
+}
+
+__all__ = [name for name in _lazy if name != "Frame"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the module defining a public name on first access and cache the name."""
+    module = _lazy.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module), name)
+    # Submodules such as ``globals`` and ``list`` shadow builtins here, so the
+    # module namespace is reached through ``sys.modules``
+    setattr(sys.modules[__name__], name, value)
+    return value
+
+
+def __dir__() -> "list[str]":
+    """List the module attributes together with the lazily imported names."""
+    return sorted(set(vars(sys.modules[__name__])) | set(_lazy))
@@ -1,9 +1,26 @@
+import os
 import re
+from typing import Any, Dict, List, Optional
 
 from .base import BaseClass
+from ..tools.context import ContextLocalMeta
 
-class Citation(BaseClass):
-    citation_list = []
+class Citation(BaseClass, metaclass=ContextLocalMeta):
+    """Bibliography source cited in the document.
+
+    Citations are registered once per citekey in ``registry``; ``citation_list`` keeps them in order of first use and ``cited`` every use. Source notes are resolved once per conversion and parsed through ``CitationCache``, and all entries go to a single bibliography: ``\\jobname.bib`` embedded in the preamble or, with ``Settings.Export.bib_file`` in project export, ``references.bib`` written next to ``main.tex``.
+    """
+
+    _context_local = ("citation_list", "registry", "cited")
+
+    citation_list: List["Citation"] = []
+    registry: Dict[str, "Citation"] = {}
+    cited: List[str] = []
+
+    bib_filename = "references.bib"
+    # Named after the compiled document, so notes exported into one directory
+    # do not share it; overwritten on every run to pick up edited entries
+    inline_bib_filename = "\\jobname.bib"
 
     def __init__(self, key: str) -> None:
         """Initialize citation metadata and resolve bibtex content.
@@ -15,7 +32,7 @@ class Citation(BaseClass):
             None
 
         Side Effects:
-            Sets global citation initialization flag and appends to class registry.
+            Sets global citation initialization flag and registers the citation unless its key already is.
         """
 
         from ..tools import Global
@@ -24,19 +41,61 @@ class Citation(BaseClass):
 
         self.key = key
         self.text = self._found_citation()
-        self.__class__.citation_list.append(self)
+        self.__class__.register(self)
+
+    @classmethod
+    def get(cls, key: str) -> "Citation":
+        """Return the citation of a key, resolving its source only on first use in the conversion.
+
+        Args:
+            key: Citation key (may include @) used to locate markdown source.
+
+        Returns:
+            Registered citation of the key.
+
+        Side Effects:
+            Sets global citation initialization flag and records the use in ``cited``.
+        """
+        from ..tools import Global
+
+        citation = cls.registry.get(key)
+        if citation is None:
+            citation = cls(key)
+        else:
+            Global.CITATION_INITIALIZED = True
+
+        cls.cited.append(key)
+
+        return citation
+
+    @classmethod
+    def register(cls, citation: "Citation") -> bool:
+        """Add a citation to the registry unless its key is already registered.
+
+        Args:
+            citation: Citation to register, e.g. one resolved in a worker process.
+
+        Returns:
+            True if the citation was added, False if its key was already registered.
+        """
+        if citation.key in cls.registry:
+            return False
+
+        cls.registry[citation.key] = citation
+        cls.citation_list.append(citation)
+        return True
 
     def _found_citation(self) -> str:
         """Locate and parse citation text from a markdown file."""
         from ..tools import find_file
         from ..tools import Settings
+        from ..tools.citation_cache import CitationCache
         path = find_file(
             filename=self.key + ".md", search_path=Settings.Export.search_dir
         )
 
         if path:
-            with open(path, "r") as f:
-                text = self._parse_citation(f.read())
+            text = CitationCache.get(path, self._parse_citation)
         else:
             print(f"Citation {self.key} not found")
             text = ""
@@ -70,20 +129,77 @@ class Citation(BaseClass):
         return text
 
     def to_latex(self) -> str:
-        """Render citation content into LaTeX filecontents and bibliography declaration."""
-        if self.text:
-            key = self.key.strip(".md").strip("@")
+        """Render the BibTeX entry of the citation, or an empty string if its source was not found."""
+        return self.text.strip()
 
-            text = f"""\\begin{{filecontents*}}{{{key}.bib}}
-{self.text}
-\\end{{filecontents*}}
-\\addbibresource{{{key}.bib}}"""
+    @classmethod
+    def to_default(cls) -> None:
+        """Reset the shared citation registry to defaults."""
+        cls.citation_list = []
+        cls.registry = {}
+        cls.cited = []
 
-        return text
+    @classmethod
+    def to_bib(cls) -> str:
+        """Join the BibTeX entries of all registered citations, one per citekey."""
+        return "\n\n".join(
+            entry for entry in (cit.to_latex() for cit in cls.citation_list) if entry
+        )
 
     @classmethod
     def to_latex_preamble(cls) -> str:
-        """Concatenate LaTeX preamble entries for all registered citations."""
-        citation_text = "\n\n".join(cit.to_latex() for cit in cls.citation_list)
+        """Render all registered citations as one ``filecontents*`` bibliography and a single ``\\addbibresource``."""
+        bib = cls.to_bib()
+        if not bib:
+            return ""
+
+        return f"""\\begin{{filecontents*}}[overwrite]{{{cls.inline_bib_filename}}}
+{bib}
+\\end{{filecontents*}}
+\\addbibresource{{{cls.inline_bib_filename}}}"""
+
+    @classmethod
+    def to_latex_bibresource(cls) -> str:
+        """Return the ``\\addbibresource`` line of the bibliography file, or an empty string without entries."""
+        if not cls.to_bib():
+            return ""
+
+        return f"\\addbibresource{{{cls.bib_filename}}}"
+
+    @classmethod
+    def write_bib(cls, directory: str, manifest: Optional[Any] = None) -> bool:
+        """Write the entries of all registered citations to ``references.bib`` in a directory.
+
+        The file is only rewritten when its entries changed, so its modification time stays put and biber or latexmk can skip work on unchanged bibliographies.
+
+        Args:
+            directory: Project directory, next to ``main.tex``.
+            manifest: Optional ``ExportManifest`` of an incremental export recording the output.
+
+        Returns:
+            True if the file was written, False if it was up to date or there are no entries.
+
+        Side Effects:
+            Writes ``references.bib`` into the directory.
+        """
+        bib = cls.to_bib()
+        if not bib:
+            return False
+
+        path = os.path.join(directory, cls.bib_filename)
+        text = bib + "\n"
+
+        if manifest:
+            return manifest.write(path, text)
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if f.read() == text:
+                    return False
+        except OSError:
+            pass
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
 
-        return citation_text
+        return True
@@ -1,17 +1,19 @@
 import json
 import os
 import shutil
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union
 import uuid
 
 from .base import BaseClass
 
 from .citation import Citation
+from .footnote import Footnote
 from .makefile import Makefile
 from .paragraph import Paragraph
 from .preamble import Preamble
 from .file import File
 from .quote import Quote
+from ..tools.context import ConversionContext, in_context
 
 
 class Document(BaseClass):
@@ -20,6 +22,7 @@ class Document(BaseClass):
         filename: str = "",
         settings: Union[Dict[str, Any], str] = None,
         preamble: str = None,
+        context: Optional[ConversionContext] = None,
     ) -> None:
         """Initialize a document wrapper with optional settings and preamble.
 
@@ -27,42 +30,52 @@ class Document(BaseClass):
             filename: Markdown filename to process.
             settings: Dict or path for overriding settings.
             preamble: Path to preamble configuration JSON.
+            context: Conversion context the document is parsed and rendered in; defaults to the active context, or process-wide state when there is none. Documents in separate contexts can be converted concurrently.
 
         Returns:
             None
 
         Side Effects:
-            Updates global settings and search ignore directories.
+            Updates settings and search ignore directories of the conversion context.
         """
         from ..tools import SettingsPreamble, Settings, Global
 
         super().__init__()
-        if preamble is None:
-            preamble = os.path.join(os.getcwd(), "../default/preamble.json")
-        if settings:
-            Settings.update(settings)
+        if context is None:
+            context = ConversionContext.current()
+        self.context = context
 
-        dir = Settings.Export.export_dir
-        self.dir = os.path.expanduser(dir[:-1] if dir.endswith("/") else dir)
+        with ConversionContext.activate(self.context):
+            if preamble is None:
+                preamble = os.path.join(os.getcwd(), "../default/preamble.json")
+            if settings:
+                Settings.update(settings)
 
-        self.filename = filename
-        self.file = None
+            dir = Settings.Export.export_dir
+            self.dir = os.path.expanduser(dir[:-1] if dir.endswith("/") else dir)
 
-        if Settings.Preamble.create_preamble:
-            self.preamble = Preamble()
+            self.filename = filename
+            self.file = None
 
-        else:
-            self.preamble = Paragraph("")
+            if Settings.Preamble.create_preamble:
+                self.preamble = Preamble()
 
-        export = os.path.expanduser(Settings.Export.export_dir)
-        search = os.path.expanduser(Settings.Export.search_dir)
-        Settings.Export.search_ignore_dirs.append(os.path.relpath(export, search))
+            else:
+                self.preamble = Paragraph("")
+
+            export = os.path.expanduser(Settings.Export.export_dir)
+            search = os.path.expanduser(Settings.Export.search_dir)
+            export_relpath = os.path.relpath(export, search)
+            if export_relpath not in Settings.Export.search_ignore_dirs:
+                Settings.Export.search_ignore_dirs.append(export_relpath)
 
+    @in_context
     def from_file(self, filename: str) -> "Document":
         """Load and parse a markdown file into a Document."""
         from ..tools import SettingsPreamble, Settings, Global
 
         self.filename = filename
+        self._reset_state()
         Global.DOCUMENT_NAME = self.filename.replace(".md", "")
         file = File(
             filename=self.filename,
@@ -72,11 +85,13 @@ class Document(BaseClass):
         self.file = file
         return self
 
+    @in_context
     def from_text(self, text: str) -> "Document":
         """Create a document from raw markdown text."""
         from ..tools import SettingsPreamble, Settings, Global
 
         self.filename = str(uuid.uuid4())[0:7]
+        self._reset_state()
         Global.DOCUMENT_NAME = self.filename
         file = File(
             filename=self.filename,
@@ -87,6 +102,7 @@ class Document(BaseClass):
         self.file = file
         return self
 
+    @in_context
     def from_elements(self, list: list) -> "Document":
         """Build a document from preconstructed elements."""
         from ..tools import SettingsPreamble, Settings, Global
@@ -128,8 +144,21 @@ class Document(BaseClass):
     def _process_settings_logics(self) -> None:
         pass
 
+    @staticmethod
+    def _reset_state() -> None:
+        """Drop the state left by a previous document before parsing a new one.
+
+        Rendering keeps the state collected while parsing, so a document can be rendered several times.
+        """
+        from ..tools import Global
+
+        Global.to_default()
+        Footnote.to_default()
+        Citation.to_default()
+
+    @in_context
     def check(self) -> None:
-        """Print contained file diagnostics and reset global state."""
+        """Print contained file diagnostics and global state."""
         from ..tools import SettingsPreamble, Settings, Global
 
         if self.file:
@@ -138,13 +167,22 @@ class Document(BaseClass):
             print("Document is not initialized")
 
         Global.check()
-        Global.to_default()
 
-    def to_latex(self) -> str:
-        """Render the document to a full LaTeX string with preamble and body."""
+    @in_context
+    def to_latex(self, end_of_dump: bool = False) -> str:
+        """Render the document to a full LaTeX string with preamble and body.
+
+        Args:
+            end_of_dump: Put ``\\endofdump`` right after the preamble, before the bibliography, for compiling with a format dumped from the preamble.
+
+        Returns:
+            LaTeX source of the document.
+        """
         from ..tools import SettingsPreamble, Settings, Global
 
         preamble = self.preamble.to_latex()
+        if end_of_dump:
+            preamble += "\n\\endofdump\n"
 
         # НЕЛЬЗЯ ПЕРЕДАВАТЬ parrentfilename
         file = self.file.to_latex()
@@ -170,9 +208,9 @@ class Document(BaseClass):
 
 \end{{document}}"""
 
-        Global.to_default()
         return document
 
+    @in_context
     def to_latex_file(self, filename: str = "") -> None:
         """Write the rendered LaTeX document to a file.
 
@@ -201,8 +239,7 @@ class Document(BaseClass):
         if Settings.Export.makefile:
             Makefile.to_file(self.dir)
 
-        Global.to_default()
-
+    @in_context
     def to_latex_project(self) -> None:
         """Create a full LaTeX project directory with includes and assets.
 
@@ -216,9 +253,12 @@ class Document(BaseClass):
             ValueError: If the document or file is not initialized before export.
 
         Side Effects:
-            Writes multiple files/directories and copies theme assets when needed.
+            Writes multiple files/directories and copies theme assets when needed. Images scheduled while rendering are copied by ``AssetCopier`` after the LaTeX is written, and pictures of removed ``smiles`` blocks are deleted. With ``Settings.Export.incremental`` unchanged files are left untouched and the export manifest is updated.
         """
         from ..tools import SettingsPreamble, Settings, Global
+        from ..tools.assets import AssetCopier
+        from ..tools.incremental import ExportManifest
+        from ..tools.smiles import SmilesRenderer
         # НЕЛЬЗЯ ПЕРЕДАВАТЬ parrentfilename
 
         # if save_dir:
@@ -239,12 +279,27 @@ class Document(BaseClass):
             # print("Не удалось создать директорию проекта или она уже создана")
             pass
 
+        project_dir = os.path.join(self.dir, self.filename.replace(".md", ""))
+        manifest = ExportManifest.get(project_dir)
+
+        # Drop copies left over by an export that failed
+        AssetCopier.take()
+
         main = main._to_latex_project()
 
         if Settings.Export.makefile:
-            Makefile.to_file(self.dir + "/" + self.filename.replace(".md", ""))
+            if manifest:
+                manifest.write(
+                    os.path.join(project_dir, "Makefile"), Makefile.to_string()
+                )
+            else:
+                Makefile.to_file(self.dir + "/" + self.filename.replace(".md", ""))
 
-        if Global.CITATION_INITIALIZED:
+        if Global.CITATION_INITIALIZED and Settings.Export.bib_file:
+            Citation.write_bib(project_dir, manifest)
+            citations = Citation.to_latex_bibresource()
+            bibliography = "\\newpage\\printbibliography"
+        elif Global.CITATION_INITIALIZED:
             citations = Citation.to_latex_preamble()
             bibliography = "\\newpage\\printbibliography"
         else:
@@ -265,10 +320,13 @@ class Document(BaseClass):
 
 \\end{{document}}"""
 
-        with open(
-            os.path.join(self.dir, self.filename.replace(".md", ""), "main.tex"), "w"
-        ) as f:
-            f.write(document)
+        if manifest:
+            manifest.write(os.path.join(project_dir, "main.tex"), document)
+        else:
+            with open(
+                os.path.join(self.dir, self.filename.replace(".md", ""), "main.tex"), "w"
+            ) as f:
+                f.write(document)
 
         if SettingsPreamble.documentclass == "beamer":
             style_json = os.path.join(
@@ -284,8 +342,19 @@ class Document(BaseClass):
                 )
                 copy_dir = os.path.join(self.dir, self.filename.replace(".md", ""))
 
-                shutil.copy2(style_dir, copy_dir)
+                if manifest:
+                    ExportManifest.copy_file(
+                        style_dir, os.path.join(copy_dir, os.path.basename(style_dir))
+                    )
+                else:
+                    shutil.copy2(style_dir, copy_dir)
             else:
                 print(f"{SettingsPreamble.Beamer.theme} not found in JSON file")
 
-        Global.to_default()
+        AssetCopier.flush()
+
+        if Settings.Codeblock.clean_smiles_images:
+            SmilesRenderer.cleanup(project_dir)
+
+        if manifest:
+            manifest.save()
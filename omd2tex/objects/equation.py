@@ -1,5 +1,8 @@
+from typing import Optional, Tuple
+
 from .base import BaseClass
 from .paragraph import Paragraph
+from ..tools.render_cache import RenderCache
 
 
 class Equation(BaseClass):
@@ -19,6 +22,11 @@ class Equation(BaseClass):
         self._is_initialized = True
         Global.REFERENCE_DICT[self.reference] = "eq"
 
+    def _render_key(self) -> Tuple[str, Optional[str]]:
+        """Return the render cache source of the equation."""
+        return self.equation, self.reference
+
+    @RenderCache.cached
     def to_latex(self) -> str:
         """Render the equation to LaTeX with or without numbering."""
         from ..tools import Global, Settings
@@ -1,12 +1,13 @@
 import uuid
 import os
-from typing import List, Optional
+from typing import List, Optional, TextIO
 
 from .base import BaseClass
 
 from .list import List
 from ..tools import Settings
 from .quote import Quote
+from .table import Table
 
 
 class File(BaseClass):
@@ -26,26 +27,121 @@ class File(BaseClass):
         Returns:
             None
         """
-        from ..tools import MarkdownParser
+        from ..tools.include_graph import IncludeGraph
+        from ..tools.incremental import ExportManifest
 
         super().__init__()
         self.filename = filename
         self.parrentdir = parrentdir
         self.filedepth = filedepth
+        self._manifest_entry = None
+        self._source = None
 
         if filename and parrentdir and filedepth:
-            parser = MarkdownParser(
-                filename=filename,
-                parrentdir=parrentdir,
-                filedepth=filedepth,
-            ).from_file(filename)
-            self.elements = parser.elements
+            note, self._source = IncludeGraph.embed(filename, parrentdir)
+
+            if self._source is not None:
+                # The note is already embedded elsewhere in the document
+                self._manifest_entry = self._source._manifest_entry
+                self._elements = None
+                return
+
+            IncludeGraph.register(note, parrentdir, self)
+            manifest = ExportManifest.get(parrentdir)
+
+            if manifest:
+                self._manifest_entry = manifest.reuse_note(self._output_path())
+
+            if self._manifest_entry:
+                # Parsed on first access of ``elements``
+                self._elements = None
+            else:
+                self._elements = self._parse_included(manifest)
+        else:
+            self._elements = []
+
+    @property
+    def elements(self) -> list:
+        """Parsed elements; shared with the first embed of the same note, and parsed on first access when reused by incremental export."""
+        if self._source is not None:
+            return self._source.elements
+        if self._elements is None:
+            self._elements = self._parse_reused()
+        return self._elements
+
+    @elements.setter
+    def elements(self, elements: list) -> None:
+        self._source = None
+        self._elements = elements
+
+    def _output_path(self) -> str:
+        """Return the path of the ``.tex`` file written by project export."""
+        if self.filename:
+            filename_tex = self.filename.replace(".md", "") + ".tex"
         else:
-            self.elements = []
+            filename_tex = "main.tex"
+
+        return self.parrentdir + "/" + filename_tex
+
+    def _parse_included(self, manifest=None) -> list:
+        """Parse an included note, recording it in the export manifest when given.
+
+        Args:
+            manifest: Optional ``ExportManifest`` of the project being exported.
+
+        Returns:
+            Parsed elements of the note.
+        """
+        from ..tools import MarkdownParser
+
+        capture = manifest.begin_note() if manifest else None
+        success = False
+
+        try:
+            parser = MarkdownParser(
+                filename=self.filename,
+                parrentdir=self.parrentdir,
+                filedepth=self.filedepth,
+            ).from_file(self.filename)
+            success = True
+        finally:
+            if manifest:
+                manifest.end_note(self._output_path(), capture, success=success)
+
+        return parser.elements
+
+    def _parse_reused(self) -> list:
+        """Parse an included note whose parse was replayed from the export manifest.
+
+        The replay already applied the note's settings and preamble commands, so they are restored after parsing instead of being applied twice.
+
+        Returns:
+            Parsed elements of the note.
+        """
+        from ..tools import Global, SettingsPreamble
+
+        settings = Settings.to_dict()
+        settings_preamble = SettingsPreamble.to_dict()
+        yaml_dict = Global.YAML_DICT
+        new_commands = list(Global.NEW_COMMANDS_PREAMBLE)
+
+        try:
+            return self._parse_included()
+        finally:
+            Settings.update(settings)
+            SettingsPreamble.update(settings_preamble)
+            Global.YAML_DICT = yaml_dict
+            Global.NEW_COMMANDS_PREAMBLE[:] = new_commands
 
     def from_file(self, filename: str) -> "File":
-        """Parse markdown from disk into this File instance."""
+        """Parse markdown from disk into this File instance; a top-level file starts a new include graph."""
         from ..tools import MarkdownParser
+        from ..tools.include_graph import IncludeGraph
+
+        from ..tools.smiles import SmilesRenderer
+
+        if not self.filedepth:
+            IncludeGraph.clear()
 
         if not self.parrentdir:
             dir = Settings.Export.export_dir
@@ -56,8 +152,9 @@ class File(BaseClass):
             parrentdir=self.parrentdir,
             filedepth=self.filedepth,
         )
-        parser = parser.from_file(filename)
-        self.elements = parser.process_elements_list()
+        with SmilesRenderer.batch():
+            parser = parser.from_file(filename)
+            self.elements = parser.process_elements_list()
 
         return self
 
@@ -104,8 +201,14 @@ class File(BaseClass):
         return self
 
     def from_text(self, text: str) -> "File":
-        """Parse markdown text directly into this File instance."""
+        """Parse markdown text directly into this File instance; a top-level file starts a new include graph."""
         from ..tools import MarkdownParser
+        from ..tools.include_graph import IncludeGraph
+
+        from ..tools.smiles import SmilesRenderer
+
+        if not self.filedepth:
+            IncludeGraph.clear()
 
         if not self.filename:
             self.filename = str(uuid.uuid4())[:7]
@@ -119,8 +222,9 @@ class File(BaseClass):
             parrentdir=self.parrentdir,
             filedepth=self.filedepth,
         )
-        parser = parser.from_text(text)
-        self.elements = parser.process_elements_list()
+        with SmilesRenderer.batch():
+            parser = parser.from_text(text)
+            self.elements = parser.process_elements_list()
 
         return self
 
@@ -132,10 +236,52 @@ class File(BaseClass):
 
     def to_latex(self):
         """Render contained elements to a combined LaTeX string."""
-        text = "\n\n".join([elem.to_latex() for elem in self.elements])
+        from ..tools.parallel import render_elements
+
+        text = "\n\n".join(render_elements(self.elements))
 
         return text
 
+    def to_latex_stream(self, out: TextIO, filename: Optional[str] = None) -> None:
+        """Write contained elements as LaTeX straight to an open text handle.
+
+        With ``filename`` the markdown file is parsed in streaming mode and every element is rendered and written as soon as its block closes, so peak memory is bounded by the largest block rather than the whole note; see ``MarkdownParser.iter_file`` for the limits of streaming parsing. Without it, the already parsed elements are written. The written text matches ``to_latex``.
+
+        Args:
+            out: Writable text handle receiving the LaTeX output.
+            filename: Optional markdown filename to parse while writing.
+
+        Returns:
+            None
+
+        Side Effects:
+            Writes to ``out``; when parsing, updates global state like ``from_file``.
+        """
+        from ..tools import MarkdownParser
+
+        if filename:
+            if not self.parrentdir:
+                dir = Settings.Export.export_dir
+                self.parrentdir = os.path.expanduser(dir[:-1] if dir.endswith("/") else dir)
+
+            parser = MarkdownParser(
+                filename=filename,
+                parrentdir=self.parrentdir,
+                filedepth=self.filedepth,
+            )
+            elements = parser.iter_process_elements(parser.iter_file(filename))
+        else:
+            elements = self.elements
+
+        for i, elem in enumerate(elements):
+            if i:
+                out.write("\n\n")
+            if isinstance(elem, Table):
+                # Large tables are written row by row
+                elem.to_latex_stream(out)
+            else:
+                out.write(elem.to_latex())
+
     def _to_latex_project(self) -> str:
         """Render contained elements for project export and write to disk.
 
@@ -143,21 +289,37 @@ class File(BaseClass):
             LaTeX input string referencing the generated file; may include page breaks depending on settings.
 
         Side Effects:
-            Writes TeX files into the parent directory and adjusts paths for nested exports.
+            Writes TeX files into the parent directory and adjusts paths for nested exports. A note embedded several times is written once. With incremental export, an unchanged included note keeps its existing file and unchanged output is not rewritten.
         """
+        from ..tools.incremental import ExportManifest
+        from ..tools.parallel import render_elements
+
         if Settings.Export.branching_project:
             pass
         else:
-            # print(self.elements)
-            text = "\n\n".join([elem._to_latex_project() for elem in self.elements])
-
-            if self.filename:
-                filename_tex = self.filename.replace(".md", "") + ".tex"
-            else:
-                filename_tex = "main.tex"
-
-            with open(self.parrentdir + "/" + filename_tex, "w") as f:
-                f.write(text)
+            path = self._output_path()
+            filename_tex = os.path.basename(path)
+            manifest = ExportManifest.get(self.parrentdir)
+
+            if self._source is not None and self._source._output_path() == path:
+                # Written by the first embed of the same note
+                pass
+            elif not (
+                manifest
+                and self._manifest_entry
+                and manifest.reuse_render(path, self._manifest_entry)
+            ):
+                capture = manifest.begin_render() if manifest else None
+
+                # print(self.elements)
+                text = "\n\n".join(render_elements(self.elements, project=True))
+
+                if manifest:
+                    manifest.write(path, text)
+                    manifest.end_render(path, capture)
+                else:
+                    with open(path, "w") as f:
+                        f.write(text)
 
             if Settings.File.divide_with_new_page:
                 return f"\\input{{{filename_tex}}}\\newpage"
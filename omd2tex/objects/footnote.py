@@ -3,9 +3,10 @@ import re
 from typing import Union, List
 
 from .base import BaseClass
+from ..tools.context import ContextLocalMeta
 
 
-class Footnote(BaseClass):
+class Footnote(BaseClass, metaclass=ContextLocalMeta):
     collection = {}
 
     @classmethod
@@ -29,6 +30,7 @@ class Footnote(BaseClass):
 
         cls.collection[key] = Paragraph(text).to_latex()
 
+    @classmethod
     def to_default(cls) -> None:
         """Reset the shared footnote collection to defaults."""
         cls.collection = {}
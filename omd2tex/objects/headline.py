@@ -1,10 +1,11 @@
 import re
-from typing import Callable
+from typing import Callable, Optional, Tuple
 
 from .base import BaseClass
 
 from .equation import Equation
 from .paragraph import Paragraph
+from ..tools.render_cache import RenderCache
 
 
 
@@ -161,6 +162,13 @@ class Headline(BaseClass):
 
         return text
 
+    def _render_key(self) -> Optional[Tuple[str, int, Optional[str]]]:
+        """Return the render cache source, or None if the text uses document state."""
+        if Paragraph.has_stateful_markup(self.text):
+            return None
+        return self.text, self.level, self.reference
+
+    @RenderCache.cached
     def to_latex(self) -> str:
         if not self._is_initialized:
             raise RuntimeError(
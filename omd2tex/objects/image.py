@@ -1,5 +1,3 @@
-import shutil
-from PIL import Image as PillowImage
 import os
 from typing import Optional, Tuple
 
@@ -7,7 +5,7 @@ from .base import BaseClass
 from omd2tex.tools.settings_preamble import SettingsPreamble
 
 from .paragraph import Paragraph
-from ..tools import find_file
+from ..tools import find_file, get_image_dimensions
 from ..tools import Global
 from ..tools import Settings
 
@@ -61,11 +59,10 @@ class Image(BaseClass):
 
     def _get_image_dimensions(self) -> Tuple[Optional[int], Optional[int]]:
         """Return the intrinsic width and height of the image if available."""
-        try:
-            with PillowImage.open(self.dir) as img:
-                return img.width, img.height
-        except FileNotFoundError:
+        dimensions = get_image_dimensions(self.dir)
+        if dimensions is None:
             return None, None
+        return dimensions
 
     def to_latex(self) -> str:
         """Render the image as a LaTeX figure block respecting settings."""
@@ -116,21 +113,23 @@ class Image(BaseClass):
 
         return latex_lines
 
-    def _copy_to_folder(self) -> None:
-        """Copy the source image into the export project images folder."""
-        dir_path = os.path.join(self.parrentdir, "images")
-        os.makedirs(dir_path, exist_ok=True)
+    def _copy_to_folder(self, source: str, project_dir: str) -> None:
+        """Schedule copying the source image into the export project images folder.
 
-        filename = os.path.basename(self.dir)
-        destination = os.path.join(dir_path, filename)
+        Args:
+            source: Path of the image in the vault.
+            project_dir: Directory of the exported project.
 
-        if os.path.exists(destination):
-            os.remove(destination)
+        Returns:
+            None
 
-        if os.path.isfile(self.dir):
-            shutil.copy2(self.dir, destination)
-        else:
-            raise FileNotFoundError(f"Файл {self.dir} не найден")
+        Raises:
+            FileNotFoundError: If the source image does not exist.
+        """
+        from ..tools.assets import AssetCopier
+
+        destination = os.path.join(project_dir, "images", self.filename)
+        AssetCopier.schedule(source, destination)
 
     def _relative_paths(self) -> None:
         """Adjust paths to be relative for project export."""
@@ -144,17 +143,22 @@ class Image(BaseClass):
             LaTeX string for the figure while ensuring relative paths and optional copying of the source file according to settings.
 
         Side Effects:
-            May copy image files to the project directory and mutate internal path attributes.
+            May schedule the source file for copying into the project directory; copies are performed by ``AssetCopier.flush`` once the project is written.
         """
-        if not Settings.Image.absolute_path_in_project_export:
-            self._relative_paths()
+        source, parrentdir = self.dir, self.parrentdir
+
+        try:
+            if not Settings.Image.absolute_path_in_project_export:
+                self._relative_paths()
 
-            self.dir = os.path.join(self.parrentdir, "images", self.filename)
+                self.dir = os.path.join(self.parrentdir, "images", self.filename)
 
-        if Settings.Image.copy_to_folder_in_project_export:
-            self._copy_to_folder()
+            if Settings.Image.copy_to_folder_in_project_export:
+                self._copy_to_folder(source, parrentdir)
 
-        return self.to_latex()
+            return self.to_latex()
+        finally:
+            self.dir, self.parrentdir = source, parrentdir
 
 
 class ImageFrame:
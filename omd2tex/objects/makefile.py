@@ -1,11 +1,19 @@
 from ..tools import Global
+from ..tools import Settings
 import os
-import asyncio
 
 class Makefile:
     @classmethod
     def to_string(cls) -> str:
         """Generate Makefile content tailored to citation and reference usage."""
+        from .citation import Citation
+
+        if Settings.Export.bib_file:
+            # The bibliography written next to main.tex is a source, not a by-product
+            bib = f"$(filter-out {Citation.bib_filename},$(wildcard *.bib))"
+        else:
+            bib = "*.bib"
+
         if Global.CITATION_INITIALIZED:
             biber = "\n\tbiber main # Используем имя файла БЕЗ расширения .tex!\n\tpdflatex -shell-escape main.tex\n\tpdflatex -shell-escape main.tex"
         elif Global.REFERENCE_DICT:
@@ -20,10 +28,10 @@ python:
 \tpython main.py
 
 compile:
-\trm -f *.bib *.bbl *.blg *.aux *.log *.out *.toc *.bcf *.run.xml
+\trm -f {bib} *.bbl *.blg *.aux *.log *.out *.toc *.bcf *.run.xml
 \tpdflatex -shell-escape main.tex{biber}
 \trm -rf _minted*
-\trm -f *.bib *.bbl *.blg *.aux *.log *.out *.toc *.bcf *.run.xml
+\trm -f {bib} *.bbl *.blg *.aux *.log *.out *.toc *.bcf *.run.xml
 \tmv main.pdf "{Global.DOCUMENT_NAME}.pdf"
 
 open:
@@ -32,7 +40,7 @@ open:
 clean:
 \trm -f main.pdf *.aux *.log *.out *.toc *.ps
 \trm -rf _minted*
-\trm -f *.bib *.bcf *.run.xml *.bbl *.blg
+\trm -f {bib} *.bcf *.run.xml *.bbl *.blg
 """
         return string
 
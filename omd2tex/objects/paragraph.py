@@ -2,14 +2,121 @@ import os
 import re
 import json
 import random
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 
 from .base import BaseClass
 
 from .citation import Citation
 from .footnote import Footnote
+from ..tools.render_cache import RenderCache
+
+
+@lru_cache(maxsize=16)
+def _read_json_table(path: str, mtime_ns: int) -> Dict:
+    """Read a JSON mapping once per path and modification time."""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def load_json_table(path: str) -> Dict:
+    """Return the parsed content of a JSON mapping file, cached by path and mtime.
+
+    Args:
+        path: Path to the JSON file; ``~`` is expanded.
+
+    Returns:
+        Parsed mapping shared between callers; it must not be mutated.
+    """
+    path = os.path.abspath(os.path.expanduser(path))
+    return _read_json_table(path, os.stat(path).st_mtime_ns)
+
+
+@lru_cache(maxsize=16)
+def _formulas_translation(
+    path: str, mtime_ns: int, surround_func: Callable[[str], str]
+) -> Tuple[Optional["re.Pattern"], Dict[str, str], List[Tuple[str, str]]]:
+    """Compile a formulas mapping into a single-pass character-class pattern.
+
+    Falls back to an ordered list of replacements when the mapping has multi-character keys or values containing other keys, where a single pass would differ from sequential ``str.replace`` calls.
+
+    Returns:
+        Tuple of (pattern, replacement mapping, replacement pairs); the pattern is None when the sequential fallback must be used.
+    """
+    change_dict = _read_json_table(path, mtime_ns)
+    pairs = [(key, surround_func(value)) for key, value in change_dict.items()]
+
+    single_pass = all(len(key) == 1 for key, _ in pairs) and not any(
+        key in value for _, value in pairs for key, _ in pairs
+    )
+    if single_pass and pairs:
+        pattern = re.compile("[" + "".join(re.escape(key) for key, _ in pairs) + "]")
+        return pattern, dict(pairs), pairs
+
+    return None, dict(pairs), pairs
+
+
+def _surround_inline_math(text: str) -> str:
+    """Wrap a formula replacement in inline math delimiters."""
+    return f"${text}$"
 
 
 class Paragraph(BaseClass):
+    # (marker, pattern, replacement): a pattern only runs when its marker occurs in the text.
+    html_highlight_rules = [
+        ("<sup>", re.compile(r"<sup>(.*?)</sup>"), lambda x: f"$^{{{x.group(1)}}}$"),
+        ("<sub>", re.compile(r"<sub>(.*?)</sub>"), lambda x: f"$_{{{x.group(1)}}}$"),
+        ("<u>", re.compile(r"<u>(.*?)</u>"), lambda x: f"\\ul{{{x.group(1)}}}"),
+    ]
+
+    markdown_highlight_rules = [
+        ("**", re.compile(r"\*\*(.*?)\*\*"), lambda x: f"\\textbf{{{x.group(1)}}}"),
+        ("__", re.compile(r"__(.*?)__"), lambda x: f"\\textbf{{{x.group(1)}}}"),
+        ("*", re.compile(r"\*(.*?)\*"), lambda x: f"\\textit{{{x.group(1)}}}"),
+        ("_", re.compile(r"_(.*?)_"), lambda x: f"\\textit{{{x.group(1)}}}"),
+        (
+            "==",
+            re.compile(r"==(.*?)=="),
+            lambda x: f"\\sethlcolor{{mintgreen}}\\hl{{{x.group(1)}}}",
+        ),
+        ("~~", re.compile(r"~~(.*?)~~"), lambda x: f"\\sout{{{x.group(1)}}}"),
+        ("#", re.compile(r"#(.*?)(?=\s|$)"), lambda x: f"\\#{x.group(1)}"),
+    ]
+
+    remove_highlight_rules = [
+        (marker, re.compile(pattern), lambda x: x.group(1))
+        for marker, pattern in [
+            ("**", r"\*\*(.*?)\*\*"),
+            ("__", r"__(.*?)__"),
+            ("*", r"\*(.*?)\*"),
+            ("_", r"_(.*?)_"),
+            ("==", r"==(.*?)=="),
+            ("~~", r"~~(.*?)~~"),
+            ("#", r"#(.*?)(?=\s|$)"),
+            ("<u>", r"<u>(.*?)</u>"),
+            ("<sup>", r"<sup>(.*?)</sup>"),
+            ("<sub>", r"<sub>(.*?)</sub>"),
+        ]
+    ]
+
+    re_inline_code = re.compile(r"`(.*?)`")
+    re_inline_equation = re.compile(r"\$(.*?)\$")
+    re_outline_equation = re.compile(r"\$\$(.*?)\$\$")
+    re_inline_math_span = re.compile(r"\$(?:[^$\\]|\\\$|\\[^$])*?\$")
+
+    re_reference = re.compile(r"\[\[(?:([^\|\]#]+)?#)?\^([^\|\]]+)(?:\|([^\]]+))?\]\]")
+    re_footnote = re.compile(r"\[\^([^\]]+)\]")
+    re_wiki_citation = re.compile(r"(!?)\[\[@([^|\]]+)(?:\|([^\]]+))?\]\]")
+    re_cite_citation = re.compile(r"\\cite\{@([^}]+)\}")
+
+    # References, footnotes and citations read or register document state
+    stateful_markers = ("[[", "[^", "\\cite{@")
+
+    ru_letters = "йцукенгшщзфывапролджэячсмитьбюё"
+    ru_letters_table = {
+        ord(letter): f"\\text{{{letter}}}" for letter in ru_letters + ru_letters.upper()
+    }
+
     def __init__(self, text: str, parse: bool = True) -> None:
         """Initialize a paragraph wrapper with optional parsing.
 
@@ -26,12 +133,31 @@ class Paragraph(BaseClass):
 
         self.reference = None
 
-        self.footnote = Footnote().collection
+        self.footnote = Footnote.collection
 
+    @RenderCache.cached
     def to_latex(self) -> str:
         """Render the paragraph to LaTeX, optionally parsing markdown constructs."""
         return self._parse_text()
 
+    def _render_key(self) -> Optional[Tuple[str, bool]]:
+        """Return the render cache source, or None if the text uses document state."""
+        if self.parse and self.has_stateful_markup(self.text):
+            return None
+        return self.text, self.parse
+
+    @staticmethod
+    def has_stateful_markup(text: str) -> bool:
+        """Check whether text contains references, footnotes or citations.
+
+        Args:
+            text: Raw markdown text.
+
+        Returns:
+            True if rendering the text depends on or changes document state.
+        """
+        return any(marker in text for marker in Paragraph.stateful_markers)
+
     def _to_latex_project(self) -> str:
         return self.to_latex()
 
@@ -41,6 +167,8 @@ class Paragraph(BaseClass):
     ) -> str:
         """Replace symbols in equations using a mapping file and wrapper.
 
+        The mapping is loaded once per file path and mtime and compiled into a single-pass pattern for each ``surround_func``; pass a long-lived callable rather than a fresh lambda to benefit from the cache.
+
         Args:
             text: Input equation text.
             dict_file: Optional path to a JSON mapping file; defaults to bundled formulas.
@@ -58,10 +186,16 @@ class Paragraph(BaseClass):
                 os.path.dirname((__file__)), "..", "default/formulas.json"
             )
 
-        with open(os.path.expanduser(dict_file), "r") as f:
-            change_dict = json.load(f)
-        for key in change_dict:
-            text = text.replace(key, surround_func(change_dict[key]))
+        path = os.path.abspath(os.path.expanduser(dict_file))
+        pattern, mapping, pairs = _formulas_translation(
+            path, os.stat(path).st_mtime_ns, surround_func
+        )
+
+        if pattern is not None:
+            return pattern.sub(lambda x: mapping[x.group()], text)
+
+        for key, value in pairs:
+            text = text.replace(key, value)
 
         return text
 
@@ -70,18 +204,9 @@ class Paragraph(BaseClass):
     @staticmethod
     def highlight_text1(text: str) -> str:
         """Convert HTML superscript/subscript markers to LaTeX equivalents."""
-        change_dict = {
-            r"<sup>(.*?)</sup>": lambda x: f"$^{{{x.group(1)}}}$",
-            r"<sub>(.*?)</sub>": lambda x: f"$_{{{x.group(1)}}}$",
-            r"<u>(.*?)</u>": lambda x: f"\\ul{{{x.group(1)}}}",
-        }
-
-        for regular in change_dict:
-            text = re.sub(
-                regular,
-                change_dict[regular],
-                text,
-            )
+        for marker, pattern, replace in Paragraph.html_highlight_rules:
+            if marker in text:
+                text = pattern.sub(replace, text)
         return text
 
     _highlight_text1 = highlight_text1
@@ -89,22 +214,9 @@ class Paragraph(BaseClass):
     @staticmethod
     def highlight_text2(text: str) -> str:
         """Convert markdown emphasis markers to LaTeX formatting."""
-        change_dict = {
-            r"\*\*(.*?)\*\*": lambda x: f"\\textbf{{{x.group(1)}}}",
-            r"__(.*?)__": lambda x: f"\\textbf{{{x.group(1)}}}",
-            r"\*(.*?)\*": lambda x: f"\\textit{{{x.group(1)}}}",
-            r"_(.*?)_": lambda x: f"\\textit{{{x.group(1)}}}",
-            r"==(.*?)==": lambda x: f"\\sethlcolor{{mintgreen}}\\hl{{{x.group(1)}}}",
-            r"~~(.*?)~~": lambda x: f"\\sout{{{x.group(1)}}}",
-            r"#(.*?)(?=\s|$)": lambda x: f"\\#{x.group(1)}",
-        }
-
-        for regular in change_dict:
-            text = re.sub(
-                regular,
-                change_dict[regular],
-                text,
-            )
+        for marker, pattern, replace in Paragraph.markdown_highlight_rules:
+            if marker in text:
+                text = pattern.sub(replace, text)
         return text
 
     _highlight_text2 = highlight_text2
@@ -118,7 +230,8 @@ class Paragraph(BaseClass):
             inline_codes.append(match.group(1))
             return f"@@INLINE-CODE-{len(inline_codes)}@@"
 
-        text = re.sub(r"`(.*?)`", replace_inline, text)
+        if "`" in text:
+            text = Paragraph.re_inline_code.sub(replace_inline, text)
 
         return text, inline_codes
 
@@ -133,7 +246,8 @@ class Paragraph(BaseClass):
             inline_equations.append(match.group(1))
             return f"@@INLINE-EQUATION-{len(inline_equations)}@@"
 
-        text = re.sub(r"\$(.*?)\$", replace_inline, text)
+        if "$" in text:
+            text = Paragraph.re_inline_equation.sub(replace_inline, text)
         return text, inline_equations
 
     _replace_inline_equation = replace_inline_equation
@@ -147,7 +261,8 @@ class Paragraph(BaseClass):
             outline_equations.append(match.group(1))
             return f"@@OUTLINE-EQUATION-{len(outline_equations)}@@"
 
-        text = re.sub(r"\$\$(.*?)\$\$", replace_inline, text)
+        if "$$" in text:
+            text = Paragraph.re_outline_equation.sub(replace_inline, text)
         return text, outline_equations
 
     _replace_outline_equation = replace_outline_equation
@@ -205,8 +320,7 @@ class Paragraph(BaseClass):
                 os.path.dirname((__file__)), "..", "default/latinify.json"
             )
 
-        with open(change_dict, "r") as f:
-            repl_map = json.load(f)
+        repl_map = load_json_table(change_dict)
 
         def replace_in_string(s: str) -> str:
             result_chars = []
@@ -224,48 +338,7 @@ class Paragraph(BaseClass):
     @staticmethod
     def eq_ru_letter_workaround(text: str) -> str:
         """Wrap Cyrillic characters in equations with text mode to avoid errors."""
-        change_list = [
-            "й",
-            "ц",
-            "у",
-            "к",
-            "е",
-            "н",
-            "г",
-            "ш",
-            "щ",
-            "з",
-            "ф",
-            "ы",
-            "в",
-            "а",
-            "п",
-            "р",
-            "о",
-            "л",
-            "д",
-            "ж",
-            "э",
-            "я",
-            "ч",
-            "с",
-            "м",
-            "и",
-            "т",
-            "ь",
-            "б",
-            "ю",
-            "ё",
-        ]
-        new_text = []
-
-        for letter in text:
-            if letter.lower() in change_list:  # Проверяем в нижнем регистре
-                new_text.append(f"\\text{{{letter}}}")
-            else:
-                new_text.append(letter)
-
-        return "".join(new_text)
+        return text.translate(Paragraph.ru_letters_table)
 
     _eq_ru_letter_workaround = eq_ru_letter_workaround
 
@@ -285,9 +358,8 @@ class Paragraph(BaseClass):
         """Convert wiki-style references to LaTeX cref calls using global mapping."""
         from ..tools import Global, Settings
 
-        ref_pattern = re.compile(
-            r"\[\[(?:([^\|\]#]+)?#)?\^([^\|\]]+)(?:\|([^\]]+))?\]\]"
-        )
+        if "[[" not in text:
+            return text
 
         def process_ref_match(match):
             file_reference = match.group(1) or ""
@@ -304,7 +376,7 @@ class Paragraph(BaseClass):
                 return text + " " + latex_ref
             return latex_ref
 
-        text = ref_pattern.sub(process_ref_match, text)
+        text = Paragraph.re_reference.sub(process_ref_match, text)
 
         return text
 
@@ -312,6 +384,8 @@ class Paragraph(BaseClass):
 
     def _process_footnotes(self, text: str) -> str:
         """Replace footnote markers with LaTeX footnote commands using collection."""
+        if "[^" not in text:
+            return text
 
         def process(match):
             key = match.group(1)
@@ -321,7 +395,7 @@ class Paragraph(BaseClass):
                 print(f"Footnote {key}")
                 return " "
 
-        text = re.sub(r"\[\^([^\]]+)\]", process, text)
+        text = self.re_footnote.sub(process, text)
 
         return text
 
@@ -339,7 +413,8 @@ class Paragraph(BaseClass):
         """
         result = text
 
-        pattern1 = r"(!?)\[\[@([^|\]]+)(?:\|([^\]]+))?\]\]"
+        if "@" not in result:
+            return result
 
         def replace_pattern1(match):
             has_exclamation = match.group(1) == "!"
@@ -347,31 +422,31 @@ class Paragraph(BaseClass):
             text_part = match.group(3)
 
             if text_part:
-                cit = Citation(key=f"@{cite}")
+                cit = Citation.get(f"@{cite}")
                 if cit.text:
                     return f"{text_part.strip()} \\cite{{{cite}}}"
                 else:
                     return ""
             else:
-                cit = Citation(key=f"@{cite}")
+                cit = Citation.get(f"@{cite}")
                 if cit.text:
                     return f"\\cite{{{cite}}}"
                 else:
                     return ""
 
-        result = re.sub(pattern1, replace_pattern1, result)
-
-        pattern2 = r"\\cite\{@([^}]+)\}"
+        if "[[@" in result:
+            result = Paragraph.re_wiki_citation.sub(replace_pattern1, result)
 
         def replace_pattern2(match):
             cite = match.group(1).strip()
-            cit = Citation(key=f"@{cite}")
+            cit = Citation.get(f"@{cite}")
             if cit.text:
                 return f"\\cite{{{cite}}}"
             else:
                 return ""
 
-        result = re.sub(pattern2, replace_pattern2, result)
+        if "\\cite{@" in result:
+            result = Paragraph.re_cite_citation.sub(replace_pattern2, result)
 
         return result
 
@@ -394,20 +469,20 @@ class Paragraph(BaseClass):
                     outline_equations[i]
                 )
 
-            text = re.sub(
-                r"\$\$(.*?)\$\$",
-                lambda x: f"$${self.change_letters_for_equations(x.group(0).strip('$'), dict_file=Settings.Paragraph.formulas_json)}$$",
-                text,
-            )
+            if "$$" in text:
+                text = self.re_outline_equation.sub(
+                    lambda x: f"$${self.change_letters_for_equations(x.group(0).strip('$'), dict_file=Settings.Paragraph.formulas_json)}$$",
+                    text,
+                )
 
-            text = re.sub(
-                r"\$(?:[^$\\]|\\\$|\\[^$])*?\$",
-                lambda x: f"${self.change_letters_for_equations(x.group(0).strip('$'), dict_file=Settings.Paragraph.formulas_json)}$",
-                text,
-            )
+            if "$" in text:
+                text = self.re_inline_math_span.sub(
+                    lambda x: f"${self.change_letters_for_equations(x.group(0).strip('$'), dict_file=Settings.Paragraph.formulas_json)}$",
+                    text,
+                )
 
             text = self.change_letters_for_equations(
-                text, surround_func=lambda x: f"${x}$"
+                text, surround_func=_surround_inline_math
             )
 
             text, inline_codes = self.replace_inline_code(text)
@@ -478,27 +553,9 @@ class Paragraph(BaseClass):
     @staticmethod
     def remove_all_highlight(text: str) -> str:
         """Strip all markdown-style highlighting and emphasis markers."""
-        change_dict = {
-            r"\*\*(.*?)\*\*": lambda x: x.group(1),
-            r"__(.*?)__": lambda x: x.group(1),
-            r"\*(.*?)\*": lambda x: x.group(1),
-            r"_(.*?)_": lambda x: x.group(1),
-            r"==(.*?)==": lambda x: x.group(1),
-            r"~~(.*?)~~": lambda x: x.group(1),
-            r"#(.*?)(?=\s|$)": lambda x: x.group(
-                1
-            ),  # Только до пробела или конца строки
-            r"<u>(.*?)</u>": lambda x: x.group(1),
-            r"<sup>(.*?)</sup>": lambda x: x.group(1),  # Исправлено
-            r"<sub>(.*?)</sub>": lambda x: x.group(1),  # Исправлено
-        }
-
-        for regular in change_dict:
-            text = re.sub(
-                regular,
-                change_dict[regular],
-                text,
-            )
+        for marker, pattern, replace in Paragraph.remove_highlight_rules:
+            if marker in text:
+                text = pattern.sub(replace, text)
         return text
 
     _remove_all_highlight = remove_all_highlight
@@ -1,23 +1,61 @@
-from typing import List
-from pylatexenc.latex2text import LatexNodes2Text
-import numpy as np
+import csv
+import os
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
 
 from .base import BaseClass
 
 from ..tools import Global
+from ..tools import Settings
+from ..tools.render_cache import RenderCache
+from ..tools.text_tools import latex_to_text, visible_width
 from .paragraph import Paragraph
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class Table(BaseClass):
+    # Escapes of plain text cells read from csv data, applied in order; the
+    # backslash is parked on a placeholder so that its braces are not escaped
+    latex_escapes = (
+        ("\\", "\x01"),
+        ("{", "\\{"),
+        ("}", "\\}"),
+        ("#", "\\#"),
+        ("$", "\\$"),
+        ("%", "\\%"),
+        ("&", "\\&"),
+        ("_", "\\_"),
+        ("~", "\\textasciitilde{}"),
+        ("^", "\\textasciicircum{}"),
+        ("\x01", "\\textbackslash{}"),
+    )
+
     def __init__(self, lines: List[str]) -> None:
         """Initialize a table parser with raw markdown lines."""
         super().__init__()
         self.lines = lines
+        self._data_key = None
 
         self.ilen = 2
         self.jlen = 2
         self.alignments = []
-        self.width_parms = self._define_width_parms()
+
+        if len(lines) - 2 > Settings.Table.stream_rows:
+            # Only widths are kept, cells are rendered again while writing
+            self.cells = None
+            self.width_parms = self._define_width_parms(self._iter_cells())
+        else:
+            self.cells = self._parse_lines()
+            self.width_parms = self._define_width_parms(self.cells)
         self.colspec = self._define_colspec_parms()
 
         self.reference = None
@@ -25,11 +63,148 @@ class Table(BaseClass):
 
         self._is_initialized = True
 
+    @classmethod
+    def from_csv(
+        cls, lines: List[str], delimiter: str = ",", parse: Optional[bool] = None
+    ) -> "Table":
+        """Create a table from the lines of a ``csv`` or ``tsv`` code block.
+
+        Args:
+            lines: Lines of the block; the first row is the header.
+            delimiter: Field delimiter.
+            parse: Render cells as markdown; defaults to ``Settings.Table.parse_csv``.
+
+        Returns:
+            Initialized table.
+
+        Raises:
+            ValueError: If the block has no rows.
+        """
+        return cls._from_data(
+            ("block", tuple(lines), delimiter), parse, lines=list(lines)
+        )
+
+    @classmethod
+    def from_csv_file(
+        cls, path: str, delimiter: Optional[str] = None, parse: Optional[bool] = None
+    ) -> "Table":
+        """Create a table from a ``.csv`` or ``.tsv`` file.
+
+        The file is read again whenever the table is written instead of being kept in memory.
+
+        Args:
+            path: Path to the file; the first row is the header.
+            delimiter: Field delimiter; a tab for ``.tsv`` files and a comma otherwise.
+            parse: Render cells as markdown; defaults to ``Settings.Table.parse_csv``.
+
+        Returns:
+            Initialized table.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file has no rows.
+        """
+        if delimiter is None:
+            delimiter = "\t" if path.lower().endswith(".tsv") else ","
+
+        stat = os.stat(path)
+        key = ("file", os.path.abspath(path), stat.st_mtime_ns, stat.st_size, delimiter)
+
+        return cls._from_data(key, parse, path=path)
+
+    @classmethod
+    def _from_data(
+        cls,
+        key: Tuple,
+        parse: Optional[bool],
+        lines: Optional[List[str]] = None,
+        path: Optional[str] = None,
+    ) -> "Table":
+        """Create a table from rows of plain text cells given as block lines or a file path.
+
+        Only the lines or the path are kept, so the table can be pickled for parallel rendering. Without ``parse`` no cell goes through ``Paragraph``: cells are escaped while writing and column widths are estimated from the raw text with numpy, so only a block of rows is held in memory at a time.
+        """
+        table = cls.__new__(cls)
+        BaseClass.__init__(table)
+
+        table.lines = []
+        table._data_key = key
+        table._data_lines = lines
+        table._data_path = path
+        table._delimiter = key[-1]
+        table._parse_data = Settings.Table.parse_csv if parse is None else parse
+
+        header = next((row for row in table._iter_rows() if row), None)
+        if header is None:
+            raise ValueError("Csv data has no header row")
+        table.alignments = ["c"] * len(header)
+
+        if table._parse_data:
+            table.cells = table._parse_lines()
+            table.width_parms = table._define_width_parms(table.cells)
+        else:
+            table.cells = None
+            table.width_parms = table._define_width_parms(
+                table._iter_data_rows(), raw=True
+            )
+        table.colspec = table._define_colspec_parms()
+
+        table.reference = None
+        table.caption = None
+
+        table._is_initialized = True
+
+        return table
+
+    def _iter_rows(self) -> Iterator[List[str]]:
+        """Yield the raw rows of csv data, reading the file again for file tables."""
+        if self._data_path is None:
+            yield from csv.reader(self._data_lines, delimiter=self._delimiter)
+            return
+
+        with open(self._data_path, "r", encoding="utf-8", newline="") as f:
+            yield from csv.reader(f, delimiter=self._delimiter)
+
+    def _iter_data_rows(self) -> Iterator[List[str]]:
+        """Yield non-empty data rows padded or cut to the header length."""
+        columns = len(self.alignments)
+        for row in self._iter_rows():
+            if row:
+                yield (row + [""] * (columns - len(row)))[:columns]
+
+    @classmethod
+    def _escape_row(cls, row: List[str]) -> List[str]:
+        """Escape LaTeX special characters in a row of plain text cells at once."""
+        line = "\x00".join(row)
+        for char, escaped in cls.latex_escapes:
+            if char in line:
+                line = line.replace(char, escaped)
+        return line.split("\x00")
+
     def _identify_reference(self) -> None:
         """Register table reference and mark initialization."""
         self._is_initialized = True
         Global.REFERENCE_DICT[self.reference] = "tab"
 
+    def _render_key(self) -> Optional[Tuple]:
+        """Return the render cache source, or None if a cell uses document state."""
+        if self._data_key is not None:
+            if self._parse_data:
+                return None
+            source = self._data_key
+        elif any(Paragraph.has_stateful_markup(line) for line in self.lines):
+            return None
+        else:
+            source = tuple(self.lines)
+        return (
+            source,
+            self.colspec,
+            self.reference,
+            self.caption,
+            Settings.Table.chunk_rows,
+        )
+
+    @RenderCache.cached
     def to_latex(self) -> str:
         """Render the table to LaTeX longtblr format."""
         if not self._is_initialized:
@@ -39,17 +214,49 @@ class Table(BaseClass):
 
         return self._to_longtblr()
 
+    def to_latex_stream(self, out: TextIO) -> None:
+        """Write the table as LaTeX to an open text handle row by row.
+
+        Tables longer than ``Settings.Table.stream_rows`` keep no rendered cells, so memory stays bounded by a single row. The written text matches ``to_latex``.
+
+        Args:
+            out: Writable text handle receiving the LaTeX output.
+
+        Returns:
+            None
+        """
+        if not self._is_initialized:
+            raise RuntimeError(
+                "Table is not initialized! Firstly call _identify_reference()"
+            )
+
+        for piece in self._iter_longtblr():
+            out.write(piece)
+
     def _to_latex_project(self) -> str:
         return self.to_latex()
 
-    def _parse_lines(self) -> List[List[str]]:
-        """Parse markdown table lines into cell contents and alignments."""
-        new_lines = []
+    def _iter_cells(self) -> Iterator[List[str]]:
+        """Yield rows of rendered cells, reading alignments from the separator row.
+
+        The separator row only sets ``alignments``; every other cell is rendered. Rows of csv data are rendered as markdown only when parsing was asked for and escaped otherwise.
+        """
+        if self._data_key is not None:
+            for row in self._iter_data_rows():
+                if self._parse_data:
+                    yield [Paragraph(x).to_latex() for x in row]
+                else:
+                    yield self._escape_row(row)
+            return
+
+        read_alignments = not self.alignments
+
         for i, line in enumerate(self.lines):
-            line = [Paragraph(x).to_latex() for x in line.strip("|").split("|")]
-            # line = [Paragraph(x).to_latex() for x in line.strip("|").strip().split("|")]
+            boxes = line.strip("|").split("|")
             if i == 1:
-                for box in line:
+                if not read_alignments:
+                    continue
+                for box in boxes:
                     box = box.strip()
                     if box.startswith(":"):
                         self.alignments.append("l")
@@ -60,16 +267,23 @@ class Table(BaseClass):
                     else:
                         self.alignments.append("c")
                 continue
-            new_lines.append(line)
+            yield [Paragraph(x).to_latex() for x in boxes]
 
-        return new_lines
+    def _parse_lines(self) -> List[List[str]]:
+        """Parse markdown table lines into rendered cells and alignments."""
+        return list(self._iter_cells())
+
+    def _rows(self) -> Iterable[List[str]]:
+        """Return the rendered rows, rendering them again for streamed tables."""
+        if self.cells is None:
+            return self._iter_cells()
+        return self.cells
 
     @staticmethod
     def _convert_to_latex_symbols(line: str) -> str:
         """Strip LaTeX markup to count effective symbols for sizing."""
         latex_line = (
-            LatexNodes2Text()
-            .latex_to_text(line)
+            latex_to_text(line)
             .replace(" ", "")
             .replace("_", "")
             .replace("\n", "")
@@ -78,32 +292,57 @@ class Table(BaseClass):
 
         return latex_line
 
-    def _define_width_parms(self) -> np.ndarray:
-        """Calculate column width parameters based on content lengths."""
-        lines = self._parse_lines()
+    def _define_width_parms(
+        self, lines: Iterable[List[str]], raw: bool = False
+    ) -> "np.ndarray":
+        """Calculate column width parameters based on content lengths.
 
-        symbol_lines = []
+        Rows are measured in blocks, so an iterator of rows is never materialized. With ``raw`` the cells are plain text and measured with vectorized string lengths.
+        """
+        width_parms = None
+        self.ilen = 0
+        self.jlen = 0
 
+        block = []
         for line in lines:
-            symbol_line = [len(self._convert_to_latex_symbols(x)) for x in line]
+            if not self.jlen:
+                self.ilen = len(line)
+            self.jlen += 1
 
-            symbol_lines.append(symbol_line)
+            block.append(line)
+            if len(block) == 1024:
+                width_parms = self._max_widths(block, width_parms, raw)
+                block = []
 
-        self.ilen = len(symbol_lines[0])
-        self.jlen = len(symbol_lines)
-
-        width_parms = np.array(symbol_lines, dtype=float).max(axis=0)
+        if block or width_parms is None:
+            width_parms = self._max_widths(block, width_parms, raw)
 
         return width_parms
 
+    @staticmethod
+    def _max_widths(
+        block: List[List[str]], width_parms: Optional["np.ndarray"], raw: bool
+    ) -> "np.ndarray":
+        """Combine the column maxima of a block of rows with the maxima so far."""
+        import numpy as np
+
+        if raw:
+            widths = np.char.str_len(np.array(block, dtype=str)).astype(float)
+        else:
+            widths = np.array(
+                [[visible_width(x) for x in line] for line in block], dtype=float
+            )
+
+        block_max = widths.max(axis=0)
+        if width_parms is None:
+            return block_max
+        return np.maximum(width_parms, block_max)
+
     def _define_colspec_parms(self) -> str:
         """Determine colspec for longtblr based on widths and count."""
         colspec = ""
-        if (
-            self.ilen > 6
-            or (self.ilen > 3 and np.max(self.width_parms) > 20)
-            or np.max(self.width_parms) > 30
-        ):
+        widest = self.width_parms.max()
+        if self.ilen > 6 or (self.ilen > 3 and widest > 20) or widest > 30:
             for i, al in enumerate(self.alignments):
                 colspec += f"X[{self.width_parms[i]},{al}]"
         else:
@@ -113,17 +352,13 @@ class Table(BaseClass):
         return colspec
 
     def _to_basic_table(self):
-        lines = self._parse_lines()
-
-        new_lines = ""
-        for line in lines:
-            line = " & ".join(line) + " \\\\"
-            new_lines += line + "\n"
+        return "".join(" & ".join(line) + " \\\\\n" for line in self._rows())
 
-        return new_lines
+    def _iter_longtblr(self) -> Iterator[str]:
+        """Yield the longtblr environment piece by piece.
 
-    def _to_longtblr(self) -> str:
-        """Render the table as a longtblr environment."""
+        With ``Settings.Table.chunk_rows`` the body is split into several ``longtblr`` environments of at most that many rows, each repeating the header row; label and caption stay on the first one.
+        """
 
         if self.reference:
             reference = f"label={{tab:{self.reference}}},"
@@ -136,11 +371,33 @@ class Table(BaseClass):
         else:
             caption = ""
 
-        string = f"""\\begingroup
+        head = """\\begingroup
 \\centering
 %\\captionsetup{{width=\\linewidth}}
-\\begin{{longtblr}}[{reference} {caption}]{{colspec={{{self.colspec}}}, hlines,vlines}}
-{self._to_basic_table()}
-\\end{{longtblr}}
+\\begin{{longtblr}}[{options}]{{colspec={{{colspec}}}, hlines,vlines}}
+"""
+        tail = """
+\\end{longtblr}
 \\endgroup"""
-        return string
+
+        chunk_rows = Settings.Table.chunk_rows
+
+        yield head.format(options=f"{reference} {caption}", colspec=self.colspec)
+
+        header = ""
+        for i, line in enumerate(self._rows()):
+            line = " & ".join(line) + " \\\\\n"
+            if i == 0:
+                header = line
+            elif chunk_rows and i > 1 and (i - 1) % chunk_rows == 0:
+                yield tail + "\n\n"
+                # Continuations are neither numbered nor listed again
+                yield head.format(options="entry=none,label=none", colspec=self.colspec)
+                yield header
+            yield line
+
+        yield tail
+
+    def _to_longtblr(self) -> str:
+        """Render the table as a longtblr environment."""
+        return "".join(self._iter_longtblr())
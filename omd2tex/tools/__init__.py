@@ -1,29 +1,54 @@
-from omd2tex.tools.settings import Settings
-from omd2tex.tools.globals import Global
-from omd2tex.tools.search import (
-    find_file,
-    find_file_flexible,
-    list_files_in_directory,
-    get_image_dimensions,
-)
-from omd2tex.tools.markdown_parser import MarkdownParser
-from omd2tex.tools.counter import Counter
-from omd2tex.tools.settings_preamble import SettingsPreamble
-from omd2tex.tools.error_catcher import ErrorCompileCatcher
-from omd2tex.tools.frontmatter_parser import FrontMatterParser
-from omd2tex.tools.database import MdDataBase
+import importlib
+import sys
+from typing import Any, List
 
-__all__ = [
-    "Settings",
-    "Global",
-    "find_file",
-    "find_file_flexible",
-    "list_files_in_directory",
-    "get_image_dimensions",
-    "MarkdownParser",
-    "Counter",
-    "SettingsPreamble",
-    "ErrorCompileCatcher",
-    "FrontMatterParser",
-    "MdDataBase",
-]
+# Public names and the modules defining them; modules are imported on first
+# access, so pandas, numpy and the error catcher load only when used
+_lazy = {
+    "ConversionContext": "omd2tex.tools.context",
+    "Settings": "omd2tex.tools.settings",
+    "Global": "omd2tex.tools.globals",
+    "find_file": "omd2tex.tools.search",
+    "find_file_flexible": "omd2tex.tools.search",
+    "locate_file": "omd2tex.tools.search",
+    "list_files_in_directory": "omd2tex.tools.search",
+    "get_image_dimensions": "omd2tex.tools.search",
+    "VaultIndex": "omd2tex.tools.search",
+    "ImageSizeCache": "omd2tex.tools.image_size",
+    "CitationCache": "omd2tex.tools.citation_cache",
+    "IncludeGraph": "omd2tex.tools.include_graph",
+    "MarkdownParser": "omd2tex.tools.markdown_parser",
+    "Counter": "omd2tex.tools.counter",
+    "SettingsPreamble": "omd2tex.tools.settings_preamble",
+    "RenderCache": "omd2tex.tools.render_cache",
+    "AssetCopier": "omd2tex.tools.assets",
+    "SmilesRenderer": "omd2tex.tools.smiles",
+    "ExportManifest": "omd2tex.tools.incremental",
+    "DocumentWatcher": "omd2tex.tools.watch",
+    "ErrorCompileCatcher": "omd2tex.tools.error_catcher",
+    "FrontMatterParser": "omd2tex.tools.frontmatter_parser",
+    "MdDataBase": "omd2tex.tools.database",
+    "ConversionResult": "omd2tex.tools.batch",
+    "convert_many": "omd2tex.tools.batch",
+    "convert_one": "omd2tex.tools.batch",
+}
+
+__all__ = list(_lazy)
+
+
+def __getattr__(name: str) -> Any:
+    """Import the module defining a public name on first access and cache the name."""
+    module = _lazy.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module), name)
+    # Submodules such as ``globals`` and ``list`` shadow builtins here, so the
+    # module namespace is reached through ``sys.modules``
+    setattr(sys.modules[__name__], name, value)
+    return value
+
+
+def __dir__() -> List[str]:
+    """List the module attributes together with the lazily imported names."""
+    return sorted(set(vars(sys.modules[__name__])) | set(_lazy))
@@ -0,0 +1,226 @@
+import contextvars
+import hashlib
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .context import ContextLocalMeta
+from .settings import Settings
+
+
+class AssetCopier(metaclass=ContextLocalMeta):
+    """Copy stage for files referenced by a project export.
+
+    Elements only schedule their assets while rendering; ``flush`` copies them after the LaTeX has been generated. Each destination is copied once, sources with identical content are copied once and linked to the other destinations, destinations that already match their source are skipped, and the remaining files are transferred by a thread pool using reflinks or hardlinks when possible.
+    """
+
+    # Linux ioctl cloning a file into another on copy-on-write filesystems
+    FICLONE = 0x40049409
+
+    _context_local = ("pending", "copied", "linked", "skipped")
+
+    pending: Dict[str, str] = {}
+
+    copied = 0
+    linked = 0
+    skipped = 0
+
+    @classmethod
+    def schedule(cls, source: str, destination: str) -> None:
+        """Register a file to be copied into the export directory.
+
+        Args:
+            source: Existing file to copy.
+            destination: Target path inside the export directory.
+
+        Returns:
+            None
+
+        Raises:
+            FileNotFoundError: If ``source`` is not a file.
+        """
+        if not os.path.isfile(source):
+            raise FileNotFoundError(f"Файл {source} не найден")
+
+        cls.pending[os.path.abspath(destination)] = os.path.abspath(source)
+
+    @classmethod
+    def take(cls) -> Dict[str, str]:
+        """Return and forget the scheduled copies."""
+        pending, cls.pending = cls.pending, {}
+        return pending
+
+    @staticmethod
+    def _is_current(source: str, destination: str) -> bool:
+        """Check whether a destination is the source itself or has its size and mtime."""
+        try:
+            destination_stat = os.stat(destination)
+        except FileNotFoundError:
+            return False
+
+        source_stat = os.stat(source)
+        if (source_stat.st_dev, source_stat.st_ino) == (
+            destination_stat.st_dev,
+            destination_stat.st_ino,
+        ):
+            return True
+
+        return (
+            destination_stat.st_size == source_stat.st_size
+            and destination_stat.st_mtime_ns == source_stat.st_mtime_ns
+        )
+
+    @staticmethod
+    def _hash(path: str) -> str:
+        """Return the SHA-1 of a file's content."""
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @classmethod
+    def _reflink(cls, source: str, destination: str) -> bool:
+        """Clone a file on filesystems supporting copy-on-write; False if unsupported."""
+        if not sys.platform.startswith("linux"):
+            return False
+
+        import fcntl
+
+        try:
+            with open(source, "rb") as src, open(destination, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), cls.FICLONE, src.fileno())
+        except OSError:
+            try:
+                os.remove(destination)
+            except OSError:
+                pass
+            return False
+
+        shutil.copystat(source, destination)
+        return True
+
+    @classmethod
+    def _transfer(cls, source: str, destination: str) -> bool:
+        """Place ``source`` at ``destination`` by reflink, hardlink or copy.
+
+        Returns:
+            True if the file was linked, False if it was copied.
+        """
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+
+        if os.path.lexists(destination):
+            os.remove(destination)
+
+        if Settings.Image.link_in_project_export:
+            if cls._reflink(source, destination):
+                return True
+            try:
+                os.link(source, destination)
+                return True
+            except OSError:
+                pass
+
+        shutil.copy2(source, destination)
+        return False
+
+    @classmethod
+    def _plan(cls, pending: Dict[str, str]) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+        """Split scheduled copies into transfers from the vault and links to other destinations.
+
+        Sources sharing a size are hashed; a source whose content was already planned is linked from the first destination of that content instead of being copied again.
+
+        Returns:
+            Tuple of (source, destination) transfers and (first destination, destination) duplicates.
+        """
+        by_size: Dict[int, List[str]] = {}
+        for source in dict.fromkeys(pending.values()):
+            by_size.setdefault(os.path.getsize(source), []).append(source)
+
+        canonical: Dict[str, str] = {}
+        for sources in by_size.values():
+            if len(sources) == 1:
+                canonical[sources[0]] = sources[0]
+                continue
+            first_with_hash: Dict[str, str] = {}
+            for source in sources:
+                canonical[source] = first_with_hash.setdefault(cls._hash(source), source)
+
+        transfers = []
+        duplicates = []
+        first_destination: Dict[str, str] = {}
+
+        for destination, source in pending.items():
+            content = canonical[source]
+            if content in first_destination:
+                duplicates.append((first_destination[content], destination))
+            else:
+                first_destination[content] = destination
+                transfers.append((source, destination))
+
+        return transfers, duplicates
+
+    @classmethod
+    def flush(cls, workers: Optional[int] = None) -> None:
+        """Copy all scheduled files.
+
+        Args:
+            workers: Number of copy threads; defaults to ``Settings.Export.copy_workers``.
+
+        Returns:
+            None
+
+        Side Effects:
+            Writes into the export directory and updates the ``copied``, ``linked`` and ``skipped`` counters.
+        """
+        pending = cls.take()
+        if not pending:
+            return
+
+        if workers is None:
+            workers = Settings.Export.copy_workers
+
+        transfers, duplicates = cls._plan(pending)
+
+        def transfer(source: str, destination: str) -> Optional[bool]:
+            if cls._is_current(source, destination):
+                return None
+            return cls._transfer(source, destination)
+
+        def count(result: Optional[bool]) -> None:
+            if result is None:
+                cls.skipped += 1
+            elif result:
+                cls.linked += 1
+            else:
+                cls.copied += 1
+
+        if workers > 1 and len(transfers) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # Threads see the settings of the active conversion context
+                futures = [
+                    pool.submit(contextvars.copy_context().run, transfer, *job)
+                    for job in transfers
+                ]
+                for future in futures:
+                    count(future.result())
+        else:
+            for source, destination in transfers:
+                count(transfer(source, destination))
+
+        # Duplicates point into the export directory, so they can always be linked there
+        for first, destination in duplicates:
+            if cls._is_current(first, destination):
+                count(None)
+                continue
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            if os.path.lexists(destination):
+                os.remove(destination)
+            try:
+                os.link(first, destination)
+                count(True)
+            except OSError:
+                shutil.copy2(first, destination)
+                count(False)
@@ -0,0 +1,154 @@
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Union
+
+from .context import ConversionContext
+from .search import VaultIndex, find_file
+from .settings import Settings
+
+
+class ConversionResult(NamedTuple):
+    """Outcome of converting one note with ``convert_many``."""
+
+    path: str
+    output: Optional[str]
+    seconds: float
+    error: Optional[str] = None
+    traceback: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True when the note was converted without an exception."""
+        return self.error is None
+
+
+def _vault_index() -> VaultIndex:
+    """Return the vault index that documents resolve notes with under the current settings.
+
+    The ignore set includes the export directory, as added by ``Document``.
+    """
+    search = os.path.expanduser(Settings.Export.search_dir)
+    exclude = list(Settings.Export.search_ignore_dirs)
+    export_relpath = os.path.relpath(os.path.expanduser(Settings.Export.export_dir), search)
+    if export_relpath not in exclude:
+        exclude.append(export_relpath)
+
+    return VaultIndex.get(os.path.abspath(search), exclude)
+
+
+def _init_worker(settings: Dict[str, Any], settings_preamble: Dict[str, Any]) -> None:
+    """Set up a worker process once for all the notes it converts.
+
+    Applies the parent's settings, keeps rendering inside the worker serial and loads the vault index, so later notes only pay for their own parsing and rendering.
+    """
+    from .settings_preamble import SettingsPreamble
+
+    Settings.update(settings)
+    Settings.Export.workers = 1
+    SettingsPreamble.update(settings_preamble)
+
+    if Settings.Cache.search_index:
+        _vault_index()
+
+
+def _export(path: str, project: bool) -> str:
+    """Convert one note in the active context and return the written path."""
+    from ..objects.document import Document
+
+    filename = os.path.basename(path)
+
+    doc = Document()
+    if not find_file(filename):
+        raise FileNotFoundError(f"Файл {path} не найден")
+    doc.from_file(filename)
+
+    name = doc.filename.replace(".md", "")
+    if project:
+        doc.to_latex_project()
+        return os.path.join(doc.dir, name)
+
+    doc.to_latex_file()
+    return os.path.join(doc.dir, name + ".tex")
+
+
+def convert_one(
+    path: str,
+    project: bool = True,
+    settings: Union[Dict[str, Any], str] = None,
+    preamble: Union[Dict[str, Any], str] = None,
+) -> ConversionResult:
+    """Convert a single note in its own ``ConversionContext``, capturing timing and failures.
+
+    Args:
+        path: Note filename, looked up in ``Settings.Export.search_dir`` like ``Document.from_file``.
+        project: Export a LaTeX project instead of a single ``.tex`` file.
+        settings: Optional ``Settings`` overrides for this conversion.
+        preamble: Optional ``SettingsPreamble`` overrides for this conversion.
+
+    Returns:
+        ConversionResult with the written path, or the error and its traceback.
+    """
+    start = time.perf_counter()
+
+    try:
+        with ConversionContext(settings=settings, preamble=preamble):
+            output = _export(path, project)
+    except Exception as e:
+        return ConversionResult(
+            path=path,
+            output=None,
+            seconds=time.perf_counter() - start,
+            error=f"{type(e).__name__}: {e}",
+            traceback=traceback.format_exc(),
+        )
+
+    return ConversionResult(path=path, output=output, seconds=time.perf_counter() - start)
+
+
+def convert_many(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    project: bool = True,
+    settings: Union[Dict[str, Any], str] = None,
+    preamble: Union[Dict[str, Any], str] = None,
+) -> List[ConversionResult]:
+    """Convert many notes in one process or a pool of worker processes.
+
+    Every note is converted in its own ``ConversionContext``, so notes do not see each other's references, footnotes or settings changes, and a failing note does not stop the others. The interpreter, the imports, the vault index, the formula and latinify tables and the render cache are shared by all notes converted in the same process; the vault index is built here once and loaded by the workers from ``Settings.Cache.dir``.
+
+    Args:
+        paths: Note filenames, looked up in ``Settings.Export.search_dir``.
+        workers: Number of worker processes; defaults to ``Settings.Export.workers``. With one worker notes are converted here one after another.
+        project: Export LaTeX projects instead of single ``.tex`` files.
+        settings: Optional ``Settings`` overrides applied to every note.
+        preamble: Optional ``SettingsPreamble`` overrides applied to every note.
+
+    Returns:
+        ConversionResult per note, in the order of ``paths``.
+    """
+    from .settings_preamble import SettingsPreamble
+
+    paths = list(paths)
+
+    if workers is None:
+        workers = Settings.Export.workers or 1
+
+    if Settings.Cache.search_index:
+        # Workers load the index saved here instead of walking the vault
+        _vault_index().refresh()
+
+    if workers <= 1 or len(paths) < 2:
+        return [convert_one(path, project, settings, preamble) for path in paths]
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(paths)),
+        initializer=_init_worker,
+        initargs=(Settings.to_dict(), SettingsPreamble.to_dict()),
+    ) as pool:
+        futures = [
+            pool.submit(convert_one, path, project, settings, preamble)
+            for path in paths
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,126 @@
+import atexit
+import hashlib
+import inspect
+import json
+import os
+from typing import Callable, Dict, List, Optional
+
+from .settings import Settings
+
+
+class CitationCache:
+    """Persistent cache of parsed citation notes keyed by path, size and modification time.
+
+    A citation note is read and parsed once; the result is kept in memory for the whole process and written to ``Settings.Cache.dir`` when the process exits, so later runs only ``stat`` unchanged notes. The cached text depends on the parsing code, so every entry also stores a tag of the package version and the parse function's source, and entries of other code are parsed again.
+    """
+
+    version = 2
+    filename = "citations.json"
+
+    entries: Dict[str, List] = {}
+    _parser_tags: Dict[Callable[[str], str], str] = {}
+
+    _loaded = False
+    _dirty = False
+
+    @classmethod
+    def cache_path(cls) -> Optional[str]:
+        """Location of the persisted cache, or None when caching is disabled."""
+        if not Settings.Cache.dir or not Settings.Cache.citations:
+            return None
+
+        return os.path.join(os.path.expanduser(Settings.Cache.dir), cls.filename)
+
+    @classmethod
+    def load(cls) -> None:
+        """Load persisted entries once per process; a missing or invalid file is ignored."""
+        cls._loaded = True
+
+        path = cls.cache_path()
+        if not path:
+            return
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get("version") == cls.version:
+            cls.entries.update(data["entries"])
+
+    @classmethod
+    def save(cls) -> None:
+        """Persist the entries atomically if they changed; failures are ignored."""
+        path = cls.cache_path()
+        if not path or not cls._dirty:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": cls.version, "entries": cls.entries}, f)
+            os.replace(tmp_path, path)
+            cls._dirty = False
+        except OSError:
+            pass
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget in-memory entries; the persisted file is left untouched."""
+        cls.entries = {}
+        cls._loaded = False
+        cls._dirty = False
+
+    @classmethod
+    def parser_tag(cls, parse: Callable[[str], str]) -> str:
+        """Return a hash of ``omd2tex.__version__`` and the source of a parse function."""
+        tag = cls._parser_tags.get(parse)
+        if tag is None:
+            from .. import __version__
+
+            try:
+                source = inspect.getsource(parse)
+            except (OSError, TypeError):
+                source = getattr(parse, "__qualname__", repr(parse))
+
+            tag = hashlib.sha1(f"{__version__}\n{source}".encode("utf-8")).hexdigest()[:16]
+            cls._parser_tags[parse] = tag
+
+        return tag
+
+    @classmethod
+    def get(cls, path: str, parse: Callable[[str], str]) -> str:
+        """Return the parsed text of a citation note, reading it on a cache miss.
+
+        Args:
+            path: Path to the citation note.
+            parse: Function turning the note's text into BibTeX; its result is cached.
+
+        Returns:
+            Parsed BibTeX text.
+
+        Raises:
+            OSError: If the note cannot be read.
+        """
+        stat = os.stat(path)
+
+        if not cls._loaded:
+            cls.load()
+
+        key = os.path.abspath(path)
+        tag = cls.parser_tag(parse)
+        entry = cls.entries.get(key)
+        if entry and entry[:3] == [stat.st_mtime_ns, stat.st_size, tag]:
+            return entry[3]
+
+        with open(path, "r") as f:
+            text = parse(f.read())
+
+        if not cls._dirty and cls.cache_path():
+            atexit.register(cls.save)
+        cls._dirty = True
+        cls.entries[key] = [stat.st_mtime_ns, stat.st_size, tag, text]
+
+        return text
@@ -4,36 +4,33 @@ import yaml
 from pathlib import Path
 from typing import Any, Dict, Union
 
+from .context import ContextLocalMeta
 
-class ConfigBase:
-    _class_original_values: Dict[str, Any] = None
 
-    @classmethod
-    def _save_class_original_values(cls) -> None:
-        """Snapshot class attribute defaults for later restoration.
+class _ConfigMeta(ContextLocalMeta):
+    def __setattr__(cls, name: str, value: Any) -> None:
+        """Set a class attribute and bump the shared configuration revision.
+
+        Classes holding runtime state rather than configuration opt out with ``_track_revision = False``.
 
         Args:
-            cls: Target configuration class.
+            name: Attribute name.
+            value: New attribute value.
 
         Returns:
             None
-
-        Side Effects:
-            Populates the class-level `_class_original_values` cache.
         """
-        if cls._class_original_values is None:
-            cls._class_original_values = {}
-            for name in dir(cls):
-                if name.startswith("_") or callable(getattr(cls, name)):
-                    continue
-                value = getattr(cls, name)
-                if isinstance(value, type) and issubclass(value, ConfigBase):
-                    value._save_class_original_values()
-                    cls._class_original_values[name] = copy.deepcopy(
-                        value._class_original_values
-                    )
-                else:
-                    cls._class_original_values[name] = copy.deepcopy(value)
+        super().__setattr__(name, value)
+        if not name.startswith("_") and cls._track_revision:
+            ConfigBase._revision += 1
+
+
+class ConfigBase(metaclass=_ConfigMeta):
+    # Incremented on every public attribute assignment of a tracked configuration class
+    _revision = 0
+    _track_revision = True
+    # A new ConversionContext starts from the configuration in effect
+    _context_inherits = True
 
     @classmethod
     def update(cls, source: Union[Dict[str, Any], str]) -> None:
@@ -50,9 +47,6 @@ class ConfigBase:
             ValueError: When the file format is unsupported.
             json.JSONDecodeError or yaml.YAMLError: If configuration parsing fails.
         """
-        if cls._class_original_values is None:
-            cls._save_class_original_values()
-
         if isinstance(source, str):
             file_path = Path(source)
             if not file_path.exists():
@@ -113,15 +107,13 @@ class ConfigBase:
             None
 
         Side Effects:
-            Mutates class attributes back to saved defaults.
+            Mutates class attributes back to the values of the class bodies, in the active ``ConversionContext`` if any.
         """
-        if cls._class_original_values is None:
-            cls._save_class_original_values()
         cls._reset_class_to_default(cls)
 
     @classmethod
     def _reset_class_to_default(cls, target) -> None:
-        """Recursively reset configuration attributes to their saved defaults.
+        """Recursively reset configuration attributes to their class body values.
 
         Args:
             target: Configuration class or subclass to reset.
@@ -132,19 +124,41 @@ class ConfigBase:
         Side Effects:
             Mutates the target's attributes in place.
         """
-        if target._class_original_values is None:
-            target._save_class_original_values()
-
-        for name, original_value in target._class_original_values.items():
-            if isinstance(original_value, dict):
-                # вложенный класс
-                nested_class = getattr(target, name, None)
-                if isinstance(nested_class, type) and issubclass(
-                    nested_class, ConfigBase
-                ):
-                    target._reset_class_to_default(nested_class)
-            else:
-                setattr(target, name, copy.deepcopy(original_value))
+        for name, original_value in type.__getattribute__(
+            target, "_class_defaults"
+        ).items():
+            setattr(target, name, copy.deepcopy(original_value))
+
+        for name in dir(target):
+            if name.startswith("_"):
+                continue
+            nested_class = getattr(target, name)
+            if isinstance(nested_class, type) and issubclass(nested_class, ConfigBase):
+                target._reset_class_to_default(nested_class)
+
+    @classmethod
+    def to_dict(cls) -> Dict[str, Any]:
+        """Return current configuration values as a nested dictionary.
+
+        The result can be passed back to ``update`` to restore the same values, for example in another process.
+
+        Args:
+            cls: Target configuration class.
+
+        Returns:
+            Mapping of attribute names to values; nested configuration classes become nested mappings.
+        """
+        data = {}
+        for name in dir(cls):
+            if name.startswith("_"):
+                continue
+            value = getattr(cls, name)
+            if isinstance(value, type) and issubclass(value, ConfigBase):
+                data[name] = value.to_dict()
+            elif not callable(value):
+                data[name] = copy.deepcopy(value)
+
+        return data
 
     @classmethod
     def check(cls, indent: int = 0) -> None:
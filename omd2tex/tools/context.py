@@ -0,0 +1,148 @@
+import copy
+from contextlib import nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple, Union
+
+_current: ContextVar[Optional["ConversionContext"]] = ContextVar(
+    "omd2tex_conversion_context", default=None
+)
+
+# Tokens of the contexts entered in the current thread or task
+_tokens: ContextVar[Tuple[Any, ...]] = ContextVar("omd2tex_context_tokens", default=())
+
+# Every class whose state is resolved per conversion context, in creation order
+_context_local_classes: List[type] = []
+
+
+class ContextLocalMeta(type):
+    """Metaclass making selected class attributes local to a ``ConversionContext``.
+
+    Outside of a context the attributes are plain class attributes. Inside one, reads and assignments go to the context's own copy, so conversions running in other threads or asyncio tasks see their own state. A class lists its attributes in ``_context_local``; without it every public attribute that is neither callable nor a nested class is local. Classes with ``_context_inherits`` start from a copy of the values in effect when the context is created, the others from the values of their class body.
+    """
+
+    def __init__(cls, name: str, bases: Tuple[type, ...], namespace: Dict[str, Any]) -> None:
+        """Record the context-local attributes of a new class and their defaults."""
+        super().__init__(name, bases, namespace)
+
+        names = namespace.get("_context_local")
+        if names is None:
+            names = [
+                key
+                for key, value in namespace.items()
+                if not key.startswith("_")
+                and not callable(value)
+                and not isinstance(value, (classmethod, staticmethod, property))
+            ]
+
+        type.__setattr__(cls, "_context_names", frozenset(names))
+        type.__setattr__(
+            cls, "_class_defaults", {key: copy.deepcopy(namespace[key]) for key in names}
+        )
+        _context_local_classes.append(cls)
+
+    def __getattribute__(cls, name: str) -> Any:
+        """Resolve an attribute in the active conversion context, if any."""
+        context = _current.get()
+        if context is not None:
+            values = context._state.get(cls)
+            if values is None:
+                if name not in type.__getattribute__(cls, "_context_names"):
+                    return type.__getattribute__(cls, name)
+                values = context._values(cls)
+            if name in values:
+                return values[name]
+
+        return type.__getattribute__(cls, name)
+
+    def __setattr__(cls, name: str, value: Any) -> None:
+        """Assign an attribute in the active conversion context, if any."""
+        context = _current.get()
+        if context is not None and name in type.__getattribute__(cls, "_context_names"):
+            context._values(cls)[name] = value
+        else:
+            super().__setattr__(name, value)
+
+
+class ConversionContext:
+    """State of one conversion: settings, preamble settings, globals, footnotes, citations and export queues.
+
+    Entering the context (``with context:``) makes every ``ContextLocalMeta`` class resolve its state in it for the current thread or asyncio task, so ``Settings``, ``Global`` and the other classes keep their usual class-attribute API. Conversions in separate contexts do not share state and may run concurrently; state of a finished context is released with it. Without an active context the classes behave as process-wide globals.
+
+    A new context copies ``Settings`` and ``SettingsPreamble`` in effect when it is created, while runtime state such as ``Global`` and the footnote collection starts from defaults.
+    """
+
+    def __init__(
+        self,
+        settings: Union[Dict[str, Any], str] = None,
+        preamble: Union[Dict[str, Any], str] = None,
+    ) -> None:
+        """Create a conversion context.
+
+        Args:
+            settings: Optional dict or path with ``Settings`` overrides for this context.
+            preamble: Optional dict or path with ``SettingsPreamble`` overrides for this context.
+
+        Returns:
+            None
+        """
+        from .settings import Settings
+        from .settings_preamble import SettingsPreamble
+
+        self._state: Dict[type, Dict[str, Any]] = {}
+
+        for cls in list(_context_local_classes):
+            if getattr(cls, "_context_inherits", False):
+                self._state[cls] = {
+                    name: copy.deepcopy(getattr(cls, name))
+                    for name in type.__getattribute__(cls, "_context_names")
+                }
+
+        if settings or preamble:
+            with self:
+                if settings:
+                    Settings.update(settings)
+                if preamble:
+                    SettingsPreamble.update(preamble)
+
+    def _values(self, cls: type) -> Dict[str, Any]:
+        """Return this context's attribute values of a class, starting from its defaults."""
+        values = self._state.get(cls)
+        if values is None:
+            values = copy.deepcopy(type.__getattribute__(cls, "_class_defaults"))
+            self._state[cls] = values
+        return values
+
+    @staticmethod
+    def current() -> Optional["ConversionContext"]:
+        """Return the context active in the current thread or task, or None."""
+        return _current.get()
+
+    def __enter__(self) -> "ConversionContext":
+        """Activate the context; contexts may be entered again while active."""
+        _tokens.set(_tokens.get() + (_current.set(self),))
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        """Restore the context that was active before entering."""
+        tokens = _tokens.get()
+        _tokens.set(tokens[:-1])
+        _current.reset(tokens[-1])
+
+    @staticmethod
+    def activate(context: Optional["ConversionContext"]) -> ContextManager:
+        """Return a context manager entering ``context`` unless it is None or already active."""
+        if context is None or context is _current.get():
+            return nullcontext(context)
+        return context
+
+
+def in_context(method: Callable) -> Callable:
+    """Decorate a method to run inside the ``ConversionContext`` stored in ``self.context``."""
+
+    @wraps(method)
+    def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        with ConversionContext.activate(self.context):
+            return method(self, *args, **kwargs)
+
+    return wrapper
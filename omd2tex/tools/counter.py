@@ -2,4 +2,7 @@ from .config_base import ConfigBase
 
 
 class Counter(ConfigBase):
+    _track_revision = False
+    _context_inherits = False
+
     Splitline = 0
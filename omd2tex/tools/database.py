@@ -1,16 +1,42 @@
-import pandas as pd
+import hashlib
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from .settings import Settings
 from .frontmatter_parser import FrontMatterParser
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def read_frontmatter(abs_path: str) -> Dict:
+    """Return the parsed frontmatter of a markdown file, reading only its leading lines.
+
+    Defined at module level so that process pools can pickle it.
+    """
+    yaml_text = FrontMatterParser.read_block(abs_path)
+    if not yaml_text:
+        return {}
+
+    return FrontMatterParser.load(yaml_text)
+
 
 class MdDataBase:
-    def __init__(self, search_path: str = None) -> None:
+    """Frontmatter database of the markdown notes under a search directory.
+
+    Parsed frontmatter is kept per file together with the file's mtime and size and persisted under ``Settings.Cache.dir``, so ``refresh`` only re-reads notes that were added or changed and drops deleted ones. ``to_df`` and ``query`` refresh first and reuse the DataFrame while nothing changed.
+    """
+
+    version = 1
+
+    def __init__(self, search_path: str = None, workers: Optional[int] = None) -> None:
         """Create a markdown database scanner over a search path.
 
         Args:
             search_path: Root directory to traverse; defaults to ``Settings.Export.search_dir`` when None.
+            workers: Number of processes parsing frontmatter; defaults to ``Settings.Export.workers``.
 
         Returns:
             None
@@ -21,39 +47,198 @@ class MdDataBase:
             self.search_path = search_path
 
         self.search_path = os.path.expanduser(self.search_path)
+        self.workers = workers
+
+        self.entries: Dict[str, List[Any]] = {}
+        self._loaded = False
+        self._df = None
+
+    @property
+    def ignored_dirs(self) -> List[str]:
+        """Sorted lowercased names of ignored directories."""
+        return sorted({d.lower() for d in Settings.Export.search_ignore_dirs or [] if d})
+
+    def markdown_files(self) -> List[str]:
+        """List markdown files under the search path, pruning ignored directories.
+
+        Directories named in ``Settings.Export.search_ignore_dirs`` (case-insensitive) are skipped together with everything below them.
+
+        Returns:
+            Absolute paths in walk order.
+        """
+        ignored = set(self.ignored_dirs)
+
+        paths = []
+        for root, dirs, files in os.walk(self.search_path):
+            dirs[:] = [d for d in dirs if d.lower() not in ignored]
+
+            for file in files:
+                if file.endswith(".md"):
+                    paths.append(os.path.join(root, file))
+
+        return paths
+
+    @property
+    def cache_path(self) -> Optional[str]:
+        """Location of the persisted database, or None when caching is disabled."""
+        if not Settings.Cache.dir or not Settings.Cache.database:
+            return None
+
+        key = json.dumps([os.path.abspath(self.search_path), self.ignored_dirs])
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+        return os.path.join(
+            os.path.expanduser(Settings.Cache.dir), f"frontmatter-db-{digest}.json"
+        )
+
+    def load(self) -> bool:
+        """Load the persisted entries; a missing, outdated or invalid file is ignored.
+
+        Returns:
+            True when entries were loaded, False otherwise.
+        """
+        self._loaded = True
+
+        path = self.cache_path
+        if not path or not os.path.isfile(path):
+            return False
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if data.get("version") != self.version:
+            return False
+
+        self.entries = data["entries"]
+        self._df = None
+        return True
+
+    def save(self) -> None:
+        """Persist the entries to ``Settings.Cache.dir``; failures are ignored."""
+        path = self.cache_path
+        if not path:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": self.version, "entries": self.entries},
+                    f,
+                    ensure_ascii=False,
+                    default=str,
+                )
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def _read_all(self, paths: List[str]) -> List[Dict]:
+        """Parse the frontmatter of several files, in a process pool with more than one worker."""
+        workers = self.workers
+        if workers is None:
+            workers = Settings.Export.workers or 1
+
+        if workers > 1 and len(paths) > 1:
+            chunksize = max(1, len(paths) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(read_frontmatter, paths, chunksize=chunksize))
+
+        return [read_frontmatter(path) for path in paths]
+
+    def refresh(self) -> bool:
+        """Bring the database up to date with the files on disk.
+
+        Every note is stat'ed; only notes whose mtime or size changed are read again, and notes that no longer exist are dropped.
+
+        Returns:
+            True when any entry changed, False when the database was already current.
+
+        Side Effects:
+            Persists the database when it changed.
+        """
+        if not self._loaded:
+            self.load()
+
+        entries = {}
+        changed = []
+
+        for path in self.markdown_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            entry = self.entries.get(path)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                entries[path] = entry
+            else:
+                entries[path] = [stat.st_mtime_ns, stat.st_size, None]
+                changed.append(path)
+
+        for path, frontmatter in zip(changed, self._read_all(changed)):
+            entries[path][2] = frontmatter
+
+        modified = bool(changed) or list(entries) != list(self.entries)
+        self.entries = entries
+
+        if modified:
+            self._df = None
+            self.save()
+
+        return modified
 
     # @property
-    def to_df(self) -> pd.DataFrame:
+    def to_df(self) -> "pd.DataFrame":
         """Collect frontmatter from markdown files into a DataFrame.
 
-        Walks the search path, parses frontmatter of each ``.md`` file, and aggregates metadata into a pandas DataFrame.
+        Refreshes the database first, so only new and changed notes are read; see ``refresh``. The YAML is parsed with LibYAML when available and, with more than one worker, in a process pool.
 
         Args:
             None
 
         Returns:
-            pandas.DataFrame containing one row per markdown file with frontmatter fields plus filename and absolute path.
+            pandas.DataFrame containing one row per markdown file with frontmatter fields plus filename and absolute path, with columns converted to the best possible dtypes.
 
         Side Effects:
-            Reads files from disk.
+            Reads files from disk and updates the persisted database.
         """
-        all_dict = []
+        self.refresh()
 
-        for root, dirs, files in os.walk(self.search_path):
-            if any(dir in Settings.Export.search_ignore_dirs for dir in dirs):
-                continue
+        return self._frame().copy()
 
-            for file in files:
-                if not file.endswith(".md"):
-                    continue
-                abs_file = os.path.join(root, file)
-                fmp = FrontMatterParser(abs_path=abs_file)
+    def query(self, expr: str, **kwargs: Any) -> "pd.DataFrame":
+        """Filter the notes with a ``DataFrame.query`` expression.
 
+        Args:
+            expr: Query expression over frontmatter columns, ``filename`` and ``abs_path``.
+            **kwargs: Passed to ``DataFrame.query``.
+
+        Returns:
+            pandas.DataFrame of the matching notes.
+        """
+        self.refresh()
+
+        return self._frame().query(expr, **kwargs)
+
+    def _frame(self) -> "pd.DataFrame":
+        """Return the DataFrame of the current entries, building it once per change."""
+        if self._df is None:
+            import pandas as pd
+
+            all_dict = []
+
+            for abs_file, (_, _, frontmatter) in self.entries.items():
                 fmp_dict = {}
-                fmp_dict.update(fmp.yaml)
-                fmp_dict["filename"] = file
+                fmp_dict.update(frontmatter)
+                fmp_dict["filename"] = os.path.basename(abs_file)
                 fmp_dict["abs_path"] = abs_file
 
                 all_dict.append(fmp_dict)
 
-        return pd.DataFrame(all_dict)
+            self._df = pd.DataFrame(all_dict).convert_dtypes()
+
+        return self._df
@@ -1,6 +1,10 @@
+import hashlib
 import shutil
+import tempfile
 import time
-from typing import Any, List, Optional, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
 import subprocess
 import os
 
@@ -111,6 +115,8 @@ CompileError:
 
 
 class ErrorCompileCatcher:
+    failed_formats = set()
+
     def __init__(self, md_object: Union[Document, File, MarkdownParser, List[Any]]) -> None:
         """Prepare an error catcher for provided markdown-derived objects.
 
@@ -299,6 +305,296 @@ class ErrorCompileCatcher:
         else:
             return new_list
 
+    @staticmethod
+    def _run_pdflatex(
+        tex_filename: str,
+        cwd: str,
+        timeout: int,
+        fmt: Optional[Tuple[str, str]] = None,
+    ) -> Tuple[Any, float]:
+        """Run pdflatex on a written LaTeX file.
+
+        Args:
+            tex_filename: Name of the ``.tex`` file inside ``cwd``.
+            cwd: Working directory of the compilation.
+            timeout: Maximum seconds for the pdflatex invocation.
+            fmt: Optional directory and name of a precompiled preamble format.
+
+        Returns:
+            Tuple of completed process (with decoded output) and elapsed seconds.
+
+        Raises:
+            subprocess.SubprocessError: Propagated from pdflatex failures beyond handled cases.
+        """
+        comp_time_start = time.time()
+
+        command = ["pdflatex", "-shell-escape", "-interaction=nonstopmode", tex_filename]
+        env = None
+
+        if fmt:
+            format_dir, name = fmt
+            command.insert(1, f"-fmt={name}")
+            # Trailing separator keeps the default format search path
+            env = dict(os.environ, TEXFORMATS=format_dir + os.pathsep)
+
+        try:
+            result = subprocess.run(
+                command,
+                capture_output=True,
+                text=True,
+                cwd=cwd,
+                env=env,
+                encoding="utf-8",
+                errors="replace",
+                timeout=timeout,
+            )
+        except UnicodeDecodeError:
+            result = subprocess.run(
+                command,
+                capture_output=True,
+                cwd=cwd,
+                env=env,
+                timeout=timeout,
+            )
+            stdout = result.stdout.decode("utf-8", errors="replace")
+            stderr = result.stderr.decode("utf-8", errors="replace")
+            result.stdout = stdout
+            result.stderr = stderr
+
+        return result, time.time() - comp_time_start
+
+    @staticmethod
+    def _preamble_format(
+        preamble: str, export_dir: str, timeout: int
+    ) -> Optional[Tuple[str, str]]:
+        """Dump a preamble into a precompiled pdflatex format.
+
+        The format is built once with ``mylatexformat`` and named after a hash of the preamble text, so any change of ``SettingsPreamble`` or ``Global.NEW_COMMANDS_PREAMBLE`` yields a new format. The preamble must not include ``Citation.to_latex_preamble()``: the inline bibliography changes with every cited source, so it is written after ``\\endofdump`` instead of being dumped. Failed dumps are remembered in ``failed_formats`` and compilation falls back to reading the full preamble.
+
+        Args:
+            preamble: Rendered LaTeX preamble.
+            export_dir: Error catcher directory holding the ``formats`` subdirectory.
+            timeout: Maximum seconds for a regular pdflatex invocation.
+
+        Returns:
+            Tuple of format directory and format name, or None if no format is available.
+
+        Side Effects:
+            Writes the preamble and the ``.fmt`` file to ``export_dir/formats``.
+        """
+        if not Settings.Preamble.precompiled_format or not preamble.strip():
+            return None
+
+        format_dir = os.path.join(export_dir, "formats")
+        name = "preamble-" + hashlib.sha1(preamble.encode("utf-8")).hexdigest()[:16]
+        format_path = os.path.join(format_dir, name + ".fmt")
+
+        if (
+            not os.path.exists(format_path)
+            and format_path not in ErrorCompileCatcher.failed_formats
+        ):
+            os.makedirs(format_dir, exist_ok=True)
+
+            with open(os.path.join(format_dir, name + ".tex"), "w") as f:
+                f.write(preamble + "\n\\begin{document}\n\\end{document}\n")
+
+            try:
+                subprocess.run(
+                    [
+                        "pdflatex",
+                        "-ini",
+                        "-shell-escape",
+                        "-interaction=nonstopmode",
+                        f"-jobname={name}",
+                        "&pdflatex",
+                        "mylatexformat.ltx",
+                        name + ".tex",
+                    ],
+                    capture_output=True,
+                    cwd=format_dir,
+                    timeout=timeout * 4,
+                )
+            except (OSError, subprocess.SubprocessError):
+                pass
+
+            if not os.path.exists(format_path):
+                ErrorCompileCatcher.failed_formats.add(format_path)
+
+        if os.path.exists(format_path):
+            return format_dir, name
+
+        return None
+
+    @staticmethod
+    def _write_job(
+        objects: List[ObjectImage], export_dir: str, timeout: int
+    ) -> Tuple[str, str, Optional[Tuple[str, str]]]:
+        """Write objects as a standalone LaTeX document in an isolated directory.
+
+        Rendering touches global state, so it always runs in the calling thread, and it renders serially: ``Settings.Export.workers`` sets how many pdflatex processes run, not a process pool per job. When a precompiled preamble format is available, ``\\endofdump`` is placed after the preamble so pdflatex skips the part stored in the format; the bibliography of the job follows it and is read on every compilation.
+
+        Args:
+            objects: Wrapped objects to put into the document.
+            export_dir: Parent directory for the job directory.
+            timeout: Maximum seconds for a regular pdflatex invocation.
+
+        Returns:
+            Tuple of job directory, written ``.tex`` filename and preamble format.
+
+        Side Effects:
+            Creates a temporary directory and temporarily switches ``Settings.Export.export_dir`` and ``Settings.Export.workers``; ``Settings.Export.search_ignore_dirs``, which ``Document`` extends with the job directory, is restored afterwards.
+        """
+        job_dir = tempfile.mkdtemp(prefix="job-", dir=export_dir)
+
+        old_export_dir = Settings.Export.export_dir
+        old_ignore_dirs = list(Settings.Export.search_ignore_dirs)
+        old_workers = Settings.Export.workers
+        Settings.Export.export_dir = job_dir
+        Settings.Export.workers = 1
+
+        try:
+            doc = Document().from_elements([x.object for x in objects])
+
+            preamble = doc.preamble.to_latex()
+            fmt = ErrorCompileCatcher._preamble_format(preamble, export_dir, timeout)
+
+            if fmt:
+                latex = doc.to_latex(end_of_dump=True)
+
+                with open(os.path.join(job_dir, doc.filename + ".tex"), "w") as f:
+                    f.write(latex)
+            else:
+                doc.to_latex_file()
+        finally:
+            Settings.Export.export_dir = old_export_dir
+            Settings.Export.search_ignore_dirs = old_ignore_dirs
+            Settings.Export.workers = old_workers
+
+        return job_dir, doc.filename + ".tex", fmt
+
+    @staticmethod
+    def _compile_jobs(
+        jobs: List[List[ObjectImage]],
+        export_dir: str,
+        workers: int,
+        timeout: int,
+    ) -> Iterator[Tuple[str, Any, float]]:
+        """Compile jobs concurrently and yield their results in job order.
+
+        Jobs are written in the calling thread and at most ``workers`` pdflatex processes run at once, each in its own job directory. Closing the iterator early cancels jobs that have not started.
+
+        Args:
+            jobs: Groups of wrapped objects, one standalone document per group.
+            export_dir: Parent directory for job directories.
+            workers: Maximum number of concurrent pdflatex processes.
+            timeout: Maximum seconds for each pdflatex invocation.
+
+        Yields:
+            Tuples of written ``.tex`` filename, completed process and elapsed seconds.
+        """
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            try:
+                for i in range(len(jobs)):
+                    while len(pending) < workers and i + len(pending) < len(jobs):
+                        job_dir, tex_filename, fmt = ErrorCompileCatcher._write_job(
+                            jobs[i + len(pending)], export_dir, timeout
+                        )
+                        future = pool.submit(
+                            ErrorCompileCatcher._run_pdflatex,
+                            tex_filename,
+                            job_dir,
+                            timeout,
+                            fmt,
+                        )
+                        pending.append((tex_filename, future))
+
+                    tex_filename, future = pending.popleft()
+                    result, seconds = future.result()
+
+                    yield tex_filename, result, seconds
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def _has_critical_errors(result: Any) -> bool:
+        """Check whether a pdflatex run failed.
+
+        Args:
+            result: Completed pdflatex process.
+
+        Returns:
+            True if the return code, stderr or stdout report a critical error.
+        """
+        return (
+            result.returncode != 0  # Код возврата не 0
+            or "error" in result.stderr.lower()  # Есть ошибки в stderr
+            or "emergency stop" in result.stdout.lower()  # Критические ошибки в stdout
+        )
+
+    @staticmethod
+    def _bisect(
+        objects: List[ObjectImage],
+        result: Any,
+        export_dir: str,
+        workers: int,
+        timeout: int,
+        on_compile: Callable[[List[ObjectImage], str, Any, float], None],
+    ) -> Iterator[ObjectImage]:
+        """Isolate failing objects in a range by compiling halves of it.
+
+        Only failing halves are split further, so k errors among n objects cost O(k log n) compilations. Both halves of a range are compiled concurrently when ``workers`` allows it. Objects are resolved in document order.
+
+        Args:
+            objects: Wrapped objects whose joint compilation failed.
+            result: Completed pdflatex process for ``objects``.
+            export_dir: Parent directory for job directories.
+            workers: Maximum number of concurrent pdflatex processes.
+            timeout: Maximum seconds for each pdflatex invocation.
+            on_compile: Callback receiving compiled objects, ``.tex`` filename, process and seconds for every compilation.
+
+        Yields:
+            Objects that fail to compile on their own, in document order.
+
+        Side Effects:
+            Sets ``compile_success`` (and ``stdout`` for failures) on resolved objects.
+        """
+        if len(objects) == 1:
+            ob = objects[0]
+            if result.returncode == 1:
+                ob.stdout = result.stdout
+                ob.compile_success = False
+                yield ob
+            else:
+                ob.compile_success = True
+            return
+
+        middle = len(objects) // 2
+        halves = [objects[:middle], objects[middle:]]
+
+        half_results = ErrorCompileCatcher._compile_jobs(
+            halves, export_dir, workers, timeout
+        )
+        try:
+            for half, (tex_filename, half_result, seconds) in zip(
+                halves, half_results
+            ):
+                on_compile(half, tex_filename, half_result, seconds)
+
+                if len(half) == 1 or ErrorCompileCatcher._has_critical_errors(
+                    half_result
+                ):
+                    yield from ErrorCompileCatcher._bisect(
+                        half, half_result, export_dir, workers, timeout, on_compile
+                    )
+                else:
+                    for ob in half:
+                        ob.compile_success = True
+        finally:
+            half_results.close()
+
     @staticmethod
     def _recursive_compiler(
         objects: List[ObjectImage],
@@ -307,9 +603,12 @@ class ErrorCompileCatcher:
         rmdir: bool = False,
         print_analyzing: bool = True,
         timeout: int = 15,
+        workers: Optional[int] = None,
     ) -> List[ObjectImage]:
         """Compile markdown objects in batches until errors are found or completed.
 
+        Batches are compiled concurrently by up to ``workers`` pdflatex processes, each in an isolated directory under ``error_catcher``. Results are applied to ``objects`` in order, so progress output and early stopping match the sequential run. Failing batches are narrowed down by ``_bisect`` instead of compiling every element, and the summary reports how many compilations that saved.
+
         Args:
             objects: List of wrapped markdown objects to compile.
             batch: Optional batch size; defaults to 30% of items or 1.
@@ -317,6 +616,7 @@ class ErrorCompileCatcher:
             rmdir: Whether to remove temporary export directory after completion.
             print_analyzing: Whether to print compilation progress.
             timeout: Maximum seconds for each pdflatex invocation.
+            workers: Number of concurrent pdflatex processes; defaults to ``Settings.Export.workers``.
 
         Returns:
             List of objects annotated with compilation results.
@@ -346,6 +646,9 @@ class ErrorCompileCatcher:
             if not batch:
                 batch = 1
 
+        if not workers:
+            workers = Settings.Export.workers or 1
+
         objects_chunked = chunk_list(objects, batch)
 
         current_dir = os.getcwd()
@@ -358,131 +661,58 @@ class ErrorCompileCatcher:
 
         os.makedirs(export_dir, exist_ok=True)
 
-        old_export_dir = Settings.Export.export_dir
-        Settings.Export.export_dir = export_dir
-
         start = time.time()
 
+        position = {id(ob): k for k, ob in enumerate(objects)}
+        compiles = 0
+        linear_compiles = 0
         errors_found = 0
-        sub_checked = False
-        for i, obj in enumerate(objects_chunked):
-            comp_time_start = time.time()
 
-            doc = Document().from_elements([x.object for x in obj])
+        def on_compile(compiled, tex_filename, result, seconds):
+            """Count a compilation and print its progress line."""
+            nonlocal compiles
+            compiles += 1
 
-            doc.to_latex_file()
-
-            # doc.check()
-
-            try:
-                result = subprocess.run(
-                    [
-                        "pdflatex",
-                        "-shell-escape",
-                        "-interaction=nonstopmode",
-                        doc.filename + ".tex",
-                    ],
-                    capture_output=True,
-                    text=True,
-                    cwd=export_dir,
-                    encoding="utf-8",
-                    errors="replace",
-                    timeout=timeout,
-                )
-            except UnicodeDecodeError:
-                result = subprocess.run(
-                    [
-                        "pdflatex",
-                        "-shell-escape",
-                        "-interaction=nonstopmode",
-                        doc.filename + ".tex",
-                    ],
-                    capture_output=True,
-                    cwd=export_dir,
-                    timeout=timeout,
+            if print_analyzing:
+                proc = (position[id(compiled[-1])] + 1) / length * 100
+                print(
+                    f"{proc:.2f}% checked |",
+                    tex_filename + " |",
+                    f"result: {ConsoleColors.true_false_color(result.returncode != 1)} |",
+                    f"time: {seconds:.2f} seconds",
                 )
-                stdout = result.stdout.decode("utf-8", errors="replace")
-                stderr = result.stderr.decode("utf-8", errors="replace")
-                result.stdout = stdout
-                result.stderr = stderr
-
-            has_critical_errors = (
-                result.returncode != 0  # Код возврата не 0
-                or "error" in result.stderr.lower()  # Есть ошибки в stderr
-                or "emergency stop"
-                in result.stdout.lower()  # Критические ошибки в stdout
-            )
-
-            # if result.stderr == 1:
-            if has_critical_errors:
-                for j, ob in enumerate(obj):
-                    comp_time_start = time.time()
-
-                    doc = Document().from_elements([ob.object])
-
-                    doc.to_latex_file()
-
-                    # doc.check()
-
-                    try:
-                        result = subprocess.run(
-                            [
-                                "pdflatex",
-                                "-shell-escape",
-                                "-interaction=nonstopmode",
-                                doc.filename + ".tex",
-                            ],
-                            capture_output=True,
-                            text=True,
-                            cwd=export_dir,
-                            encoding="utf-8",
-                            errors="replace",
-                            timeout=timeout,
-                        )
-                    except UnicodeDecodeError:
-                        result = subprocess.run(
-                            [
-                                "pdflatex",
-                                "-shell-escape",
-                                "-interaction=nonstopmode",
-                                doc.filename + ".tex",
-                            ],
-                            capture_output=True,
-                            cwd=export_dir,
-                            timeout=timeout,
-                        )
-                        stdout = result.stdout.decode("utf-8", errors="replace")
-                        stderr = result.stderr.decode("utf-8", errors="replace")
-                        result.stdout = stdout
-                        result.stderr = stderr
 
-                    # print(result.stdout)
-                    comp_time_end = time.time()
-
-                    if result.returncode == 1:
-                        ob.stdout = result.stdout
-                        ob.compile_success = False
-                        # print(ob)
-                        errors_found += 1
-
-                    else:
-                        ob.compile_success = True
+        def print_summary():
+            """Print total time and compilations saved by bisection."""
+            if print_analyzing:
+                print(f"Total time used: {(time.time() - start):.2f} seconds")
+                print(
+                    f"Compilations: {compiles} |",
+                    f"saved by bisection: {linear_compiles - compiles}",
+                )
 
-                    proc = ((i) * batch + j + 1) / length * 100
+        chunk_results = ErrorCompileCatcher._compile_jobs(
+            objects_chunked, export_dir, workers, timeout
+        )
+        for obj, (tex_filename, result, seconds) in zip(objects_chunked, chunk_results):
+            on_compile(obj, tex_filename, result, seconds)
+            linear_compiles += 1
 
-                    if print_analyzing:
-                        returncode = True if result.returncode != 1 else False
-                        print(
-                            f"{proc:.2f}% checked |",
-                            doc.filename + ".tex |",
-                            f"result: {ConsoleColors.true_false_color(returncode)} |",
-                            f"time: {(comp_time_end - comp_time_start):.2f} seconds",
-                        )
+            if ErrorCompileCatcher._has_critical_errors(result):
+                # Element-by-element checking would compile the whole chunk
+                linear_compiles += len(obj)
 
-                    sub_checked = True
+                failures = ErrorCompileCatcher._bisect(
+                    obj, result, export_dir, workers, timeout, on_compile
+                )
+                for ob in failures:
+                    errors_found += 1
 
                     if total_errors <= errors_found:
-                        Settings.Export.export_dir = old_export_dir
+                        linear_compiles -= len(obj) - obj.index(ob) - 1
+                        failures.close()
+                        chunk_results.close()
+                        print_summary()
 
                         return objects
 
@@ -490,33 +720,11 @@ class ErrorCompileCatcher:
                 for ob in obj:
                     ob.compile_success = True
 
-            comp_time_end = time.time()
-
-            if i + 1 == len(objects_chunked):
-                proc = 100
-            else:
-                proc = (i + 1) * batch / length * 100
-
-            if print_analyzing and not sub_checked:
-                returncode = True if result.returncode != 1 else False
-                print(
-                    f"{proc:.2f}% checked |",
-                    doc.filename + ".tex |",
-                    f"result: {ConsoleColors.true_false_color(returncode)} |",
-                    f"time: {(comp_time_end - comp_time_start):.2f} seconds",
-                )
-
-            sub_checked = False
-
         if rmdir:
             shutil.rmtree(export_dir)
 
-        end = time.time()
-
-        if print_analyzing:
-            print(f"Total time used: {(end - start):.2f} seconds")
+        print_summary()
 
-        Settings.Export.export_dir = old_export_dir
         return objects
 
     def analyze(
@@ -525,6 +733,7 @@ class ErrorCompileCatcher:
         total_errors: int = 1,
         rmdir: bool = True,
         print_analyzing: bool = True,
+        workers: Optional[int] = None,
     ) -> List[ObjectImage]:
         """Analyze provided objects by compiling them and collecting errors.
 
@@ -533,6 +742,7 @@ class ErrorCompileCatcher:
             total_errors: Maximum errors to gather before early exit.
             rmdir: Whether to delete the temporary export directory afterward.
             print_analyzing: Toggle for progress output to stdout.
+            workers: Number of concurrent pdflatex processes; defaults to ``Settings.Export.workers``.
 
         Returns:
             List of ObjectImage instances that failed compilation; empty list if none.
@@ -556,6 +766,7 @@ class ErrorCompileCatcher:
             total_errors=total_errors,
             rmdir=rmdir,
             print_analyzing=print_analyzing,
+            workers=workers,
         )
 
         error = False
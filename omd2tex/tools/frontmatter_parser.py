@@ -13,6 +13,9 @@ for ch, resolvers in list(yaml.SafeLoader.yaml_implicit_resolvers.items()):
 
 
 class FrontMatterParser:
+    # LibYAML is much faster and shares the resolvers adjusted above
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
     @staticmethod
     def quote_sensitive_yaml_values(yaml_text: str) -> str:
         """Safely quote time-like YAML fields to preserve strings.
@@ -51,6 +54,50 @@ class FrontMatterParser:
 
         return "\n".join(new_lines)
 
+    @staticmethod
+    def read_block(abs_path: str) -> Optional[str]:
+        """Read only the frontmatter lines at the top of a file.
+
+        Lines are read until the closing ``---``, so the body of the note is never loaded.
+
+        Args:
+            abs_path: Absolute path to the markdown file.
+
+        Returns:
+            Frontmatter text without the ``---`` delimiters, or None when the file has no terminated frontmatter.
+
+        Raises:
+            OSError: If the file cannot be read.
+        """
+        with open(abs_path, "r") as f:
+            if not f.readline().startswith("---"):
+                return None
+
+            yaml_lines = []
+            for line in f:
+                if line.startswith("---"):
+                    return "".join(yaml_lines)
+                yaml_lines.append(line)
+
+        return None
+
+    @classmethod
+    def load(cls, yaml_text: str) -> Dict:
+        """Parse frontmatter text like ``__init__`` does, using LibYAML when available.
+
+        Args:
+            yaml_text: Frontmatter text without delimiters.
+
+        Returns:
+            Parsed mapping; empty when the frontmatter holds no mapping.
+
+        Raises:
+            yaml.YAMLError: Propagated when YAML parsing fails.
+        """
+        data = yaml.load(cls.quote_sensitive_yaml_values(yaml_text), Loader=cls.loader)
+
+        return data if isinstance(data, dict) else {}
+
     def __init__(self, filename: Optional[str] = None, abs_path: Optional[str] = None, text: Union[List[str], str] = "") -> None:
         """Parse YAML frontmatter from filename, absolute path, or text.
 
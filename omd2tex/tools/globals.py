@@ -2,6 +2,10 @@ from .config_base import ConfigBase
 
 
 class Global(ConfigBase):
+    # Runtime state; changes must not invalidate settings-derived caches
+    _track_revision = False
+    _context_inherits = False
+
     REFERENCE_DICT = {}
     MIN_HEADLINE_LEVEL = 100
     CITATION_INITIALIZED = False
@@ -0,0 +1,197 @@
+import atexit
+import json
+import os
+import struct
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from .settings import Settings
+
+
+def _jpeg_size(f: BinaryIO) -> Optional[Tuple[int, int]]:
+    """Scan JPEG segments up to the first start-of-frame marker."""
+    f.seek(2)
+
+    while True:
+        byte = f.read(1)
+        while byte and byte != b"\xff":
+            byte = f.read(1)
+        while byte == b"\xff":
+            byte = f.read(1)
+        if not byte:
+            return None
+
+        marker = byte[0]
+
+        # Markers without a length field
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            continue
+
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        (length,) = struct.unpack(">H", length_bytes)
+
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">HH", frame[1:5])
+            return width, height
+
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def read_image_size(path: str) -> Optional[Tuple[int, int]]:
+    """Read image dimensions from the file header without decoding the image.
+
+    Understands PNG, JPEG, GIF, WebP and BMP.
+
+    Args:
+        path: Path to the image file.
+
+    Returns:
+        Tuple of (width, height) in pixels, or None for other formats or malformed headers.
+
+    Raises:
+        OSError: If the file cannot be opened.
+    """
+    with open(path, "rb") as f:
+        head = f.read(32)
+
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+
+        if head.startswith(b"BM") and len(head) >= 26:
+            (header_size,) = struct.unpack("<I", head[14:18])
+            if header_size == 12:
+                return struct.unpack("<HH", head[18:22])
+            width, height = struct.unpack("<ii", head[18:26])
+            return width, abs(height)
+
+        if head.startswith(b"RIFF") and head[8:12] == b"WEBP" and len(head) >= 30:
+            chunk = head[12:16]
+            if chunk == b"VP8 " and head[23:26] == b"\x9d\x01\x2a":
+                width, height = struct.unpack("<HH", head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L" and head[20] == 0x2F:
+                bits = int.from_bytes(head[21:25], "little")
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8X":
+                return (
+                    int.from_bytes(head[24:27], "little") + 1,
+                    int.from_bytes(head[27:30], "little") + 1,
+                )
+            return None
+
+        if head.startswith(b"\xff\xd8"):
+            return _jpeg_size(f)
+
+    return None
+
+
+class ImageSizeCache:
+    """Persistent cache of image dimensions keyed by path, size and modification time.
+
+    Dimensions are read with ``read_image_size`` and only images in other formats are opened with Pillow. Entries are kept in memory for the whole process and written to ``Settings.Cache.dir`` when the process exits, so later runs do not touch unchanged images beyond a ``stat``.
+    """
+
+    version = 1
+    filename = "image-sizes.json"
+
+    entries: Dict[str, List[int]] = {}
+
+    _loaded = False
+    _dirty = False
+
+    @classmethod
+    def cache_path(cls) -> Optional[str]:
+        """Location of the persisted cache, or None when caching is disabled."""
+        if not Settings.Cache.dir or not Settings.Cache.image_sizes:
+            return None
+
+        return os.path.join(os.path.expanduser(Settings.Cache.dir), cls.filename)
+
+    @classmethod
+    def load(cls) -> None:
+        """Load persisted entries once per process; a missing or invalid file is ignored."""
+        cls._loaded = True
+
+        path = cls.cache_path()
+        if not path:
+            return
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get("version") == cls.version:
+            cls.entries.update(data["entries"])
+
+    @classmethod
+    def save(cls) -> None:
+        """Persist the entries atomically if they changed; failures are ignored."""
+        path = cls.cache_path()
+        if not path or not cls._dirty:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": cls.version, "entries": cls.entries}, f)
+            os.replace(tmp_path, path)
+            cls._dirty = False
+        except OSError:
+            pass
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget in-memory entries; the persisted file is left untouched."""
+        cls.entries = {}
+        cls._loaded = False
+        cls._dirty = False
+
+    @classmethod
+    def get(cls, path: str) -> Optional[Tuple[int, int]]:
+        """Return the dimensions of an image, reading its header on a cache miss.
+
+        Args:
+            path: Path to the image file.
+
+        Returns:
+            Tuple of (width, height) in pixels, or None if the file does not exist.
+
+        Raises:
+            OSError or Pillow errors: If an existing file cannot be read as an image.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        if not cls._loaded:
+            cls.load()
+
+        key = os.path.abspath(path)
+        entry = cls.entries.get(key)
+        if entry and entry[:2] == [stat.st_mtime_ns, stat.st_size]:
+            return entry[2], entry[3]
+
+        size = read_image_size(path)
+        if size is None:
+            from PIL import Image as PillowImage
+
+            with PillowImage.open(path) as img:
+                size = img.width, img.height
+
+        if not cls._dirty and cls.cache_path():
+            atexit.register(cls.save)
+        cls._dirty = True
+        cls.entries[key] = [stat.st_mtime_ns, stat.st_size, size[0], size[1]]
+
+        return size
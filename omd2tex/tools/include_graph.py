@@ -0,0 +1,138 @@
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .context import ContextLocalMeta
+from .settings import Settings
+
+
+class IncludeGraph(metaclass=ContextLocalMeta):
+    """Document-wide graph of notes embedded with ``![[note]]``.
+
+    Nodes are resolved note paths (or the bare filename when a note cannot be found), edges point from a note to the notes it embeds in document order. The graph is rebuilt whenever a ``Document`` is parsed and stays available for inspection afterwards. It also shares parses between embeds: the first ``File`` created for a note and output directory is parsed, later embeds of the same note reuse its elements.
+    """
+
+    _context_local = ("edges", "cycles", "_stack", "_files")
+
+    edges: Dict[str, List[str]] = {}
+    cycles: List[List[str]] = []
+
+    _stack: List[str] = []
+    _files: Dict[Tuple[str, str], Any] = {}
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget the graph and the shared parses of the previous document."""
+        cls.edges = {}
+        cls.cycles = []
+        cls._stack = []
+        cls._files = {}
+
+    @staticmethod
+    def resolve(filename: str) -> str:
+        """Return the graph node of a note filename.
+
+        Args:
+            filename: Note filename as written in the embed.
+
+        Returns:
+            Absolute path of the note in ``Settings.Export.search_dir``, or the filename when it is not found.
+        """
+        from .search import find_file
+
+        return find_file(filename, search_path=Settings.Export.search_dir) or filename
+
+    @classmethod
+    @contextmanager
+    def parsing(cls, note: str) -> Iterator[None]:
+        """Mark a note as being parsed so embeds found inside it become its children.
+
+        Args:
+            note: Graph node of the parsed note.
+
+        Yields:
+            None while the note is parsed.
+        """
+        cls.edges.setdefault(note, [])
+        cls._stack.append(note)
+
+        try:
+            yield
+        finally:
+            cls._stack.pop()
+
+    @classmethod
+    def embed(cls, filename: str, parrentdir: str) -> Tuple[str, Optional[Any]]:
+        """Register an embed of a note in the note currently being parsed.
+
+        Args:
+            filename: Embedded note filename.
+            parrentdir: Output directory of the embedding ``File``.
+
+        Returns:
+            Tuple of the graph node and the ``File`` already created for the same note and directory, or None if the note has to be parsed.
+
+        Raises:
+            RecursionError: If the note embeds itself directly or through other notes; the message lists the cycle.
+        """
+        note = cls.resolve(filename)
+
+        if cls._stack:
+            cls.edges.setdefault(cls._stack[-1], []).append(note)
+        cls.edges.setdefault(note, [])
+
+        if note in cls._stack:
+            cycle = cls._stack[cls._stack.index(note) :] + [note]
+            cls.cycles.append(cycle)
+            raise RecursionError(
+                "Circular embed: " + " -> ".join(os.path.basename(n) for n in cycle)
+            )
+
+        return note, cls._files.get((note, parrentdir))
+
+    @classmethod
+    def register(cls, note: str, parrentdir: str, file: Any) -> None:
+        """Remember the ``File`` that parses a note so later embeds can share it."""
+        cls._files.setdefault((note, parrentdir), file)
+
+    @classmethod
+    def notes(cls) -> List[str]:
+        """Return all notes of the graph in the order they were first seen."""
+        return list(cls.edges)
+
+    @classmethod
+    def children(cls, note: str) -> List[str]:
+        """Return the distinct notes embedded by a note, in document order."""
+        return list(dict.fromkeys(cls.edges.get(note, [])))
+
+    @classmethod
+    def parents(cls, note: str) -> List[str]:
+        """Return the notes embedding a note."""
+        return [parent for parent, children in cls.edges.items() if note in children]
+
+    @classmethod
+    def order(cls) -> List[str]:
+        """Return the notes so that every note comes after the notes it embeds.
+
+        Edges closing a cycle are ignored.
+        """
+        order = []
+        visited = set()
+
+        def visit(note: str) -> None:
+            visited.add(note)
+            for child in cls.children(note):
+                if child not in visited:
+                    visit(child)
+            order.append(note)
+
+        for note in cls.edges:
+            if note not in visited:
+                visit(note)
+
+        return order
+
+    @classmethod
+    def to_dict(cls) -> Dict[str, List[str]]:
+        """Return the graph as a mapping of notes to the distinct notes they embed."""
+        return {note: cls.children(note) for note in cls.edges}
@@ -0,0 +1,482 @@
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .context import ContextLocalMeta
+from .render_cache import RenderCache
+from .settings import Settings
+
+
+def _digest(data: Any) -> str:
+    """Return a stable hash of JSON-serializable data."""
+    text = json.dumps(data, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _changed(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the entries of ``after`` that differ from ``before``, descending into nested sections."""
+    changed = {}
+    missing = object()
+
+    for key, value in after.items():
+        old = before.get(key, missing)
+        if isinstance(value, dict) and isinstance(old, dict):
+            nested = _changed(old, value)
+            if nested:
+                changed[key] = nested
+        elif old != value:
+            changed[key] = value
+
+    return changed
+
+
+class ExportManifest(metaclass=ContextLocalMeta):
+    """Record of a project export used by incremental export.
+
+    The manifest lives in the project directory. For every included note it stores the files the note was parsed from, the lookups that found no file, the settings fingerprint it was parsed under, the global state it left behind (settings its frontmatter changed, references, footnotes, preamble commands), and the state its output was rendered with. It also stores hashes of all written outputs. On the next export with ``Settings.Export.incremental`` enabled, notes whose files did not change and whose missing files are still missing are not parsed, their side effects are replayed instead, and outputs whose content did not change are not rewritten.
+    """
+
+    version = 4
+    filename = ".omd2tex-manifest.json"
+
+    _context_local = ("_recording", "_unresolved")
+
+    _instances: Dict[str, "ExportManifest"] = {}
+    _recording: List[Set[str]] = []
+    _unresolved: List[Set[Tuple[str, str]]] = []
+
+    def __init__(self, project_dir: str) -> None:
+        """Create an empty manifest for a project directory.
+
+        Args:
+            project_dir: Absolute path of the exported project.
+
+        Returns:
+            None
+        """
+        self.project_dir = project_dir
+        self.path = os.path.join(project_dir, self.filename)
+        self.notes: Dict[str, Dict[str, Any]] = {}
+        self.outputs: Dict[str, List[Any]] = {}
+
+    @classmethod
+    def get(cls, project_dir: Optional[str]) -> Optional["ExportManifest"]:
+        """Return the shared manifest of a project when incremental export is enabled.
+
+        Args:
+            project_dir: Project directory of the export.
+
+        Returns:
+            Loaded manifest, or None when ``Settings.Export.incremental`` is off.
+        """
+        if not Settings.Export.incremental or not project_dir:
+            return None
+
+        project_dir = os.path.abspath(os.path.expanduser(project_dir))
+
+        manifest = cls._instances.get(project_dir)
+        if manifest is None:
+            manifest = cls(project_dir)
+            manifest.load()
+            cls._instances[project_dir] = manifest
+
+        return manifest
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget manifests loaded in this process."""
+        cls._instances.clear()
+
+    def load(self) -> bool:
+        """Load the manifest from the project directory.
+
+        Returns:
+            True when a manifest of the current version was loaded.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if data.get("version") != self.version:
+            return False
+
+        self.notes = data["notes"]
+        self.outputs = data["outputs"]
+        return True
+
+    def save(self) -> None:
+        """Persist the manifest atomically; failures are ignored."""
+        data = {"version": self.version, "notes": self.notes, "outputs": self.outputs}
+
+        try:
+            os.makedirs(self.project_dir, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def key(self, path: str) -> str:
+        """Return the manifest key of a path inside the project."""
+        return os.path.relpath(os.path.abspath(os.path.expanduser(path)), self.project_dir)
+
+    @staticmethod
+    def _stat(path: str) -> Optional[List[int]]:
+        """Return modification time and size of a file, or None if it is missing."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    @classmethod
+    def record_dependency(cls, path: Optional[str]) -> None:
+        """Register a file read while included notes are being parsed.
+
+        Args:
+            path: Path of the file that was located or read.
+
+        Returns:
+            None
+        """
+        if cls._recording and path:
+            path = os.path.abspath(path)
+            for dependencies in cls._recording:
+                dependencies.add(path)
+
+    @classmethod
+    def record_missing(cls, filename: str, search_path: str) -> None:
+        """Register a file lookup that found nothing while included notes are being parsed.
+
+        Creating the file later changes the parse, so the lookup is repeated before a note is reused.
+
+        Args:
+            filename: Filename that was looked up.
+            search_path: Directory it was looked up in.
+
+        Returns:
+            None
+        """
+        if cls._unresolved and filename:
+            lookup = (filename, os.path.abspath(os.path.expanduser(search_path)))
+            for unresolved in cls._unresolved:
+                unresolved.add(lookup)
+
+    @staticmethod
+    def _resolves(filename: str, search_path: str) -> bool:
+        """Check whether a lookup that failed before finds a file now."""
+        from .search import locate_file
+
+        try:
+            return locate_file(filename, search_path) is not None
+        except OSError:
+            return False
+
+    @staticmethod
+    def _parse_state() -> Dict[str, Any]:
+        """Snapshot the global state that parsing changes."""
+        from ..objects.footnote import Footnote
+        from .globals import Global
+
+        from .settings_preamble import SettingsPreamble
+
+        return {
+            "settings": Settings.to_dict(),
+            "settings_preamble": SettingsPreamble.to_dict(),
+            "references": dict(Global.REFERENCE_DICT),
+            "footnotes": dict(Footnote.collection),
+            "new_commands": len(Global.NEW_COMMANDS_PREAMBLE),
+        }
+
+    @staticmethod
+    def _render_state() -> str:
+        """Hash the global state that rendering a note reads.
+
+        Footnotes are left out: their keys are made unique per parsed file, so a note only renders footnotes it defines itself.
+        """
+        from .globals import Global
+
+        state = Global.to_dict()
+        state.pop("CITATION_INITIALIZED", None)
+        state.pop("NEW_COMMANDS_PREAMBLE", None)
+        state["REFERENCE_DICT"] = sorted(
+            [str(key), str(value)] for key, value in Global.REFERENCE_DICT.items()
+        )
+
+        return _digest([state, RenderCache.fingerprint()])
+
+    @staticmethod
+    def _parse_fingerprint() -> str:
+        """Hash the settings that parsing a note reads.
+
+        Besides the render settings this covers the search directory and ignore set, which decide the files embeds resolve to.
+        """
+        return _digest(
+            [
+                RenderCache.fingerprint(),
+                Settings.Export.search_dir,
+                sorted(Settings.Export.search_ignore_dirs),
+            ]
+        )
+
+    def begin_note(self) -> Dict[str, Any]:
+        """Start recording the parse of an included note.
+
+        Returns:
+            Capture to pass to ``end_note``.
+        """
+        dependencies = set()
+        unresolved = set()
+        self.__class__._recording.append(dependencies)
+        self.__class__._unresolved.append(unresolved)
+
+        return {
+            "dependencies": dependencies,
+            "unresolved": unresolved,
+            "fingerprint": self._parse_fingerprint(),
+            "before": self._parse_state(),
+        }
+
+    def end_note(self, path: str, capture: Dict[str, Any], success: bool = True) -> None:
+        """Finish recording the parse of an included note.
+
+        Args:
+            path: Output ``.tex`` path of the note.
+            capture: Value returned by ``begin_note``.
+            success: Whether parsing completed; failed parses are not recorded.
+
+        Returns:
+            None
+        """
+        from ..objects.footnote import Footnote
+        from .globals import Global
+        from .settings_preamble import SettingsPreamble
+
+        # Parses nest, so the innermost recording is the one being finished
+        self.__class__._recording.pop()
+        self.__class__._unresolved.pop()
+
+        key = self.key(path)
+        self.notes.pop(key, None)
+
+        if not success or not capture["dependencies"]:
+            return
+
+        before = capture["before"]
+        missing = object()
+
+        self.notes[key] = {
+            "parse": {
+                "fingerprint": capture["fingerprint"],
+                "dependencies": {
+                    dependency: self._stat(dependency)
+                    for dependency in sorted(capture["dependencies"])
+                },
+                "unresolved": sorted(capture["unresolved"]),
+                # Only what the note changed, replaying a full snapshot would undo settings of later runs
+                "settings": _changed(before["settings"], Settings.to_dict()),
+                "settings_preamble": _changed(
+                    before["settings_preamble"], SettingsPreamble.to_dict()
+                ),
+                "yaml": Global.YAML_DICT,
+                "references": [
+                    [ref, ref_type]
+                    for ref, ref_type in Global.REFERENCE_DICT.items()
+                    if before["references"].get(ref, missing) != ref_type
+                ],
+                "min_headline_level": Global.MIN_HEADLINE_LEVEL,
+                "footnotes": {
+                    footnote_key: text
+                    for footnote_key, text in Footnote.collection.items()
+                    if before["footnotes"].get(footnote_key, missing) != text
+                },
+                "new_commands": Global.NEW_COMMANDS_PREAMBLE[before["new_commands"] :],
+            }
+        }
+
+    def reuse_note(self, path: str) -> Optional[Dict[str, Any]]:
+        """Replay the parse of an unchanged included note.
+
+        A note is reused when it was parsed and rendered before, none of the files it was parsed from changed, none of the files it did not find exists now, and the settings are the same as when it was parsed.
+
+        Args:
+            path: Output ``.tex`` path of the note.
+
+        Returns:
+            Manifest entry of the note, or None if it has to be parsed.
+
+        Side Effects:
+            Applies the recorded settings changes, references, footnotes and preamble commands.
+        """
+        from ..objects.footnote import Footnote
+        from .globals import Global
+        from .settings_preamble import SettingsPreamble
+
+        key = self.key(path)
+        entry = self.notes.get(key)
+
+        if not entry or "render" not in entry or key not in self.outputs:
+            return None
+
+        parse = entry["parse"]
+
+        if parse["fingerprint"] != self._parse_fingerprint():
+            return None
+
+        for dependency, stat in parse["dependencies"].items():
+            if self._stat(dependency) != stat:
+                return None
+
+        for filename, search_path in parse["unresolved"]:
+            if self._resolves(filename, search_path):
+                return None
+
+        Settings.update(parse["settings"])
+        SettingsPreamble.update(parse["settings_preamble"])
+        Global.YAML_DICT = parse["yaml"]
+
+        for ref, ref_type in parse["references"]:
+            Global.REFERENCE_DICT[ref] = ref_type
+
+        if parse["min_headline_level"] < Global.MIN_HEADLINE_LEVEL:
+            Global.MIN_HEADLINE_LEVEL = parse["min_headline_level"]
+
+        Footnote.collection.update(parse["footnotes"])
+        Global.NEW_COMMANDS_PREAMBLE.extend(parse["new_commands"])
+
+        for dependencies in self.__class__._recording:
+            dependencies.update(parse["dependencies"])
+        for unresolved in self.__class__._unresolved:
+            unresolved.update(tuple(lookup) for lookup in parse["unresolved"])
+
+        return entry
+
+    def begin_render(self) -> Dict[str, Any]:
+        """Start recording the render of an included note.
+
+        Returns:
+            Capture to pass to ``end_render``.
+        """
+        from ..objects.citation import Citation
+        from .globals import Global
+
+        return {
+            "state": self._render_state(),
+            "citations": len(Citation.cited),
+            "new_commands": len(Global.NEW_COMMANDS_PREAMBLE),
+        }
+
+    def end_render(self, path: str, capture: Dict[str, Any]) -> None:
+        """Finish recording the render of an included note.
+
+        Args:
+            path: Output ``.tex`` path of the note.
+            capture: Value returned by ``begin_render``.
+
+        Returns:
+            None
+        """
+        from ..objects.citation import Citation
+        from .globals import Global
+
+        entry = self.notes.get(self.key(path))
+        if entry is None:
+            return
+
+        entry["render"] = {
+            "state": capture["state"],
+            "citations": list(dict.fromkeys(Citation.cited[capture["citations"] :])),
+            "new_commands": Global.NEW_COMMANDS_PREAMBLE[capture["new_commands"] :],
+        }
+
+    def reuse_render(self, path: str, entry: Dict[str, Any]) -> bool:
+        """Replay the render of a reused note if its output is still valid.
+
+        Args:
+            path: Output ``.tex`` path of the note.
+            entry: Entry returned by ``reuse_note``.
+
+        Returns:
+            True if the existing output can be kept, False if the note must be rendered.
+
+        Side Effects:
+            Registers the recorded citations and preamble commands.
+        """
+        from ..objects.citation import Citation
+        from .globals import Global
+
+        render = entry.get("render")
+
+        if render is None or render["state"] != self._render_state():
+            return False
+
+        if self.outputs.get(self.key(path), [None])[1:] != self._stat(path):
+            return False
+
+        for citation_key in render["citations"]:
+            Citation.get(citation_key)
+
+        Global.NEW_COMMANDS_PREAMBLE.extend(render["new_commands"])
+
+        return True
+
+    def write(self, path: str, text: str) -> bool:
+        """Write an output file unless it already has the same content.
+
+        Args:
+            path: Output path.
+            text: File content.
+
+        Returns:
+            True if the file was written.
+        """
+        key = self.key(path)
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        stat = self._stat(path)
+
+        if stat is not None and self.outputs.get(key) == [digest] + stat:
+            return False
+
+        written = True
+        if stat is not None:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                written = f.read() != text
+
+        if written:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+        self.outputs[key] = [digest] + self._stat(path)
+        return written
+
+    @staticmethod
+    def copy_file(source: str, destination: str) -> bool:
+        """Copy a file unless the destination has the same size and modification time.
+
+        Args:
+            source: File to copy.
+            destination: Target path.
+
+        Returns:
+            True if the file was copied.
+        """
+        source_stat = os.stat(source)
+
+        try:
+            destination_stat = os.stat(destination)
+        except FileNotFoundError:
+            pass
+        else:
+            if (
+                destination_stat.st_size == source_stat.st_size
+                and destination_stat.st_mtime_ns == source_stat.st_mtime_ns
+            ):
+                return False
+
+        shutil.copy2(source, destination)
+        return True
@@ -1,5 +1,6 @@
 import re
-from typing import List, Optional, Tuple, Union
+from collections import deque
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 import yaml
 import uuid
 
@@ -8,10 +9,62 @@ from omd2tex.objects.base import BaseClass
 
 from .settings import Settings
 from .search import find_file
+from .include_graph import IncludeGraph
 from .globals import Global
 from .settings_preamble import SettingsPreamble
 
 
+class LineStream:
+    """Indexable view over an iterable of lines that keeps only a small window.
+
+    The parser addresses lines by absolute index and looks at most one line ahead, so lines before the current position can be released as parsing advances. Wrapping a file iterator therefore keeps memory bounded by the current block instead of the whole file.
+    """
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        """Wrap an iterable of lines without consuming it."""
+        self._lines = iter(lines)
+        self._buffer = deque()
+        self._offset = 0
+        self._exhausted = False
+
+    @classmethod
+    def from_path(cls, path: str) -> "LineStream":
+        """Stream lines from a UTF-8 file, split like ``str.splitlines``."""
+
+        def read_lines() -> Iterator[str]:
+            with open(path, "r", encoding="utf-8") as f:
+                for raw_line in f:
+                    yield from raw_line.splitlines()
+
+        return cls(read_lines())
+
+    def _fill(self, index: int) -> None:
+        """Read lines from the source until ``index`` is buffered or input ends."""
+        while not self._exhausted and index >= self._offset + len(self._buffer):
+            try:
+                self._buffer.append(next(self._lines))
+            except StopIteration:
+                self._exhausted = True
+
+    def has(self, index: int) -> bool:
+        """Return True when a line exists at the given absolute index."""
+        self._fill(index)
+        return index < self._offset + len(self._buffer)
+
+    def __getitem__(self, index: int) -> str:
+        """Return the line at an absolute index that has not been released."""
+        self._fill(index)
+        if index < self._offset or index >= self._offset + len(self._buffer):
+            raise IndexError(f"Line {index} is not available")
+        return self._buffer[index - self._offset]
+
+    def release(self, index: int) -> None:
+        """Forget all lines before the given absolute index."""
+        while self._buffer and self._offset < index:
+            self._buffer.popleft()
+            self._offset += 1
+
+
 class MarkdownParser(BaseClass):
     re_text_files1 = re.compile(
         r"!?\[\[([^|\[\]]+?(?:\.(?:md|tex|txt))?)(?:\|([^\[\]]+))?\]\]"
@@ -144,6 +197,7 @@ class MarkdownParser(BaseClass):
             self.filename = filename
             with open(self.dir_filename, "r", encoding="utf-8") as f:
                 lines = f.read().splitlines()
+            with IncludeGraph.parsing(self.dir_filename):
                 self.__parse(lines)
             return self
 
@@ -165,6 +219,43 @@ class MarkdownParser(BaseClass):
 
         return self
 
+    def iter_file(self, filename: str) -> Iterator[BaseClass]:
+        """Stream processed elements from a markdown file as blocks close.
+
+        Reads the file line by line instead of materializing it, so memory stays bounded by the largest block. Footnote definitions are collected in a cheap first pass, so markers render even when defined at the end of the note. Unlike ``from_file``, references to elements further down the file and global headline alignment only see elements parsed so far.
+
+        Args:
+            filename: Name of the markdown file to locate and parse.
+
+        Yields:
+            Elements after reference, caption and list post-processing.
+
+        Raises:
+            FileNotFoundError: Propagated if the search path does not exist.
+        """
+        self.dir_filename = find_file(filename, search_path=Settings.Export.search_dir)
+
+        if not self.dir_filename:
+            return
+
+        self.filename = filename
+        with IncludeGraph.parsing(self.dir_filename):
+            yield from self.iter_process_elements(
+                self.__iter_parse(
+                    LineStream.from_path(self.dir_filename),
+                    footnote_lines=LineStream.from_path(self.dir_filename),
+                )
+            )
+
+    def iter_text(self, text: Union[str, List[str]]) -> Iterator[BaseClass]:
+        """Stream processed elements from markdown text; see ``iter_file``."""
+        if isinstance(text, str):
+            text = text.splitlines()
+
+        yield from self.iter_process_elements(
+            self.__iter_parse(LineStream(text), footnote_lines=LineStream(text))
+        )
+
     def from_elements(self, list: list) -> "MarkdownParser":
         """Initialize parser state from preconstructed element objects.
 
@@ -226,10 +317,87 @@ class MarkdownParser(BaseClass):
 
         return elements
 
+    def iter_process_elements(self, elements: Iterable[BaseClass]) -> Iterator[BaseClass]:
+        """Apply ``process_elements_list`` to a stream of elements segment by segment.
+
+        A segment ends before any element that can neither attach to the previous one (references and captions) nor continue a run of list items, so each segment is processed exactly as it would be within the whole list. Beamer documents are split into frames across the whole document and are therefore collected first.
+
+        Args:
+            elements: Iterable of raw parsed elements.
+
+        Yields:
+            Post-processed elements in document order.
+        """
+        from ..objects import Caption, Reference, List
+
+        if (
+            SettingsPreamble.documentclass == "beamer"
+            and self.quotedepth < 1
+            and self.filedepth < 1
+        ):
+            yield from self.process_elements_list(list(elements))
+            return
+
+        segment = []
+        last_content = None
+
+        for el in elements:
+            attaches = isinstance(el, (Reference, Caption))
+            continues_list = isinstance(el, List) and isinstance(last_content, List)
+
+            if segment and not attaches and not continues_list:
+                yield from self.process_elements_list(segment)
+                segment = []
+
+            segment.append(el)
+            if not attaches:
+                last_content = el
+
+        if segment:
+            yield from self.process_elements_list(segment)
+
+    @staticmethod
+    def __csv_file_table(filename: str) -> Optional[BaseClass]:
+        """Create a table from an embedded ``.csv`` or ``.tsv`` file.
+
+        Returns:
+            Table of the file, or None when the file is missing or empty.
+        """
+        from ..objects import Table
+
+        path = find_file(filename.strip(), search_path=Settings.Export.search_dir)
+        if not path:
+            return None
+
+        try:
+            return Table.from_csv_file(path)
+        except ValueError:
+            print(f"Файл {filename} пуст")
+            return None
+
+    @staticmethod
+    def __frontmatter_block(lines: LineStream) -> List[str]:
+        """Return the leading lines needed to parse YAML frontmatter."""
+        if not lines.has(0):
+            return [""]
+
+        if not lines[0].startswith("---"):
+            return [lines[0]]
+
+        block = [lines[0]]
+        i = 1
+        while lines.has(i):
+            block.append(lines[i])
+            if lines[i].startswith("---"):
+                break
+            i += 1
+
+        return block
+
     def __parse(self, lines: list) -> None:
         """Parse markdown lines into element objects.
 
-        Implements a line-by-line stateful parser handling frontmatter, equations, code blocks, lists, images, references, tables, quotes, and paragraphs while respecting recursion guards and settings.
+        Collects the elements produced by the line parser and applies post-processing to the whole list.
 
         Args:
             lines: Markdown file content as a list of lines.
@@ -237,6 +405,27 @@ class MarkdownParser(BaseClass):
         Returns:
             None
 
+        Raises:
+            RecursionError: When quote or file inclusion depth exceeds configured limits.
+        """
+        elements = list(self.__iter_parse(LineStream(lines)))
+
+        self.elements = self.process_elements_list(elements)
+
+    def __iter_parse(
+        self, lines: LineStream, footnote_lines: Optional[LineStream] = None
+    ) -> Iterator[BaseClass]:
+        """Parse markdown lines into element objects, yielding each as its block closes.
+
+        Implements a line-by-line stateful parser handling frontmatter, equations, code blocks, lists, images, references, tables, quotes, and paragraphs while respecting recursion guards and settings.
+
+        Args:
+            lines: Markdown content; lines before the current position are released while parsing.
+            footnote_lines: Optional second view of the same content scanned for footnote definitions before parsing starts.
+
+        Yields:
+            Raw parsed elements in document order.
+
         Raises:
             RecursionError: When quote or file inclusion depth exceeds configured limits.
         """
@@ -289,6 +478,8 @@ class MarkdownParser(BaseClass):
             ".svg",
         ]
 
+        data_extensions = (".csv", ".tsv")
+
         i = 0
         not_file = True
         in_yaml = False
@@ -297,11 +488,9 @@ class MarkdownParser(BaseClass):
         in_table = False
         in_quote = False
 
-        elements = []
-
         footnote = Footnote()
 
-        frontmatter = FrontMatterParser(text=lines)
+        frontmatter = FrontMatterParser(text=self.__frontmatter_block(lines))
         Global.YAML_DICT = frontmatter.yaml
         self.yaml = frontmatter.yaml
 
@@ -311,7 +500,20 @@ class MarkdownParser(BaseClass):
 
         i = frontmatter.yaml_line_end
 
-        while i < len(lines):
+        if footnote_lines is not None:
+            j = i
+            while footnote_lines.has(j):
+                line = footnote_lines[j]
+                footnote_lines.release(j)
+                j += 1
+                if not line.strip():
+                    continue
+                m = self.re_footnote.match(footnote.change_footnote_keys(line))
+                if m:
+                    Footnote.append(*m.groups())
+
+        while lines.has(i):
+            lines.release(i)
             line = lines[i]
 
             # Skipping ""
@@ -368,7 +570,7 @@ class MarkdownParser(BaseClass):
                     if blocklines:
                         el = CodeBlock.create(blocktype, blocklines)
                         el._start_line = START
-                        elements.append(el)
+                        yield el
                     in_code_block = False
                     i += 1
                     continue
@@ -389,7 +591,7 @@ class MarkdownParser(BaseClass):
                     eq._is_initialized = False
                     eq._start_line = START
 
-                    elements.append(eq)
+                    yield eq
                 i += 1
                 continue
 
@@ -405,7 +607,7 @@ class MarkdownParser(BaseClass):
                             eq = Equation("\n".join(equationlines))
 
                             eq._start_line = START
-                            elements.append(eq)
+                            yield eq
                     in_equation = False
                 i += 1
                 continue
@@ -422,7 +624,7 @@ class MarkdownParser(BaseClass):
                             eq = Equation("\n".join(equationlines))
 
                             eq._start_line = START
-                            elements.append(eq)
+                            yield eq
                     in_equation = False
                 i += 1
                 continue
@@ -437,7 +639,7 @@ class MarkdownParser(BaseClass):
                     START = i
                     el = SplitLine(line.strip().strip("---").strip("\n"))
                     el._start_line = START
-                    elements.append(el)
+                    yield el
                     i += 1
                     continue
 
@@ -462,7 +664,7 @@ class MarkdownParser(BaseClass):
                 item._start_line = i
                 if reference:
                     item.reference = reference
-                elements.append(item)
+                yield item
                 i += 1
                 continue
 
@@ -478,7 +680,7 @@ class MarkdownParser(BaseClass):
                 item._start_line = i
                 if reference:
                     item.reference = reference
-                elements.append(item)
+                yield item
                 i += 1
                 continue
 
@@ -489,7 +691,7 @@ class MarkdownParser(BaseClass):
                 item._start_line = i
                 if reference:
                     item.reference = reference
-                elements.append(item)
+                yield item
                 i += 1
                 continue
 
@@ -537,7 +739,7 @@ class MarkdownParser(BaseClass):
                     if ref_link:
                         image_obj.reference = ref_link
 
-                    elements.append(image_obj)
+                    yield image_obj
                     i += 1
                     continue
 
@@ -591,7 +793,7 @@ class MarkdownParser(BaseClass):
                     if ref_link:
                         image_obj.reference = ref_link
 
-                    elements.append(image_obj)
+                    yield image_obj
                     i += 1
                     continue
 
@@ -604,6 +806,14 @@ class MarkdownParser(BaseClass):
                         )
                     filename, _ = m.groups()
 
+                    if filename.lower().endswith(data_extensions):
+                        el = self.__csv_file_table(filename)
+                        if el is not None:
+                            el._start_line = i
+                            yield el
+                        i += 1
+                        continue
+
                     if any(filename.lower().endswith(ext) for ext in image_extensions):
                         i += 1
                         continue
@@ -628,7 +838,7 @@ class MarkdownParser(BaseClass):
 
                     el._start_line = START
 
-                    elements.append(el)
+                    yield el
                     i += 1
                     continue
 
@@ -639,6 +849,14 @@ class MarkdownParser(BaseClass):
                             f"Maximum file nesting filedepth ({Settings.File.max_file_recursion}) exceeded"
                         )
                     _, filename, extension = n.groups()
+                    if filename.lower().endswith(data_extensions):
+                        el = self.__csv_file_table(filename)
+                        if el is not None:
+                            el._start_line = i
+                            yield el
+                        i += 1
+                        continue
+
                     if any(filename.lower().endswith(ext) for ext in image_extensions):
                         i += 1
                         continue
@@ -666,7 +884,7 @@ class MarkdownParser(BaseClass):
                     )
                     el._start_line = START
 
-                    elements.append(el)
+                    yield el
                     i += 1
                     continue
 
@@ -676,12 +894,12 @@ class MarkdownParser(BaseClass):
                 START = i
                 el = Reference(m.group()[1:])
                 el._start_line = START
-                elements.append(el)
+                yield el
 
                 i += 1
                 continue
 
-            next_is_table = i + 1 < len(lines) and lines[i + 1].strip().startswith("|")
+            next_is_table = lines.has(i + 1) and lines[i + 1].strip().startswith("|")
 
             if line.strip().startswith("|"):
                 if not in_table:
@@ -691,12 +909,12 @@ class MarkdownParser(BaseClass):
                 else:
                     tablelines.append(line)
 
-                if i == len(lines) - 1 or not next_is_table:
+                if not lines.has(i + 1) or not next_is_table:
                     if len(tablelines) >= 2:
                         tab = Table(tablelines)
                         tab._is_initialized = False
                         tab._start_line = START
-                        elements.append(tab)
+                        yield tab
                         in_table = False
                         tablelines = []
                 i += 1
@@ -709,13 +927,13 @@ class MarkdownParser(BaseClass):
                         tab = Table(tablelines)
                         tab._start_line = START
                         tab._is_initialized = False
-                        elements.append(tab)
+                        yield tab
                     in_table = False
                     tablelines = []
                     i += 1
                     continue
 
-            next_is_quote = i + 1 < len(lines) and lines[i + 1].strip().startswith(">")
+            next_is_quote = lines.has(i + 1) and lines[i + 1].strip().startswith(">")
 
             if line.strip().startswith(">"):
                 if not in_quote:
@@ -724,7 +942,7 @@ class MarkdownParser(BaseClass):
                 else:
                     quotelines.append(line)
 
-                if i == len(lines) - 1 or not next_is_quote:
+                if not lines.has(i + 1) or not next_is_quote:
                     if self.quotedepth >= Settings.Quote.max_quote_recursion:
                         raise RecursionError(
                             f"Maximum quote nesting quotedepth ({Settings.Quote.max_quote_recursion}) exceeded"
@@ -740,7 +958,7 @@ class MarkdownParser(BaseClass):
 
                     el._start_line = START
 
-                    elements.append(el)
+                    yield el
                     in_quote = False
                     quotelines = []
                 i += 1
@@ -762,7 +980,7 @@ class MarkdownParser(BaseClass):
 
                     el._start_line = START
 
-                    elements.append(el)
+                    yield el
                     in_quote = False
                     quotelines = []
                     i += 1
@@ -777,14 +995,14 @@ class MarkdownParser(BaseClass):
                     level, line = n.groups()
                     el = Headline(len(level) - 1, line)
                     el._start_line = START
-                    elements.append(el)
+                    yield el
                     i += 1
                     continue
 
             START = i
             el = Paragraph(line)
             el._start_line = START
-            elements.append(el)
+            yield el
             i += 1
             continue
 
@@ -792,7 +1010,7 @@ class MarkdownParser(BaseClass):
             paragraph_lines = [line]
             i += 1
             while (
-                i < len(lines)
+                lines.has(i)
                 and lines[i].strip()
                 and not lines[i].strip().startswith(">")
                 and not lines[i].strip().startswith("$$")
@@ -804,6 +1022,4 @@ class MarkdownParser(BaseClass):
                 paragraph_lines.append(lines[i])
                 i += 1
             joined = "\n".join(line.strip() for line in paragraph_lines)
-            elements.append(Paragraph(joined))
-
-        self.elements = self.process_elements_list(elements)
+            yield Paragraph(joined)
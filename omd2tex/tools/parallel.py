@@ -0,0 +1,128 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .settings import Settings
+
+
+def _capture_state() -> Dict[str, Any]:
+    """Snapshot the global state that element rendering reads.
+
+    Returns:
+        Mapping with settings, preamble settings, global registries and footnotes.
+    """
+    from ..objects.footnote import Footnote
+    from .globals import Global
+    from .settings_preamble import SettingsPreamble
+
+    return {
+        "settings": Settings.to_dict(),
+        "settings_preamble": SettingsPreamble.to_dict(),
+        "global": Global.to_dict(),
+        "footnotes": dict(Footnote.collection),
+    }
+
+
+def _restore_state(state: Dict[str, Any]) -> None:
+    """Apply a snapshot from ``_capture_state`` inside a worker process.
+
+    Nested rendering in the worker is kept serial by forcing one worker.
+    """
+    from ..objects.footnote import Footnote
+    from .globals import Global
+    from .settings_preamble import SettingsPreamble
+
+    Settings.update(state["settings"])
+    Settings.Export.workers = 1
+    SettingsPreamble.update(state["settings_preamble"])
+    Global.update(state["global"])
+
+    Footnote.collection.clear()
+    Footnote.collection.update(state["footnotes"])
+
+
+def _render_chunk(
+    state: Dict[str, Any], elements: Sequence[Any], project: bool
+) -> Tuple[List[str], List[Any], bool, Dict[str, str]]:
+    """Render a chunk of elements in a worker process.
+
+    Args:
+        state: Global state snapshot taken in the parent process.
+        elements: Elements to render in order.
+        project: Whether to call ``_to_latex_project`` instead of ``to_latex``.
+
+    Returns:
+        Tuple of rendered strings, citations registered while rendering, the citation flag, and assets scheduled for copying.
+    """
+    from ..objects.citation import Citation
+    from .assets import AssetCopier
+    from .globals import Global
+
+    _restore_state(state)
+    AssetCopier.take()
+
+    first_citation = len(Citation.citation_list)
+
+    if project:
+        texts = [elem._to_latex_project() for elem in elements]
+    else:
+        texts = [elem.to_latex() for elem in elements]
+
+    return (
+        texts,
+        Citation.citation_list[first_citation:],
+        Global.CITATION_INITIALIZED,
+        AssetCopier.take(),
+    )
+
+
+def render_elements(elements: Sequence[Any], project: bool = False) -> List[str]:
+    """Render elements to LaTeX, fanning out to a process pool when enabled.
+
+    With ``Settings.Export.workers`` above one, elements are split into ordered chunks rendered by a ``ProcessPoolExecutor``. Each worker receives a snapshot of ``Settings``, ``SettingsPreamble``, ``Global`` (including ``REFERENCE_DICT``) and ``Footnote.collection``; citations registered by workers are merged into the ``Citation`` registry and scheduled asset copies into ``AssetCopier``.
+
+    Args:
+        elements: Parsed elements to render.
+        project: Whether to render for project export via ``_to_latex_project``.
+
+    Returns:
+        Rendered LaTeX strings in the order of ``elements``.
+
+    Raises:
+        Exceptions raised while rendering are propagated from the workers.
+    """
+    from ..objects.citation import Citation
+    from .assets import AssetCopier
+    from .globals import Global
+
+    workers = Settings.Export.workers or 1
+
+    # Incremental project export keeps its manifest in this process
+    if workers <= 1 or len(elements) < 2 or (project and Settings.Export.incremental):
+        if project:
+            return [elem._to_latex_project() for elem in elements]
+        return [elem.to_latex() for elem in elements]
+
+    chunk_size = max(1, math.ceil(len(elements) / (workers * 4)))
+    chunks = [
+        elements[i : i + chunk_size] for i in range(0, len(elements), chunk_size)
+    ]
+
+    state = _capture_state()
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        futures = [
+            pool.submit(_render_chunk, state, chunk, project) for chunk in chunks
+        ]
+
+        texts = []
+        for future in futures:
+            chunk_texts, citations, citation_initialized, assets = future.result()
+            texts += chunk_texts
+            for citation in citations:
+                Citation.register(citation)
+            AssetCopier.pending.update(assets)
+            if citation_initialized:
+                Global.CITATION_INITIALIZED = True
+
+    return texts
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, Optional
+
+from .config_base import ConfigBase
+from .context import ContextLocalMeta
+from .settings import Settings
+
+
+class RenderCache(metaclass=ContextLocalMeta):
+    """Content-addressed cache of rendered element LaTeX.
+
+    Entries are keyed by element type, the element's source (see ``_render_key`` on elements) and a fingerprint of ``Settings`` and ``SettingsPreamble``. Lookups go to an in-memory LRU first and then, when ``Settings.Cache.render_disk`` is enabled, to per-entry files under the export directory. The memory tier and the hit counters are shared by all threads and guarded by a lock.
+    """
+
+    version = 1
+    memory = OrderedDict()
+    hits = 0
+    misses = 0
+
+    _lock = threading.Lock()
+
+    # Each conversion context fingerprints its own settings
+    _context_local = ("_fingerprint", "_fingerprint_revision")
+
+    _fingerprint = ""
+    _fingerprint_revision = None
+
+    # Settings that only steer where and how an export runs, not what an
+    # element renders to; left out of the fingerprint
+    ignored_sections = ("Cache", "Watch")
+    ignored_export = (
+        "export_dir",
+        "search_ignore_dirs",
+        "workers",
+        "copy_workers",
+        "incremental",
+        "makefile",
+        "bib_file",
+    )
+
+    @classmethod
+    def fingerprint(cls) -> str:
+        """Return a hash of the settings that affect rendering.
+
+        Sections and export fields listed in ``ignored_sections`` and ``ignored_export`` (export paths, workers, caches, watch mode) are left out, so changing them keeps the cached renders. The hash also covers the modification times of custom formula and latinify tables. It is recomputed only after a configuration attribute has been assigned.
+
+        Returns:
+            Hex digest of the current settings.
+        """
+        if cls._fingerprint_revision != ConfigBase._revision:
+            from .. import __version__
+            from .settings_preamble import SettingsPreamble
+
+            tables = []
+            for path in (
+                Settings.Paragraph.formulas_json,
+                Settings.Paragraph.latinify_json,
+            ):
+                try:
+                    tables.append(os.stat(os.path.expanduser(path)).st_mtime_ns)
+                except OSError:
+                    tables.append(None)
+
+            settings = Settings.to_dict()
+            for section in cls.ignored_sections:
+                settings.pop(section, None)
+            for name in cls.ignored_export:
+                settings["Export"].pop(name, None)
+
+            data = json.dumps(
+                [
+                    cls.version,
+                    __version__,
+                    settings,
+                    SettingsPreamble.to_dict(),
+                    tables,
+                ],
+                sort_keys=True,
+                default=str,
+            )
+            cls._fingerprint = hashlib.sha1(data.encode("utf-8")).hexdigest()
+            cls._fingerprint_revision = ConfigBase._revision
+
+        return cls._fingerprint
+
+    @classmethod
+    def key(cls, element: Any, source: Hashable) -> str:
+        """Build the cache key of an element.
+
+        Args:
+            element: Element being rendered.
+            source: Value describing everything the element's output depends on.
+
+        Returns:
+            Hex digest identifying the rendered output.
+        """
+        data = repr((type(element).__name__, source, cls.fingerprint()))
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def disk_path(key: str) -> str:
+        """Return the on-disk location of a cache entry.
+
+        Args:
+            key: Cache key from ``key``.
+
+        Returns:
+            Path under ``<export_dir>/.omd2tex-cache/render``.
+        """
+        export_dir = os.path.expanduser(Settings.Export.export_dir)
+        return os.path.join(
+            export_dir, ".omd2tex-cache", "render", key[:2], key + ".tex"
+        )
+
+    @classmethod
+    def get(cls, key: str) -> Optional[str]:
+        """Look up rendered LaTeX and count the lookup in ``hits`` or ``misses``.
+
+        Args:
+            key: Cache key from ``key``.
+
+        Returns:
+            Cached LaTeX, or None on a miss.
+        """
+        with cls._lock:
+            latex = cls.memory.get(key)
+            if latex is not None:
+                cls.memory.move_to_end(key)
+                cls.hits += 1
+                return latex
+
+        if Settings.Cache.render_disk:
+            try:
+                with open(cls.disk_path(key), "r", encoding="utf-8") as f:
+                    latex = f.read()
+            except OSError:
+                latex = None
+
+        with cls._lock:
+            if latex is None:
+                cls.misses += 1
+                return None
+
+            cls.hits += 1
+            cls._remember(key, latex)
+
+        return latex
+
+    @classmethod
+    def put(cls, key: str, latex: str) -> None:
+        """Store rendered LaTeX.
+
+        Args:
+            key: Cache key from ``key``.
+            latex: Rendered output.
+
+        Returns:
+            None
+
+        Side Effects:
+            Writes the entry to disk when ``Settings.Cache.render_disk`` is enabled.
+        """
+        with cls._lock:
+            cls._remember(key, latex)
+
+        if Settings.Cache.render_disk:
+            path = cls.disk_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(latex)
+                os.replace(tmp_path, path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    @classmethod
+    def _remember(cls, key: str, latex: str) -> None:
+        """Insert an entry into the memory tier and evict the least recently used ones; the caller holds ``_lock``."""
+        cls.memory[key] = latex
+        cls.memory.move_to_end(key)
+
+        while len(cls.memory) > max(Settings.Cache.render_memory_size, 0):
+            cls.memory.popitem(last=False)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop the memory tier and reset hit counters."""
+        with cls._lock:
+            cls.memory.clear()
+            cls.hits = 0
+            cls.misses = 0
+
+    @staticmethod
+    def cached(method: Callable[[Any], str]) -> Callable[[Any], str]:
+        """Wrap an element ``to_latex`` method with the render cache.
+
+        The element's ``_render_key`` returns the source its output depends on, or None when rendering has side effects or reads document state; such elements are always rendered.
+
+        Args:
+            method: Rendering method to wrap.
+
+        Returns:
+            Wrapped method.
+        """
+
+        @wraps(method)
+        def wrapper(self) -> str:
+            if not Settings.Cache.render:
+                return method(self)
+
+            source = self._render_key()
+            if source is None:
+                return method(self)
+
+            key = RenderCache.key(self, source)
+            latex = RenderCache.get(key)
+
+            if latex is None:
+                latex = method(self)
+                RenderCache.put(key, latex)
+
+            return latex
+
+        return wrapper
@@ -1,16 +1,253 @@
+import hashlib
+import json
 import os
 import sys
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 import os
+from .incremental import ExportManifest
 from .settings import Settings
 
 
-def find_file(filename: str, search_path: Optional[str] = None) -> Optional[str]:
-    """Locate a file by name within a search path honoring ignore rules.
+class VaultIndex:
+    """Filename index of a search directory shared by all file lookups.
+
+    Maps basenames and lowercased basenames to absolute paths for every file under the search directory, so repeated lookups cost a dictionary access instead of a directory walk. The index remembers the mtime of every scanned directory; it is rebuilt when one of them changes and persisted under ``Settings.Cache.dir`` so later runs skip the initial walk.
+    """
+
+    version = 1
+
+    _instances: Dict[Tuple[str, Tuple[str, ...]], "VaultIndex"] = {}
+
+    def __init__(self, search_path: str, exclude_dirs: Iterable[str] = ()) -> None:
+        """Create an empty index for a search directory.
+
+        Args:
+            search_path: Absolute root directory to index.
+            exclude_dirs: Directory names (or path fragments) skipped while indexing.
+
+        Returns:
+            None
+        """
+        self.search_path = search_path
+        self.exclude_dirs = self._normalize_exclude_dirs(exclude_dirs)
+        self._exclude_dirs_lower = [d.lower() for d in self.exclude_dirs]
+
+        self.dir_mtimes: Dict[str, int] = {}
+        self.dir_files: Dict[str, List[str]] = {}
+        self.names: Dict[str, List[str]] = {}
+        self.names_lower: Dict[str, List[str]] = {}
+
+    @staticmethod
+    def _normalize_exclude_dirs(exclude_dirs: Optional[Iterable[str]]) -> Tuple[str, ...]:
+        """Return a sorted, deduplicated tuple of non-empty ignore entries."""
+        if exclude_dirs is None:
+            return ()
+        return tuple(sorted({d.strip() for d in exclude_dirs if d and d.strip()}))
+
+    @classmethod
+    def get(
+        cls, search_path: str, exclude_dirs: Optional[Iterable[str]] = None
+    ) -> "VaultIndex":
+        """Return the shared index for a search directory and ignore set.
+
+        Reuses the in-memory instance when available, otherwise loads the persisted index from disk or builds it with a full walk.
+
+        Args:
+            search_path: Absolute root directory to index.
+            exclude_dirs: Directory names skipped while indexing.
+
+        Returns:
+            VaultIndex bound to the given directory and ignore set.
+        """
+        key = (search_path, cls._normalize_exclude_dirs(exclude_dirs))
+
+        index = cls._instances.get(key)
+        if index is None:
+            index = cls(search_path, exclude_dirs)
+            if not index.load():
+                index.build()
+                index.save()
+            cls._instances[key] = index
+
+        return index
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop all in-memory indexes; persisted files are left untouched."""
+        cls._instances = {}
+
+    def _is_excluded(self, root: str) -> bool:
+        """Check whether a directory is skipped by the ignore rules."""
+        if os.path.basename(root).lower() in self._exclude_dirs_lower:
+            return True
+
+        return any(excluded in root for excluded in self.exclude_dirs)
+
+    def build(self) -> None:
+        """Walk the search directory and rebuild the filename maps.
+
+        Side Effects:
+            Replaces the stored directory mtimes and filename maps.
+        """
+        self.dir_mtimes = {}
+        self.dir_files = {}
+
+        for root, dirs, files in os.walk(self.search_path):
+            if self._is_excluded(root):
+                dirs[:] = []
+                continue
+
+            try:
+                self.dir_mtimes[root] = os.stat(root).st_mtime_ns
+            except OSError:
+                continue
+            self.dir_files[root] = files
+
+        self._build_name_maps()
+
+    def _build_name_maps(self) -> None:
+        """Derive basename lookups from the per-directory file lists."""
+        self.names = {}
+        self.names_lower = {}
+
+        for root, files in self.dir_files.items():
+            for f in files:
+                full_path = os.path.join(root, f)
+                self.names.setdefault(f, []).append(full_path)
+                self.names_lower.setdefault(f.lower(), []).append(full_path)
+
+    def is_stale(self) -> bool:
+        """Return True when any indexed directory was modified or removed."""
+        for root, mtime in self.dir_mtimes.items():
+            try:
+                if os.stat(root).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+
+        return not self.dir_mtimes
+
+    def refresh(self) -> bool:
+        """Rebuild and persist the index if it is stale.
+
+        Returns:
+            True when the index was rebuilt, False when it was already current.
+        """
+        if not self.is_stale():
+            return False
+
+        self.build()
+        self.save()
+        return True
+
+    def _lookup(self, filename: str) -> Optional[str]:
+        """Resolve a basename against the maps, exact case first."""
+        paths = self.names.get(filename)
+        if paths:
+            return paths[0]
+
+        paths = self.names_lower.get(filename.lower())
+        if paths:
+            return paths[0]
 
-    Performs a recursive walk starting from the configured or provided directory, skipping ignored directories, and returns the first path matching the target filename (case-sensitive first, then case-insensitive).
+        return None
+
+    def lookup(self, filename: str) -> Optional[str]:
+        """Return the path of a file by basename, refreshing the index on misses.
+
+        A miss or a hit pointing to a deleted file triggers a staleness check, so files created after the index was built are still found.
+
+        Args:
+            filename: Basename of the file to locate.
+
+        Returns:
+            Absolute path of the first match, or None if not found.
+        """
+        path = self._lookup(filename)
+
+        if path is None or not os.path.isfile(path):
+            if self.refresh():
+                path = self._lookup(filename)
+            elif path is not None:
+                path = None
+
+        return path
+
+    @property
+    def cache_path(self) -> Optional[str]:
+        """Location of the persisted index, or None when caching is disabled."""
+        if not Settings.Cache.dir:
+            return None
+
+        key = json.dumps([self.search_path, list(self.exclude_dirs)])
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+        return os.path.join(
+            os.path.expanduser(Settings.Cache.dir), f"vault-index-{digest}.json"
+        )
+
+    def load(self) -> bool:
+        """Load a persisted index if it exists and is still current.
+
+        Returns:
+            True when a valid index was loaded, False otherwise.
+        """
+        path = self.cache_path
+        if not path or not os.path.isfile(path):
+            return False
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if (
+            data.get("version") != self.version
+            or data.get("search_path") != self.search_path
+            or tuple(data.get("exclude_dirs", ())) != self.exclude_dirs
+        ):
+            return False
+
+        self.dir_mtimes = data["dir_mtimes"]
+        self.dir_files = data["dir_files"]
+
+        if self.is_stale():
+            return False
+
+        self._build_name_maps()
+        return True
+
+    def save(self) -> None:
+        """Persist the index to ``Settings.Cache.dir``; failures are ignored."""
+        path = self.cache_path
+        if not path:
+            return
+
+        data = {
+            "version": self.version,
+            "search_path": self.search_path,
+            "exclude_dirs": list(self.exclude_dirs),
+            "dir_mtimes": self.dir_mtimes,
+            "dir_files": self.dir_files,
+        }
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+
+def locate_file(filename: str, search_path: Optional[str] = None) -> Optional[str]:
+    """Locate a file by name within a search path honoring ignore rules, without recording or reporting the lookup.
+
+    Resolves the filename through the shared ``VaultIndex`` of the configured or provided directory (or walks the directory when ``Settings.Cache.search_index`` is disabled), skipping ignored directories, and returns the first path matching the target filename (case-sensitive first, then case-insensitive).
 
     Args:
         filename: Target filename; path segments are stripped, and trailing whitespace is trimmed.
@@ -23,7 +260,7 @@ def find_file(filename: str, search_path: Optional[str] = None) -> Optional[str]
         FileNotFoundError: If the search directory does not exist.
 
     Side Effects:
-        Prints a not-found message to stdout if no match is located; prints comparison errors if they occur.
+        Prints comparison errors if they occur.
     """
     exclude_dirs = Settings.Export.search_ignore_dirs
 
@@ -47,6 +284,10 @@ def find_file(filename: str, search_path: Optional[str] = None) -> Optional[str]
     if exclude_dirs is None:
         exclude_dirs = []
 
+    if Settings.Cache.search_index:
+        index = VaultIndex.get(os.path.abspath(search_path), exclude_dirs)
+        return index.lookup(target_filename)
+
     exclude_dirs_lower = [d.lower().strip() for d in exclude_dirs if d]
 
     for root, dirs, files in os.walk(search_path):
@@ -64,17 +305,47 @@ def find_file(filename: str, search_path: Optional[str] = None) -> Optional[str]
         for f in files:
             try:
                 if f == target_filename:
-                    full_path = os.path.join(root, f)
-                    return full_path
+                    return os.path.join(root, f)
 
                 if f.lower() == target_filename_lower:
-                    full_path = os.path.join(root, f)
-                    return full_path
+                    return os.path.join(root, f)
 
             except Exception as e:
                 print(f"Ошибка при сравнении файла {f}: {e}")
                 continue
 
+    return None
+
+
+def find_file(filename: str, search_path: Optional[str] = None) -> Optional[str]:
+    """Locate a file by name like ``locate_file`` and record the lookup for incremental export.
+
+    Args:
+        filename: Target filename; path segments are stripped, and trailing whitespace is trimmed.
+        search_path: Optional root directory to search; defaults to `Settings.Export.search_dir`, expanded to user home. Falls back to CWD if None.
+
+    Returns:
+        Absolute path to the first matching file, or None if not found.
+
+    Raises:
+        FileNotFoundError: If the search directory does not exist.
+
+    Side Effects:
+        Records the found file, or the failed lookup, in ``ExportManifest``; prints a not-found message to stdout if no match is located.
+    """
+    if search_path is None:
+        search_path = Settings.Export.search_dir
+
+    full_path = locate_file(filename, search_path)
+    if full_path:
+        ExportManifest.record_dependency(full_path)
+        return full_path
+
+    ExportManifest.record_missing(filename, search_path)
+
+    if "/" in filename:
+        filename = filename.split("/")[-1]
+
     print(f"File '{filename}' not found")
     return None
 
@@ -176,7 +447,7 @@ def list_files_in_directory(search_path: Optional[str] = None) -> None:
 def get_image_dimensions(file_path: str) -> Optional[Tuple[int, int]]:
     """Return width and height of an image file if available.
 
-    Attempts to open the file with Pillow and extract its dimensions; returns None if the file is missing or cannot be opened.
+    Dimensions come from ``ImageSizeCache``, which reads image headers directly and falls back to Pillow only for uncommon formats.
 
     Args:
         file_path: Absolute or relative path to the image file.
@@ -185,10 +456,8 @@ def get_image_dimensions(file_path: str) -> Optional[Tuple[int, int]]:
         Tuple of (width, height) in pixels when the file is readable, otherwise None.
 
     Raises:
-        None explicitly; FileNotFoundError is caught and suppressed.
+        None explicitly; a missing file yields None.
     """
-    try:
-        with Image.open(file_path) as img:
-            return img.width, img.height
-    except FileNotFoundError:
-        return None
+    from .image_size import ImageSizeCache
+
+    return ImageSizeCache.get(file_path)
@@ -16,6 +16,10 @@ class Settings(ConfigBase):
         makefile = True
         export_dir = './'
         branching_project = False
+        workers = 1
+        copy_workers = 4
+        incremental = False
+        bib_file = False
 
         def __init__(self) -> None:
             """Initialize export settings including search paths and project behavior."""
@@ -24,6 +28,46 @@ class Settings(ConfigBase):
             self.makefile = self.__class__.makefile
             self.export_dir = self.__class__.export_dir
             self.branching_project = self.__class__.branching_project
+            self.workers = self.__class__.workers
+            self.copy_workers = self.__class__.copy_workers
+            self.incremental = self.__class__.incremental
+            self.bib_file = self.__class__.bib_file
+            super().__init__()
+
+
+    class Cache(ConfigBase):
+        dir = '~/.cache/omd2tex/'
+        search_index = True
+        render = True
+        render_memory_size = 20000
+        render_disk = False
+        image_sizes = True
+        database = True
+        citations = True
+
+        def __init__(self) -> None:
+            """Initialize on-disk cache location and cache toggles."""
+            self.dir = self.__class__.dir
+            self.search_index = self.__class__.search_index
+            self.image_sizes = self.__class__.image_sizes
+            self.database = self.__class__.database
+            self.citations = self.__class__.citations
+            self.render = self.__class__.render
+            self.render_memory_size = self.__class__.render_memory_size
+            self.render_disk = self.__class__.render_disk
+            super().__init__()
+
+
+    class Watch(ConfigBase):
+        polling = False
+        interval = 0.2
+        debounce = 0.05
+
+        def __init__(self) -> None:
+            """Initialize watch mode backend and timing options."""
+            self.polling = self.__class__.polling
+            self.interval = self.__class__.interval
+            self.debounce = self.__class__.debounce
             super().__init__()
 
 
@@ -63,11 +107,13 @@ class Settings(ConfigBase):
     class Preamble(ConfigBase):
         create_preamble = True
         settings_json = ''
+        precompiled_format = True
 
         def __init__(self) -> None:
             """Initialize preamble generation settings."""
             self.create_preamble = self.__class__.create_preamble
             self.settings_json = self.__class__.settings_json
+            self.precompiled_format = self.__class__.precompiled_format
             super().__init__()
 
 
@@ -105,6 +151,7 @@ class Settings(ConfigBase):
         parse = True
         absolute_path_in_project_export = False
         copy_to_folder_in_project_export = True
+        link_in_project_export = True
         wh_aspect_borders = [0.6, 1.8]
         default_width = '8cm'
         default_height = '8cm'
@@ -114,6 +161,7 @@ class Settings(ConfigBase):
             self.parse = self.__class__.parse
             self.absolute_path_in_project_export = self.__class__.absolute_path_in_project_export
             self.copy_to_folder_in_project_export = self.__class__.copy_to_folder_in_project_export
+            self.link_in_project_export = self.__class__.link_in_project_export
             self.wh_aspect_borders = self.__class__.wh_aspect_borders
             self.default_width = self.__class__.default_width
             self.default_height = self.__class__.default_height
@@ -140,12 +188,27 @@ class Settings(ConfigBase):
             super().__init__()
 
 
+    class Table(ConfigBase):
+        stream_rows = 5000
+        chunk_rows = 0
+        parse_csv = False
+
+        def __init__(self) -> None:
+            """Initialize large table handling thresholds and csv parsing."""
+            self.stream_rows = self.__class__.stream_rows
+            self.chunk_rows = self.__class__.chunk_rows
+            self.parse_csv = self.__class__.parse_csv
+            super().__init__()
+
+
     class Codeblock(ConfigBase):
         parse = True
+        clean_smiles_images = True
 
         def __init__(self) -> None:
             """Initialize code block parsing toggle."""
             self.parse = self.__class__.parse
+            self.clean_smiles_images = self.__class__.clean_smiles_images
             super().__init__()
 
 
@@ -181,6 +244,8 @@ class Settings(ConfigBase):
         """Initialize the global settings container with section defaults."""
         self.parse = self.__class__.Parse()
         self.export = self.__class__.Export()
+        self.cache = self.__class__.Cache()
+        self.watch = self.__class__.Watch()
         self.frontmatter = self.__class__.Frontmatter()
         self.beamer = self.__class__.Beamer()
         self.paragraph = self.__class__.Paragraph()
@@ -190,6 +255,7 @@ class Settings(ConfigBase):
         self.image = self.__class__.Image()
         self.quote = self.__class__.Quote()
         self.list = self.__class__.List()
+        self.table = self.__class__.Table()
         self.codeblock = self.__class__.Codeblock()
         self.fragment = self.__class__.Fragment()
         super().__init__()
@@ -0,0 +1,329 @@
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .context import ContextLocalMeta
+from .settings import Settings
+
+FONT_PATH = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "../default/fonts/cmunrm.ttf"
+)
+
+SUB_IMAGE_SIZE = (500, 300)
+
+
+def parse_smiles_lines(lines: list) -> List[Tuple[str, Optional[str]]]:
+    """Split the lines of a ``smiles`` block into SMILES and optional conditions after ``#``."""
+    parsed = []
+    for s in (line.strip() for line in lines):
+        if not s:
+            continue
+        smi_part = s
+        cond = None
+        if "#" in s:
+            smi_part, cond = s.split("#", 1)
+            smi_part = smi_part.strip()
+            cond = cond.strip()
+        parsed.append((smi_part, cond))
+
+    return parsed
+
+
+def _is_reaction(parsed: List[Tuple[str, Optional[str]]]) -> bool:
+    """Return True when every line of the block is a reaction."""
+    return all((">>" in s or "<<" in s) for s, _ in parsed)
+
+
+def _build(parsed: List[Tuple[str, Optional[str]]]) -> Tuple[Optional[Any], List[Any]]:
+    """Build the RDKit reaction or molecules of a parsed block.
+
+    Returns:
+        Tuple of the reaction (or None) and the list of valid molecules; both are empty when nothing can be drawn.
+    """
+    from rdkit import Chem
+    from rdkit.Chem import rdChemReactions
+
+    if _is_reaction(parsed):
+        rxn = rdChemReactions.ReactionFromSmarts(parsed[0][0], useSmiles=True)
+        return rxn, []
+
+    mols = []
+    for smi, _ in parsed:
+        m = Chem.MolFromSmiles(smi)
+        if m is not None:
+            mols.append(m)
+
+    return None, mols
+
+
+def _add_conditions_banner(img: Any, text: str, font_path: str) -> Any:
+    """
+    Добавляет над картинкой реакций белую полоску с текстом условий.
+    Работает и с новой Pillow (без textsize), и со старой.
+    """
+    from PIL import Image as PILImage, ImageDraw, ImageFont
+
+    if not text:
+        return img
+
+    # Подбираем шрифт
+    try:
+        base_size = max(10, int(img.height * 0.08))
+        font = ImageFont.truetype(font_path, size=base_size)
+    except Exception:
+        font = ImageFont.load_default()
+
+    # --- считаем размер текста ---
+    try:
+        # Новый способ (Pillow 9+/10+): через bounding box шрифта
+        bbox = font.getbbox(text)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+    except AttributeError:
+        # Старые версии Pillow: fallback через textsize
+        dummy = PILImage.new("RGB", (1, 1), "white")
+        draw_dummy = ImageDraw.Draw(dummy)
+        text_width, text_height = draw_dummy.textsize(text, font=font)
+
+    padding_x = 10
+    padding_y = 6
+    banner_height = text_height + 2 * padding_y
+
+    W, H = img.size
+    new_W = W
+    new_H = H + banner_height
+
+    # Новая картинка: сверху баннер, снизу исходная реакция
+    new_img = PILImage.new("RGB", (new_W, new_H), "white")
+    new_img.paste(img, (0, banner_height))
+
+    draw = ImageDraw.Draw(new_img)
+    text_x = max(padding_x, (new_W - text_width) // 2)
+    text_y = (banner_height - text_height) // 2
+
+    draw.text((text_x, text_y), text, font=font, fill="black")
+
+    return new_img
+
+
+def draw_smiles(parsed: List[Tuple[str, Optional[str]]], path: str) -> None:
+    """Draw a parsed ``smiles`` block with RDKit and save it as PNG.
+
+    Reactions use the first line and its conditions as a banner; molecules are drawn as a grid with at most two per row. The file is written atomically.
+
+    Args:
+        parsed: Output of ``parse_smiles_lines``.
+        path: Target PNG path.
+
+    Returns:
+        None
+    """
+    from rdkit.Chem import Draw
+    from rdkit.Chem.Draw import IPythonConsole
+
+    IPythonConsole.drawOptions.fontFile = FONT_PATH
+
+    rxn, mols = _build(parsed)
+
+    if rxn is not None:
+        pic = Draw.ReactionToImage(rxn, subImgSize=SUB_IMAGE_SIZE)
+
+        conditions = parsed[0][1]
+        if conditions:
+            pic = _add_conditions_banner(pic, conditions, FONT_PATH)
+    else:
+        molsPerRow = 2 if len(mols) > 2 else len(mols)
+        pic = Draw.MolsToGridImage(
+            mols, returnPNG=False, subImgSize=SUB_IMAGE_SIZE, molsPerRow=molsPerRow
+        )
+
+    tmp_path = f"{path}.{os.getpid()}.tmp.png"
+    pic.save(tmp_path)
+    os.replace(tmp_path, path)
+
+
+class SmilesRenderer(metaclass=ContextLocalMeta):
+    """Content-addressed rendering of ``smiles`` code blocks.
+
+    Pictures are stored in the project ``images`` folder as ``smiles-<hash>.png``, where the hash covers the SMILES, the conditions and the drawing options, so an unchanged block reuses its picture without importing RDKit. Blocks with a single molecule get a ``-single`` suffix because they are included at reduced width. Inside ``batch`` new pictures are only scheduled and drawn together by ``flush``, in a process pool when ``Settings.Export.workers`` is above one. ``cleanup`` removes pictures no longer referenced by the project.
+    """
+
+    version = 1
+
+    _context_local = ("pending", "images", "drawn", "reused", "_batching")
+
+    pending: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+    images: List[Any] = []
+
+    drawn = 0
+    reused = 0
+
+    _batching = 0
+
+    file_pattern = re.compile(r"smiles-[0-9a-f]{16}(?:-single)?\.png")
+
+    @classmethod
+    def key(cls, parsed: List[Tuple[str, Optional[str]]]) -> str:
+        """Return the content hash of a parsed block and the drawing options."""
+        data = json.dumps(
+            [cls.version, parsed, SUB_IMAGE_SIZE, os.path.basename(FONT_PATH)]
+        )
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    @contextmanager
+    def batch(cls) -> Iterator[None]:
+        """Defer drawing of new pictures until the outermost batch ends."""
+        cls._batching += 1
+
+        try:
+            yield
+        except BaseException:
+            if cls._batching == 1:
+                cls.pending = {}
+                cls.images = []
+            raise
+        finally:
+            cls._batching -= 1
+
+        if not cls._batching:
+            cls.flush()
+
+    @classmethod
+    def picture(cls, lines: list, export_dir: str) -> Any:
+        """Return the element showing a ``smiles`` block.
+
+        Args:
+            lines: Lines of the code block.
+            export_dir: Project directory receiving the picture.
+
+        Returns:
+            ``Image`` of the picture, or an empty ``Paragraph`` when the block has nothing to draw.
+        """
+        from ..objects.paragraph import Paragraph
+
+        parsed = parse_smiles_lines(lines)
+        if not parsed:
+            return Paragraph("")
+
+        key = cls.key(parsed)
+        images_path = os.path.join(export_dir, "images")
+
+        for single in (False, True):
+            path = cls._path(images_path, key, single)
+            if os.path.isfile(path):
+                cls.reused += 1
+                return cls._image(path, export_dir, single)
+
+        rxn, mols = _build(parsed)
+        if rxn is None and not mols:
+            return Paragraph("")
+
+        single = rxn is None and len(mols) == 1
+        path = cls._path(images_path, key, single)
+
+        try:
+            os.makedirs(images_path, exist_ok=True)
+        except PermissionError:
+            print(f"Ошибка: нет прав для создания {images_path}")
+        except OSError as e:
+            print(f"Ошибка при создании директории: {e}")
+
+        if cls._batching:
+            cls.pending[path] = parsed
+            image = cls._image(path, export_dir, single)
+            cls.images.append(image)
+            return image
+
+        draw_smiles(parsed, path)
+        cls.drawn += 1
+        return cls._image(path, export_dir, single)
+
+    @staticmethod
+    def _path(images_path: str, key: str, single: bool) -> str:
+        """Return the picture path of a block hash."""
+        return os.path.join(
+            images_path, f"smiles-{key}{'-single' if single else ''}.png"
+        )
+
+    @staticmethod
+    def _image(path: str, export_dir: str, single: bool) -> Any:
+        """Create the image element of a picture; a single molecule is shown smaller."""
+        from ..objects.image import Image
+
+        return Image(
+            filename=os.path.basename(path),
+            parrentdir=export_dir,
+            dir=path,
+            width=100 if single else None,
+        )
+
+    @classmethod
+    def flush(cls, workers: Optional[int] = None) -> None:
+        """Draw all scheduled pictures and fill in the dimensions of their images.
+
+        Args:
+            workers: Number of drawing processes; defaults to ``Settings.Export.workers``.
+
+        Returns:
+            None
+        """
+        from .search import get_image_dimensions
+
+        pending, cls.pending = cls.pending, {}
+        images, cls.images = cls.images, []
+
+        if workers is None:
+            workers = Settings.Export.workers or 1
+
+        if workers > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+                list(pool.map(draw_smiles, pending.values(), pending.keys()))
+        else:
+            for path, parsed in pending.items():
+                draw_smiles(parsed, path)
+
+        cls.drawn += len(pending)
+
+        for image in images:
+            dimensions = get_image_dimensions(image.dir)
+            if dimensions is not None:
+                image.original_width, image.original_height = dimensions
+
+    @classmethod
+    def cleanup(cls, project_dir: str) -> int:
+        """Remove pictures of ``smiles`` blocks that no ``.tex`` file of the project references.
+
+        Args:
+            project_dir: Directory of the exported project.
+
+        Returns:
+            Number of removed pictures.
+        """
+        images_path = os.path.join(project_dir, "images")
+        if not os.path.isdir(images_path):
+            return 0
+
+        referenced = set()
+        for root, _, files in os.walk(project_dir):
+            for filename in files:
+                if filename.endswith(".tex"):
+                    with open(
+                        os.path.join(root, filename), "r", encoding="utf-8", errors="replace"
+                    ) as f:
+                        referenced.update(cls.file_pattern.findall(f.read()))
+
+        removed = 0
+        for filename in os.listdir(images_path):
+            if cls.file_pattern.fullmatch(filename) and filename not in referenced:
+                try:
+                    os.remove(os.path.join(images_path, filename))
+                    removed += 1
+                except OSError:
+                    pass
+
+        return removed
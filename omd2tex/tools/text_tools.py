@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from typing import Any, Callable, List, Union
 
 
@@ -89,3 +90,51 @@ def return_regular(string: str, regular: str, function: Callable[[str], str]) ->
     string = "".join(string)
 
     return string
+
+
+# Macros whose braced argument ``LatexNodes2Text`` prints unchanged
+_transparent_macros = re.compile(r"\\(?:textbf|textit|emph|sout|ul|underline|hl|sethlcolor)\{")
+_escaped_symbols = re.compile(r"\\([%#&_])")
+# Text without other LaTeX syntax, ligatures or quotes converts to itself
+_plain_latex = re.compile(
+    r"[\w .,;:!?()\[\]+*/=<>@|\"^{}$]*(?:-[\w .,;:!?()\[\]+*/=<>@|\"^{}$]+)*-?"
+)
+
+_latex_to_text = None
+
+
+def latex_to_text(latex: str) -> str:
+    """Convert LaTeX to plain text with a shared ``LatexNodes2Text`` converter."""
+    global _latex_to_text
+
+    if _latex_to_text is None:
+        from pylatexenc.latex2text import LatexNodes2Text
+
+        _latex_to_text = LatexNodes2Text()
+
+    return _latex_to_text.latex_to_text(latex)
+
+
+@lru_cache(maxsize=65536)
+def visible_width(latex: str) -> int:
+    """Count the symbols a LaTeX snippet shows, ignoring spaces and underscores.
+
+    Plain text, emphasis macros, escaped symbols and math without macros are measured directly; anything else goes through ``latex_to_text``. Both ways give the same count.
+
+    Args:
+        latex: LaTeX source of the snippet.
+
+    Returns:
+        Number of visible symbols.
+    """
+    escaped = _escaped_symbols.findall(latex)
+    text = _escaped_symbols.sub("", _transparent_macros.sub("", latex))
+
+    if "\\" not in text and _plain_latex.fullmatch(text):
+        symbols = len(escaped) - escaped.count("_")
+        for char in text:
+            if char not in " _{}$":
+                symbols += 1
+        return symbols
+
+    return len(latex_to_text(latex).replace(" ", "").replace("_", "").replace("\n", ""))
@@ -0,0 +1,389 @@
+import copy
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+import traceback
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from .settings import Settings
+
+
+class _InotifyWatcher:
+    """Directory watcher built on Linux inotify through ``ctypes``.
+
+    Parent directories of the watched files are observed instead of the files themselves, so saves done by writing a temporary file and renaming it over the original are noticed as well. Watched directories report files created or moved into them.
+    """
+
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+
+    MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    _event = struct.Struct("iIII")
+
+    def __init__(self) -> None:
+        """Open an inotify instance.
+
+        Raises:
+            OSError: If inotify is not available on this system.
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        self.dirs: Dict[int, str] = {}
+        self.files: Set[str] = set()
+        self.directories: Set[str] = set()
+
+    def watch(self, files: Iterable[str], directories: Iterable[str] = ()) -> None:
+        """Replace the set of watched files and directories.
+
+        Args:
+            files: Absolute paths of files whose changes should be reported.
+            directories: Absolute paths of directories reported when a file is created in them.
+
+        Returns:
+            None
+        """
+        self.files = set(files)
+        self.directories = set(directories)
+        wanted = {os.path.dirname(path) for path in self.files} | self.directories
+
+        for wd, directory in list(self.dirs.items()):
+            if directory not in wanted:
+                self._libc.inotify_rm_watch(self.fd, wd)
+                del self.dirs[wd]
+
+        watched = set(self.dirs.values())
+        for directory in wanted - watched:
+            wd = self._libc.inotify_add_watch(
+                self.fd, os.fsencode(directory), self.MASK
+            )
+            if wd >= 0:
+                self.dirs[wd] = directory
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block until a watched file changes or the timeout expires.
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            Changed watched paths and directories; empty on timeout.
+        """
+        changed = set()
+
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return changed
+
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = self._event.unpack_from(data, offset)
+                offset += self._event.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+
+                if mask & self.IN_Q_OVERFLOW:
+                    # Events were dropped, treat every file as changed
+                    changed |= self.files | self.directories
+                    continue
+
+                directory = self.dirs.get(wd)
+                if directory is None:
+                    continue
+
+                path = os.path.join(directory, os.fsdecode(name))
+                if path in self.files:
+                    changed.add(path)
+                elif directory in self.directories and mask & (
+                    self.IN_CREATE | self.IN_MOVED_TO
+                ):
+                    changed.add(directory)
+
+        return changed
+
+    def close(self) -> None:
+        """Release the inotify descriptor."""
+        os.close(self.fd)
+
+
+class _PollingWatcher:
+    """Portable watcher comparing modification times and sizes of watched files and directories."""
+
+    def __init__(self, interval: float) -> None:
+        """Create a polling watcher.
+
+        Args:
+            interval: Seconds between two scans of the watched files.
+
+        Returns:
+            None
+        """
+        self.interval = interval
+        self.stats: Dict[str, Optional[tuple]] = {}
+
+    @staticmethod
+    def _stat(path: str) -> Optional[tuple]:
+        """Return modification time and size of a file, or None if it is missing."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def watch(self, files: Iterable[str], directories: Iterable[str] = ()) -> None:
+        """Replace the set of watched files and directories, remembering their current state."""
+        self.stats = {path: self._stat(path) for path in files}
+        self.stats.update((path, self._stat(path)) for path in directories)
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Poll until a watched file changes or the timeout expires.
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            Changed watched paths and directories; empty on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            changed = set()
+            for path, stat in self.stats.items():
+                current = self._stat(path)
+                if current != stat:
+                    self.stats[path] = current
+                    changed.add(path)
+
+            if changed:
+                return changed
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return changed
+                time.sleep(min(self.interval, remaining))
+            else:
+                time.sleep(self.interval)
+
+    def close(self) -> None:
+        """Polling holds no resources."""
+
+
+class DocumentWatcher:
+    """Keep a document exported while the notes it is built from change.
+
+    The watcher exports the document as a LaTeX project, collects every file resolved during the export (the root note, embedded notes, images and citation files) and re-exports whenever one of them changes. When a lookup found no file, the directories of the vault are watched as well, and a file created there triggers an export once the lookup finds it. The process stays warm, and exports run with ``Settings.Export.incremental`` so only changed notes are parsed and rendered again; the render cache is shared between rebuilds.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        settings: Optional[Dict[str, Any]] = None,
+        on_build: Optional[Callable[[float, Set[str]], None]] = None,
+    ) -> None:
+        """Prepare a watcher for a markdown note.
+
+        Args:
+            filename: Markdown filename of the root note, resolved in ``Settings.Export.search_dir``.
+            settings: Optional settings overrides applied before the first export.
+            on_build: Optional callback receiving the build duration and the changed files that triggered it.
+
+        Returns:
+            None
+
+        Side Effects:
+            Enables ``Settings.Export.incremental``.
+        """
+        from .settings_preamble import SettingsPreamble
+        from .globals import Global
+
+        if settings:
+            Settings.update(settings)
+        Settings.Export.incremental = True
+
+        self.filename = filename
+        self.on_build = on_build
+        self.dependencies: Set[str] = set()
+        self.unresolved: Set[Tuple[str, str]] = set()
+        self.directories: Set[str] = set()
+        self._started = 0
+
+        # Frontmatter of the notes changes settings, every rebuild starts from here
+        self._settings = Settings.to_dict()
+        self._settings_preamble = SettingsPreamble.to_dict()
+        self._global = Global.to_dict()
+
+    def _reset(self) -> None:
+        """Restore the global state captured when the watcher was created."""
+        from ..objects.citation import Citation
+        from ..objects.footnote import Footnote
+        from .settings_preamble import SettingsPreamble
+        from .globals import Global
+
+        Settings.update(copy.deepcopy(self._settings))
+        SettingsPreamble.update(copy.deepcopy(self._settings_preamble))
+        Global.update(copy.deepcopy(self._global))
+        Footnote.collection = {}
+        Citation.to_default()
+
+    def build(self, changed: Optional[Set[str]] = None) -> bool:
+        """Export the document once and refresh the set of watched files.
+
+        Args:
+            changed: Files whose change triggered this build, passed to ``on_build``.
+
+        Returns:
+            True if the export succeeded. On failure the traceback is printed and the previous watched files are kept, so fixing the note triggers the next build.
+
+        Side Effects:
+            Writes the LaTeX project into ``Settings.Export.export_dir``.
+        """
+        from ..objects.document import Document
+        from .incremental import ExportManifest
+
+        self._reset()
+
+        self._started = time.time_ns()
+        start = time.perf_counter()
+        dependencies: Set[str] = set()
+        unresolved: Set[Tuple[str, str]] = set()
+        ExportManifest._recording.append(dependencies)
+        ExportManifest._unresolved.append(unresolved)
+
+        try:
+            Document().from_file(self.filename).to_latex_project()
+            success = True
+        except Exception:
+            traceback.print_exc()
+            success = False
+        finally:
+            ExportManifest._recording.remove(dependencies)
+            ExportManifest._unresolved.remove(unresolved)
+
+        if success:
+            self.dependencies = dependencies
+            self.unresolved = unresolved
+        else:
+            self.dependencies |= dependencies
+            self.unresolved |= unresolved
+        self.directories = self._vault_directories()
+
+        if self.on_build:
+            self.on_build(time.perf_counter() - start, changed or set())
+
+        return success
+
+    def _vault_directories(self) -> Set[str]:
+        """Return the directories searched by lookups that found no file, without ignored and export directories."""
+        from .search import VaultIndex
+
+        export_dir = os.path.abspath(os.path.expanduser(Settings.Export.export_dir))
+        directories = set()
+
+        for search_path in {search_path for _filename, search_path in self.unresolved}:
+            index = VaultIndex(search_path, Settings.Export.search_ignore_dirs)
+            index.build()
+            directories.update(
+                directory
+                for directory in index.dir_mtimes
+                if directory != export_dir
+                and not directory.startswith(export_dir + os.sep)
+            )
+
+        return directories
+
+    def _relevant(self, changed: Set[str]) -> Set[str]:
+        """Drop changed directories unless a file that was not found exists now."""
+        from .incremental import ExportManifest
+
+        directories = changed & self.directories
+        if directories and not any(
+            ExportManifest._resolves(filename, search_path)
+            for filename, search_path in self.unresolved
+        ):
+            return changed - directories
+
+        return changed
+
+    def _changed_during_build(self) -> Set[str]:
+        """Return watched files and directories modified after the last build started."""
+        changed = set()
+        for path in self.dependencies | self.directories:
+            try:
+                if os.stat(path).st_mtime_ns >= self._started:
+                    changed.add(path)
+            except OSError:
+                changed.add(path)
+
+        return changed
+
+    @staticmethod
+    def _backend():
+        """Return the inotify watcher, or the polling one when inotify is unavailable or disabled."""
+        if not Settings.Watch.polling:
+            try:
+                return _InotifyWatcher()
+            except (OSError, AttributeError):
+                pass
+
+        return _PollingWatcher(Settings.Watch.interval)
+
+    def run(self, max_builds: Optional[int] = None) -> None:
+        """Export the document and re-export it on every change until interrupted.
+
+        Args:
+            max_builds: Stop after this many builds, mainly for scripting; runs forever when None.
+
+        Returns:
+            None
+
+        Side Effects:
+            Writes the LaTeX project on every change; prints errors of failed builds.
+        """
+        backend = self._backend()
+        builds = 0
+
+        try:
+            self.build()
+            builds += 1
+
+            while max_builds is None or builds < max_builds:
+                backend.watch(self.dependencies, self.directories)
+                changed = self._relevant(self._changed_during_build())
+                while not changed:
+                    changed = self._relevant(backend.wait())
+
+                # Editors often write a file in several steps
+                while True:
+                    more = backend.wait(Settings.Watch.debounce)
+                    if not more:
+                        break
+                    changed |= more
+
+                self.build(changed)
+                builds += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            backend.close()
@@ -0,0 +1,87 @@
+"""Check that csv and tsv tables render the same with parallel workers.
+
+Builds a small vault with a ``csv`` block, a ``tsv`` block and an embedded ``.csv`` file, renders it serially and with ``Settings.Export.workers`` above one, and fails when rendering raises (for example because a table cannot be pickled) or the outputs differ.
+
+Usage:
+    python tests/csv_workers.py [--workers 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NOTE = """# Tables
+
+Some text before the tables.
+
+```csv
+name,value,note
+alpha,1,under_score
+beta,2,100%
+```
+
+Between the tables.
+
+```tsv
+a\tb
+1\t2
+```
+
+![[data.csv]]
+
+The end.
+"""
+
+DATA = "x,y\n1,2\n3,4\n"
+
+
+def render(vault: str, workers: int) -> str:
+    """Render the note of the vault with the given number of workers."""
+    from omd2tex.objects import Document
+    from omd2tex.tools import ConversionContext
+
+    settings = {
+        "export": {
+            "search_dir": vault,
+            "export_dir": os.path.join(vault, "out"),
+            "workers": workers,
+        },
+        "cache": {"search_index": False, "render": False},
+    }
+
+    with ConversionContext(settings=settings):
+        doc = Document()
+        doc.from_file("note.md")
+        return doc.to_latex()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as vault:
+        with open(os.path.join(vault, "note.md"), "w", encoding="utf-8") as f:
+            f.write(NOTE)
+        with open(os.path.join(vault, "data.csv"), "w", encoding="utf-8") as f:
+            f.write(DATA)
+
+        serial = render(vault, 1)
+        parallel = render(vault, args.workers)
+
+    if serial.count("\\begin{longtblr}") != 3:
+        print("Expected three tables in the serial output")
+        return 1
+    if serial != parallel:
+        print(f"Output with {args.workers} workers differs from the serial output")
+        return 1
+
+    print(f"csv tables render the same with 1 and {args.workers} workers")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
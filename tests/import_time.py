@@ -0,0 +1,79 @@
+"""Guard the import time of omd2tex.
+
+Imports the converter in fresh interpreters, prints the best time and fails when a heavy dependency is loaded before a table, image, DataFrame or compile check needs it, or when the import is slower than the given limit.
+
+Usage:
+    python tests/import_time.py [--max-ms 300] [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = (
+    "numpy",
+    "pandas",
+    "PIL",
+    "pylatexenc",
+    "rdkit",
+    "asyncio",
+    "omd2tex.tools.error_catcher",
+    "omd2tex.tools.database",
+)
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import omd2tex
+from omd2tex.objects import Document
+from omd2tex.tools import Settings
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [m for m in {heavy!r} if m in sys.modules]]))
+"""
+
+
+def measure(runs: int):
+    """Return the best import time in seconds and the heavy modules loaded."""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    best = None
+    loaded = []
+
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(heavy=HEAVY_MODULES)],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        ).stdout
+        elapsed, loaded = json.loads(output.splitlines()[-1])
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-ms", type=float, default=300.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    best, loaded = measure(args.runs)
+    print(f"import omd2tex: {best * 1000:.1f} ms (best of {args.runs})")
+
+    if loaded:
+        print(f"Heavy modules loaded on import: {', '.join(loaded)}")
+        return 1
+    if best * 1000 > args.max_ms:
+        print(f"Import is slower than {args.max_ms:.0f} ms")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Check that incremental export notices files created after a failed lookup.
+
+Builds a small vault whose root note embeds a note that embeds a file that does not exist yet, exports it with ``Settings.Export.incremental``, creates the missing file and exports again. Fails when the second export reuses the embedding note instead of including the new file. Runs with and without the vault index.
+
+Usage:
+    python tests/incremental_missing.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NOTE = """# Root
+
+![[part.md]]
+"""
+
+PART = """# Part
+
+Before the embed.
+
+![[later.md]]
+"""
+
+LATER = """# Later
+
+Text of the note created between the exports.
+"""
+
+
+def export(vault: str, search_index: bool) -> str:
+    """Export the root note and return the LaTeX written for the embedded note."""
+    from omd2tex.objects import Document
+    from omd2tex.tools import ConversionContext
+
+    settings = {
+        "export": {
+            "search_dir": vault,
+            "export_dir": os.path.join(vault, "out"),
+            "incremental": True,
+        },
+        "cache": {
+            "dir": os.path.join(vault, "cache"),
+            "search_index": search_index,
+            "render": False,
+        },
+    }
+
+    with ConversionContext(settings=settings):
+        doc = Document()
+        doc.from_file("note.md")
+        doc.to_latex_project()
+
+    with open(os.path.join(vault, "out", "note", "later.tex"), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def check(search_index: bool) -> bool:
+    """Export before and after creating the missing note; True when the new note is included."""
+    with tempfile.TemporaryDirectory() as vault:
+        with open(os.path.join(vault, "note.md"), "w", encoding="utf-8") as f:
+            f.write(NOTE)
+        with open(os.path.join(vault, "part.md"), "w", encoding="utf-8") as f:
+            f.write(PART)
+
+        export(vault, search_index)
+        with open(os.path.join(vault, "later.md"), "w", encoding="utf-8") as f:
+            f.write(LATER)
+        later = export(vault, search_index)
+
+    return "created between the exports" in later
+
+
+def main() -> int:
+    failed = [mode for mode in (False, True) if not check(mode)]
+
+    for search_index in failed:
+        print(f"The created note was not included (search_index={search_index})")
+    if failed:
+        return 1
+
+    print("incremental export includes notes created after a failed lookup")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
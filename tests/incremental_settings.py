@@ -0,0 +1,96 @@
+"""Check that incremental export keeps the settings of the current run.
+
+Builds a small vault whose root note embeds a note with frontmatter, exports it twice with ``Settings.Export.incremental`` and different settings that do not affect rendering, and fails when the embedded note is parsed again, when replaying it reverts the settings of the second run, or when its frontmatter is not applied.
+
+Usage:
+    python tests/incremental_settings.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NOTE = """# Root
+
+Some text before the embed.
+
+![[part.md]]
+
+The end.
+"""
+
+PART = """---
+list:
+  itemsep: 7pt
+---
+# Part
+
+- first
+- second
+"""
+
+
+def export(vault: str, makefile: bool, workers: int):
+    """Export the root note and return the settings seen after the export."""
+    from omd2tex.objects import Document
+    from omd2tex.tools import ConversionContext, Settings
+
+    settings = {
+        "export": {
+            "search_dir": vault,
+            "export_dir": os.path.join(vault, "out"),
+            "incremental": True,
+            "makefile": makefile,
+            "workers": workers,
+        },
+        "cache": {"search_index": False, "render": False},
+    }
+
+    with ConversionContext(settings=settings):
+        doc = Document()
+        doc.from_file("note.md")
+        doc.to_latex_project()
+        return Settings.Export.makefile, Settings.Export.workers, Settings.List.itemsep
+
+
+def main() -> int:
+    import omd2tex.tools.markdown_parser as markdown_parser
+
+    parsed = []
+    parse = markdown_parser.MarkdownParser.from_file
+
+    def spy(self, filename):
+        parsed.append(os.path.basename(filename))
+        return parse(self, filename)
+
+    markdown_parser.MarkdownParser.from_file = spy
+
+    with tempfile.TemporaryDirectory() as vault:
+        with open(os.path.join(vault, "note.md"), "w", encoding="utf-8") as f:
+            f.write(NOTE)
+        with open(os.path.join(vault, "part.md"), "w", encoding="utf-8") as f:
+            f.write(PART)
+
+        first = export(vault, makefile=False, workers=1)
+        parsed.clear()
+        second = export(vault, makefile=True, workers=2)
+        has_makefile = os.path.exists(os.path.join(vault, "out", "note", "Makefile"))
+
+    if "part.md" in parsed:
+        print("The unchanged embedded note was parsed again")
+        return 1
+    if second[:2] != (True, 2) or not has_makefile:
+        print(f"Settings of the second run were reverted: makefile, workers = {second[:2]}")
+        return 1
+    if first[2] != "7pt" or second[2] != "7pt":
+        print(f"Frontmatter of the embedded note was not applied: {first[2]}, {second[2]}")
+        return 1
+
+    print("incremental export keeps the settings of the current run")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())